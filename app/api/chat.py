@@ -1,12 +1,13 @@
 from fastapi import APIRouter, HTTPException, Request
 from uuid import uuid4
 
-from app.models.schemas import ChatRequest, ChatResponse
-from app.services.chat_service import ChatService
+from app.models.schemas import ChatRequest, ChatResponse, ChatBatchRequest, ChatBatchResponse
+from app.core.config import get_settings
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter()
 
 
@@ -15,12 +16,7 @@ async def chat(request: ChatRequest, app_request: Request):
     try:
         session_id = request.session_id or str(uuid4())
         
-        chat_service = ChatService(
-            intent_predictor=app_request.app.state.intent_predictor,
-            entity_extractor=app_request.app.state.entity_extractor,
-            conversation_manager=app_request.app.state.conversation_manager,
-            vector_store=app_request.app.state.vector_store,
-        )
+        chat_service = app_request.app.state.services.chat_service
         
         response = await chat_service.process_message(
             message=request.message,
@@ -35,6 +31,34 @@ async def chat(request: ChatRequest, app_request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(request: ChatBatchRequest, app_request: Request):
+    if len(request.messages) > settings.MAX_CHAT_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.MAX_CHAT_BATCH_SIZE} messages",
+        )
+    
+    try:
+        requests = [
+            ChatRequest(
+                message=message.message,
+                session_id=message.session_id or str(uuid4()),
+                context=message.context,
+            )
+            for message in request.messages
+        ]
+        
+        chat_service = app_request.app.state.services.chat_service
+        responses = await chat_service.process_batch(requests)
+        
+        return ChatBatchResponse(responses=responses)
+        
+    except Exception as e:
+        logger.error(f"Error processing chat batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/learn")
 async def learn_from_feedback(feedback: dict):
     try:
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request
-from typing import List
+from typing import List, Union
 
-from app.models.schemas import Conversation
+from app.models.schemas import Conversation, ConversationSummary
 from app.core.logging_config import get_logger
 
 
@@ -9,11 +9,14 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("/conversations", response_model=List[Conversation])
-async def get_conversations(app_request: Request, limit: int = 10):
+@router.get("/conversations", response_model=Union[List[Conversation], List[ConversationSummary]])
+async def get_conversations(app_request: Request, limit: int = 10, summary: bool = False):
     try:
         conversation_manager = app_request.app.state.conversation_manager
-        conversations = conversation_manager.get_recent_conversations(limit=limit)
+        if summary:
+            return conversation_manager.get_recent_summaries(limit=limit)
+        
+        conversations = await conversation_manager.get_recent_conversations(limit=limit)
         return conversations
     except Exception as e:
         logger.error(f"Error fetching conversations: {str(e)}", exc_info=True)
@@ -24,7 +27,7 @@ async def get_conversations(app_request: Request, limit: int = 10):
 async def get_conversation(session_id: str, app_request: Request):
     try:
         conversation_manager = app_request.app.state.conversation_manager
-        conversation = conversation_manager.get_conversation(session_id)
+        conversation = await conversation_manager.get_conversation(session_id)
         
         if not conversation:
             raise HTTPException(status_code=404, detail="Conversation not found")
@@ -1,8 +1,7 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from uuid import uuid4
 
 from app.models.schemas import TaskRequest, TaskResponse, TaskStatus
-from automation.tasks.executor import TaskExecutor
 from app.core.logging_config import get_logger
 
 
@@ -14,7 +13,9 @@ task_storage = {}
 
 
 @router.post("/tasks", response_model=TaskResponse)
-async def create_task(request: TaskRequest, background_tasks: BackgroundTasks):
+async def create_task(
+    request: TaskRequest, background_tasks: BackgroundTasks, app_request: Request
+):
     try:
         task_id = str(uuid4())
         
@@ -25,7 +26,7 @@ async def create_task(request: TaskRequest, background_tasks: BackgroundTasks):
         
         task_storage[task_id] = task_response
         
-        executor = TaskExecutor()
+        executor = app_request.app.state.services.task_executor
         background_tasks.add_task(
             executor.execute_task,
             task_id=task_id,
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.metrics import get_metrics
+
+
+cache_lookups_total = get_metrics().counter(
+    "cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"]
+)
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire ``ttl`` seconds after insertion."""
+    
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                cache_lookups_total.inc(cache=self.name, result="miss")
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        cache_lookups_total.inc(cache=self.name, result="hit")
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
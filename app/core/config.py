@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,13 +15,57 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379"
     
     LOG_LEVEL: str = "INFO"
+    STARTUP_PROFILE: bool = False
     
     INTENT_MODEL_PATH: str = "models/saved_models/intent_classifier.keras"
+    INTENT_ONNX_PATH: str = "models/saved_models/intent_classifier.onnx"
+    INTENT_INT8_ONNX_PATH: str = "models/saved_models/intent_classifier.int8.onnx"
+    INTENT_CENTROIDS_PATH: str = "models/saved_models/intent_centroids.npz"
+    INTENT_LINEAR_PATH: str = "models/saved_models/intent_linear.npz"
+    INTENT_BACKEND: str = "keras"
+    INTENT_MODEL_VARIANT: str = "float"
+    INTENT_LENGTH_BUCKETS: List[int] = [8, 16, 32]
     ENTITY_MODEL_PATH: str = "models/saved_models/entity_extractor.keras"
+    ENTITY_BACKEND: str = "regex"
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_CACHE_SIZE: int = 4096
+    EMBEDDING_CACHE_TTL: float = 600.0
+    
+    WARMUP_ENABLED: bool = True
+    WARMUP_ITERATIONS: int = 2
+    # Failed components are warmed again after this many seconds, doubling
+    # up to the maximum; 0 leaves them failed.
+    WARMUP_RETRY_BACKOFF: float = 5.0
+    WARMUP_RETRY_MAX_BACKOFF: float = 300.0
+    WARMUP_MESSAGES: List[str] = [
+        "hello",
+        "open file document.txt",
+        "remind me tomorrow at 9am",
+        "run backup.py",
+    ]
+    
+    INTENT_BATCH_MAX_SIZE: int = 32
+    INTENT_BATCH_WINDOW_MS: float = 5.0
+    INTENT_CASCADE_THRESHOLD: Optional[float] = None
+    
+    CLASSIFICATION_CACHE_SIZE: int = 2048
+    CLASSIFICATION_CACHE_TTL: float = 300.0
+    
+    ADAPTIVE_PATTERN_MEMORY_BYTES: int = 262144
+    ADAPTIVE_PATTERNS_PATH: str = "data/learning/adaptive_patterns.npz"
     
     MAX_CONVERSATION_HISTORY: int = 50
     CONVERSATION_MEMORY_WINDOW: int = 10
+    CONVERSATION_MEMORY_BUDGET_BYTES: int = 67108864
+    CONVERSATION_IDLE_TTL: float = 3600.0
+    CONVERSATION_SPILL_DIR: str = "data/conversations"
+    CONVERSATION_EVICTION_INTERVAL: float = 30.0
+    CONVERSATION_MAX_SPILLED_SESSIONS: int = 100000
+    MAX_CHAT_BATCH_SIZE: int = 1000
+    
+    VECTOR_INGEST_QUEUE_SIZE: int = 1000
+    VECTOR_INGEST_BATCH_SIZE: int = 32
+    VECTOR_INGEST_FLUSH_INTERVAL: float = 0.5
     
     TASK_TIMEOUT: int = 300
     MAX_CONCURRENT_TASKS: int = 5
@@ -0,0 +1,79 @@
+import asyncio
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from types import ModuleType
+from typing import List, Tuple
+
+
+STARTUP_MODULES = [
+    "fastapi",
+    "app.core.config",
+    "app.models.schemas",
+    "ml.inference.intent_predictor",
+    "ml.inference.entity_extractor",
+    "memory.conversation.manager",
+    "memory.vector_store.store",
+    "automation.handlers.command_handler",
+    "app.services.container",
+    "app.main",
+]
+
+
+class StartupProfile:
+    """Import and initialisation timings collected while the app starts."""
+    
+    def __init__(self):
+        self.entries: List[Tuple[str, str, float]] = []
+    
+    @contextmanager
+    def measure(self, category: str, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.entries.append((category, name, time.perf_counter() - start))
+    
+    def report(self) -> str:
+        lines = [f"{'category':<10}{'name':<42}{'seconds':>10}"]
+        for category, name, seconds in self.entries:
+            lines.append(f"{category:<10}{name:<42}{seconds:>10.3f}")
+        
+        total = sum(seconds for _, _, seconds in self.entries)
+        lines.append(f"{'total':<52}{total:>10.3f}")
+        return "\n".join(lines)
+
+
+@lru_cache()
+def get_startup_profile() -> StartupProfile:
+    return StartupProfile()
+
+
+def lazy_import(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    
+    with get_startup_profile().measure("import", name):
+        return importlib.import_module(name)
+
+
+async def profile_startup():
+    profile = get_startup_profile()
+    
+    for name in STARTUP_MODULES:
+        lazy_import(name)
+    
+    app = sys.modules["app.main"].app
+    async with app.router.lifespan_context(app):
+        pass
+    
+    print(profile.report())
+
+
+if __name__ == "__main__":
+    from app.core import profiling
+    
+    asyncio.run(profiling.profile_startup())
@@ -1,17 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+import asyncio
 from pathlib import Path
 
 from app.core.config import get_settings
 from app.core.logging_config import setup_logging, get_logger
+from app.core.metrics import get_metrics
+from app.core.profiling import get_startup_profile
 from app.api import chat, tasks, conversations
 from ml.inference.intent_predictor import IntentPredictor
 from ml.inference.entity_extractor import EntityExtractorModel
 from memory.conversation.manager import ConversationManager
 from memory.vector_store.store import VectorStore
+from ml.inference.executor import get_inference_executor
+from app.services.container import ServiceContainer
+from app.services.warmup import Readiness, warm_up
 
 
 logger = get_logger(__name__)
@@ -25,7 +31,10 @@ async def lifespan(app: FastAPI):
     
     from automation.tasks.device_detector import DeviceDetector
     
-    device_detector = DeviceDetector()
+    profile = get_startup_profile()
+    
+    with profile.measure("init", "DeviceDetector"):
+        device_detector = DeviceDetector()
     device_info = device_detector.get_device_info()
     
     logger.info(f"Device: {device_info['os']} {device_info['machine']}")
@@ -36,20 +45,56 @@ async def lifespan(app: FastAPI):
     if device_info['preferred_calendar_app']:
         logger.info(f"Preferred calendar app: {device_info['preferred_calendar_app']['name']}")
     
-    app.state.intent_predictor = IntentPredictor()
-    app.state.entity_extractor = EntityExtractorModel()
-    app.state.conversation_manager = ConversationManager()
     app.state.vector_store = VectorStore()
     app.state.device_info = device_info
     
-    await app.state.vector_store.initialize()
+    # The vector store loads the sentence model, which the embedding intent
+    # backend runs too, so it comes up first.
+    with profile.measure("init", "VectorStore"):
+        await app.state.vector_store.initialize()
+    
+    with profile.measure("init", "IntentPredictor"):
+        app.state.intent_predictor = IntentPredictor(embedder=app.state.vector_store.encode)
+    with profile.measure("init", "EntityExtractorModel"):
+        app.state.entity_extractor = EntityExtractorModel()
+    with profile.measure("init", "ConversationManager"):
+        app.state.conversation_manager = ConversationManager()
+    
+    with profile.measure("init", "ServiceContainer"):
+        app.state.services = ServiceContainer(
+            intent_predictor=app.state.intent_predictor,
+            entity_extractor=app.state.entity_extractor,
+            conversation_manager=app.state.conversation_manager,
+            vector_store=app.state.vector_store,
+            device_detector=device_detector,
+        )
+        await app.state.services.start()
     
     logger.info("All services initialized successfully")
     
+    if settings.STARTUP_PROFILE:
+        logger.info(f"Startup profile:\n{profile.report()}")
+    
+    app.state.readiness = Readiness()
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warm_up(
+            app.state.readiness,
+            intent_predictor=app.state.intent_predictor,
+            entity_extractor=app.state.entity_extractor,
+            vector_store=app.state.vector_store,
+        ))
+    else:
+        app.state.readiness.mark_ready()
+    
     yield
     
     logger.info("Shutting down services")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await app.state.services.close()
     await app.state.vector_store.close()
+    get_inference_executor().shutdown()
 
 
 app = FastAPI(
@@ -90,5 +135,46 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    health = {
+        "status": "healthy",
+        "inference": get_inference_executor().stats(),
+    }
+    
+    intent_predictor = getattr(app.state, "intent_predictor", None)
+    if intent_predictor is not None and intent_predictor.batcher is not None:
+        health["intent_batching"] = intent_predictor.batcher.stats()
+    if intent_predictor is not None and intent_predictor.cascade_threshold is not None:
+        health["intent_cascade"] = intent_predictor.cascade_stats()
+    
+    conversation_manager = getattr(app.state, "conversation_manager", None)
+    if conversation_manager is not None:
+        health["conversations"] = conversation_manager.stats()
+    
+    services = getattr(app.state, "services", None)
+    if services is not None:
+        health["classification_cache"] = {
+            "intent": services.chat_service.intent_cache.stats(),
+            "entities": services.chat_service.entity_cache.stats(),
+        }
+    
+    return health
+
+
+@app.get("/ready")
+async def readiness_check():
+    readiness = getattr(app.state, "readiness", None)
+    if readiness is None:
+        return JSONResponse(status_code=503, content={"ready": False})
+    
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content=readiness.to_dict(),
+    )
+
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(
+        get_metrics().render(),
+        media_type="text/plain; version=0.0.4",
+    )
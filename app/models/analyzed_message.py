@@ -0,0 +1,58 @@
+import re
+from functools import cached_property
+from typing import List, Tuple, Union
+
+
+WORD = re.compile(r"\S+")
+QUOTED = re.compile(r'["\']([^"\']+)["\']')
+
+
+class AnalyzedMessage:
+    """A chat message with the views every pipeline stage reads.
+    
+    ``ChatService`` builds one per message and hands it to the intent
+    predictor, entity extractor, adaptive processor, command handler and
+    response generator. Each view is computed on first use and then shared,
+    so the message is lowercased, split and scanned for quotes at most once.
+    Stages still accept a plain string and wrap it with ``of``.
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    @classmethod
+    def of(cls, message: Union[str, "AnalyzedMessage"]) -> "AnalyzedMessage":
+        return message if isinstance(message, cls) else cls(message)
+    
+    def __str__(self) -> str:
+        return self.text
+    
+    def __repr__(self) -> str:
+        return f"AnalyzedMessage({self.text!r})"
+    
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+    
+    @cached_property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) in ``text`` of each whitespace-separated token."""
+        return [match.span() for match in WORD.finditer(self.text)]
+    
+    @cached_property
+    def tokens(self) -> List[str]:
+        """``text.split()``: the tokens with their original casing."""
+        return self.text.split()
+    
+    @cached_property
+    def lower_tokens(self) -> List[str]:
+        return self.lower.split()
+    
+    @cached_property
+    def quoted_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) in ``text`` of each quoted span, quotes excluded."""
+        return [match.span(1) for match in QUOTED.finditer(self.text)]
+    
+    @cached_property
+    def quoted(self) -> List[str]:
+        return [self.text[start:end] for start, end in self.quoted_spans]
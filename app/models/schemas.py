@@ -55,6 +55,14 @@ class ChatResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ChatBatchRequest(BaseModel):
+    messages: List[ChatRequest]
+
+
+class ChatBatchResponse(BaseModel):
+    responses: List[ChatResponse]
+
+
 class TaskRequest(BaseModel):
     task_type: str
     parameters: Dict[str, Any]
@@ -77,6 +85,15 @@ class Conversation(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ConversationSummary(BaseModel):
+    session_id: str
+    message_count: int
+    # None for an empty session.
+    last_message: Optional[Message] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class LearningFeedback(BaseModel):
     session_id: str
     message: str
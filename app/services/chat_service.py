@@ -1,13 +1,32 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
+import copy
+import time
 
-from app.models.schemas import ChatResponse, Intent, Message, MessageRole
+from app.models.analyzed_message import AnalyzedMessage
+from app.models.schemas import ChatRequest, ChatResponse, Intent, Message, MessageRole
 from automation.handlers.command_handler import CommandHandler
 from automation.handlers.adaptive_processor import AdaptiveProcessor
+from memory.conversation.session_context import SessionContext
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.metrics import StageTimer, get_metrics
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
+settings = get_settings()
+metrics = get_metrics()
+
+chat_requests_total = metrics.counter(
+    "chat_requests_total", "Chat messages processed", ["intent"]
+)
+chat_request_duration = metrics.histogram(
+    "chat_request_duration_seconds", "End-to-end chat message processing time", ["intent"]
+)
+chat_stage_duration = metrics.histogram(
+    "chat_stage_duration_seconds", "Time spent in each chat pipeline stage", ["stage", "intent"]
+)
 
 
 class ChatService:
@@ -17,13 +36,24 @@ class ChatService:
         entity_extractor,
         conversation_manager,
         vector_store,
+        command_handler: Optional[CommandHandler] = None,
+        adaptive_processor: Optional[AdaptiveProcessor] = None,
+        ingest_queue=None,
     ):
         self.intent_predictor = intent_predictor
         self.entity_extractor = entity_extractor
         self.conversation_manager = conversation_manager
         self.vector_store = vector_store
-        self.command_handler = CommandHandler()
-        self.adaptive_processor = AdaptiveProcessor()
+        self.command_handler = command_handler or CommandHandler()
+        self.adaptive_processor = adaptive_processor or AdaptiveProcessor()
+        self.ingest_queue = ingest_queue
+        
+        self.intent_cache = TTLCache(
+            "intent", settings.CLASSIFICATION_CACHE_SIZE, settings.CLASSIFICATION_CACHE_TTL
+        )
+        self.entity_cache = TTLCache(
+            "entities", settings.CLASSIFICATION_CACHE_SIZE, settings.CLASSIFICATION_CACHE_TTL
+        )
     
     async def process_message(
         self,
@@ -32,37 +62,55 @@ class ChatService:
         context: Optional[Dict[str, Any]] = None,
     ) -> ChatResponse:
         logger.info(f"Processing message for session {session_id}")
+        started_at = time.perf_counter()
+        timer = StageTimer(chat_stage_duration)
         
         user_message = Message(
             role=MessageRole.USER,
             content=message,
         )
+        await self.conversation_manager.restore(session_id)
         self.conversation_manager.add_message(session_id, user_message)
         
         conversation_history = self.conversation_manager.get_recent_messages(
             session_id, limit=5
         )
         
-        intent = await self._classify_intent(message, conversation_history)
-        
-        response_text, task_id = await self.command_handler.handle(
-            intent=intent,
-            message=message,
-            context=context or {},
-            history=conversation_history,
+        # Every stage reads the lowercase text, tokens and quotes from here.
+        analyzed = AnalyzedMessage(message)
+        intent = await self._classify_intent(
+            analyzed,
+            conversation_history,
+            timer,
+            self.conversation_manager.get_context(session_id),
         )
         
+        with timer.stage("command_handler"):
+            response_text, task_id = await self.command_handler.handle(
+                intent=intent,
+                message=analyzed,
+                context=context or {},
+                history=conversation_history,
+            )
+        
         assistant_message = Message(
             role=MessageRole.ASSISTANT,
             content=response_text,
         )
         self.conversation_manager.add_message(session_id, assistant_message)
         
-        await self.vector_store.add_interaction(
-            session_id=session_id,
-            user_message=message,
-            assistant_response=response_text,
-            intent=intent.type.value,
+        with timer.stage("vector_store_write"):
+            await self._record_interaction(
+                session_id=session_id,
+                user_message=message,
+                assistant_response=response_text,
+                intent=intent.type.value,
+            )
+        
+        timer.observe(intent=intent.type.value)
+        chat_requests_total.inc(intent=intent.type.value)
+        chat_request_duration.observe(
+            time.perf_counter() - started_at, intent=intent.type.value
         )
         
         return ChatResponse(
@@ -72,13 +120,215 @@ class ChatService:
             task_id=task_id,
         )
     
-    async def _classify_intent(self, message: str, history: list = None) -> Intent:
+    async def process_batch(self, requests: List[ChatRequest]) -> List[ChatResponse]:
+        logger.info(f"Processing batch of {len(requests)} messages")
+        started_at = time.perf_counter()
+        batch_timer = StageTimer(chat_stage_duration)
+        
+        messages = [AnalyzedMessage(request.message) for request in requests]
+        with batch_timer.stage("intent_prediction"):
+            intent_results = await self._predict_intents(messages)
+        with batch_timer.stage("entity_extraction"):
+            entity_results = await self._extract_entities_batch(messages)
+        
+        responses = []
+        interactions = []
+        timers = []
+        
+        for request, analyzed, intent_result, entities in zip(requests, messages, intent_results, entity_results):
+            timer = StageTimer(chat_stage_duration)
+            timers.append(timer)
+            
+            user_message = Message(
+                role=MessageRole.USER,
+                content=request.message,
+            )
+            await self.conversation_manager.restore(request.session_id)
+            self.conversation_manager.add_message(request.session_id, user_message)
+            
+            conversation_history = self.conversation_manager.get_recent_messages(
+                request.session_id, limit=5
+            )
+            
+            with timer.stage("enhance_understanding"):
+                intent = self._build_intent(
+                    analyzed,
+                    intent_result,
+                    entities,
+                    conversation_history,
+                    self.conversation_manager.get_context(request.session_id),
+                )
+            
+            with timer.stage("command_handler"):
+                response_text, task_id = await self.command_handler.handle(
+                    intent=intent,
+                    message=analyzed,
+                    context=request.context or {},
+                    history=conversation_history,
+                )
+            
+            assistant_message = Message(
+                role=MessageRole.ASSISTANT,
+                content=response_text,
+            )
+            self.conversation_manager.add_message(request.session_id, assistant_message)
+            
+            interactions.append({
+                "session_id": request.session_id,
+                "user_message": request.message,
+                "assistant_response": response_text,
+                "intent": intent.type.value,
+            })
+            
+            responses.append(ChatResponse(
+                response=response_text,
+                intent=intent,
+                session_id=request.session_id,
+                task_id=task_id,
+            ))
+        
+        with batch_timer.stage("vector_store_write"):
+            await self._record_interactions(interactions)
+        
+        # Shared stages are split evenly, so each message is recorded as if
+        # it had gone through process_message.
+        share = 1 / max(len(requests), 1)
+        elapsed = time.perf_counter() - started_at
+        for timer, response in zip(timers, responses):
+            for stage, duration in batch_timer.durations.items():
+                timer.durations[stage] = duration * share
+            intent = response.intent.type.value
+            timer.observe(intent=intent)
+            chat_requests_total.inc(intent=intent)
+            chat_request_duration.observe(elapsed * share, intent=intent)
+        
+        return responses
+    
+    async def _record_interaction(
+        self,
+        session_id: str,
+        user_message: str,
+        assistant_response: str,
+        intent: str,
+    ):
+        if self.ingest_queue is None:
+            await self.vector_store.add_interaction(
+                session_id=session_id,
+                user_message=user_message,
+                assistant_response=assistant_response,
+                intent=intent,
+            )
+            return
+        
+        await self.ingest_queue.submit({
+            "session_id": session_id,
+            "user_message": user_message,
+            "assistant_response": assistant_response,
+            "intent": intent,
+        })
+    
+    async def _record_interactions(self, interactions: List[Dict[str, Any]]):
+        if self.ingest_queue is None:
+            try:
+                await self.vector_store.add_interactions(interactions)
+            except Exception as e:
+                logger.error(f"Error adding interactions to vector store: {e}")
+            return
+        
+        await self.ingest_queue.submit_many(interactions)
+    
+    async def _classify_intent(
+        self,
+        message: Union[str, AnalyzedMessage],
+        history: list = None,
+        timer: Optional[StageTimer] = None,
+        session_context: Optional[SessionContext] = None,
+    ) -> Intent:
+        timer = timer or StageTimer(chat_stage_duration)
+        message = AnalyzedMessage.of(message)
+        
+        with timer.stage("intent_prediction"):
+            intent_result = await self._predict_intent(message)
+        
+        with timer.stage("entity_extraction"):
+            entities = await self._extract_entities(message)
+        
+        with timer.stage("enhance_understanding"):
+            return self._build_intent(message, intent_result, entities, history, session_context)
+    
+    async def _predict_intent(self, message: AnalyzedMessage) -> dict:
+        # Both the model tokenizer and the fallback rules lowercase their input.
+        key = message.lower
+        cached = self.intent_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
         intent_result = await self.intent_predictor.predict(message)
+        self.intent_cache.set(key, dict(intent_result))
+        return intent_result
+    
+    async def _predict_intents(self, messages: List[AnalyzedMessage]) -> List[dict]:
+        results: List[Optional[dict]] = [None] * len(messages)
+        missing = []
+        for i, message in enumerate(messages):
+            cached = self.intent_cache.get(message.lower)
+            if cached is not None:
+                results[i] = dict(cached)
+            else:
+                missing.append(i)
+        
+        if missing:
+            predicted = await self.intent_predictor.predict_batch([messages[i] for i in missing])
+            for i, intent_result in zip(missing, predicted):
+                self.intent_cache.set(messages[i].lower, dict(intent_result))
+                results[i] = intent_result
+        
+        return results
+    
+    async def _extract_entities_batch(self, messages: List[AnalyzedMessage]) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        missing = []
+        for i, message in enumerate(messages):
+            cached = self.entity_cache.get(message.text)
+            if cached is not None:
+                results[i] = self.entity_extractor.resolve_relative_time(copy.deepcopy(cached))
+            else:
+                missing.append(i)
+        
+        if missing:
+            extracted = await self.entity_extractor.extract_batch([messages[i] for i in missing])
+            for i, entities in zip(missing, extracted):
+                self.entity_cache.set(messages[i].text, copy.deepcopy(entities))
+                results[i] = entities
+        
+        return results
+    
+    async def _extract_entities(self, message: AnalyzedMessage) -> Dict[str, Any]:
+        # Entities keep the original casing (file names, paths), so key on the exact text.
+        cached = self.entity_cache.get(message.text)
+        if cached is not None:
+            entities = copy.deepcopy(cached)
+            # scheduled_datetime for "tomorrow", "later", ... is relative to now.
+            return self.entity_extractor.resolve_relative_time(entities)
+        
         entities = await self.entity_extractor.extract(message)
+        self.entity_cache.set(message.text, copy.deepcopy(entities))
+        return entities
+    
+    def _build_intent(
+        self,
+        message: Union[str, AnalyzedMessage],
+        intent_result: dict,
+        entities: Dict[str, Any],
+        history: list = None,
+        session_context: Optional[SessionContext] = None,
+    ) -> Intent:
+        if session_context is not None:
+            session_context.observe(message)
         
         if history:
             entities = self.adaptive_processor.enhance_understanding(
-                message, entities, history
+                message, entities, history, session_context
             )
         
         return Intent(
@@ -86,4 +336,3 @@ class ChatService:
             confidence=intent_result["confidence"],
             entities=entities,
         )
-
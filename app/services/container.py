@@ -0,0 +1,82 @@
+from typing import Optional
+
+from app.services.chat_service import ChatService
+from automation.handlers.command_handler import CommandHandler
+from automation.handlers.adaptive_processor import AdaptiveProcessor
+from automation.handlers.response_generator import ResponseGenerator
+from automation.tasks.device_detector import DeviceDetector
+from automation.tasks.executor import TaskExecutor
+from automation.tasks.file_operations import FileOperationTask
+from automation.tasks.reminder_task import ReminderTask
+from automation.tasks.script_runner import ScriptRunnerTask
+from automation.tasks.excel_operations import ExcelOperationTask
+from memory.vector_store.ingest_queue import InteractionIngestQueue
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ServiceContainer:
+    """Process-lifetime services shared by every request.
+    
+    Built once in ``lifespan`` so that device probing and handler setup
+    happen at startup instead of on each chat or task request.
+    """
+    
+    def __init__(
+        self,
+        intent_predictor,
+        entity_extractor,
+        conversation_manager,
+        vector_store,
+        device_detector: Optional[DeviceDetector] = None,
+    ):
+        self.intent_predictor = intent_predictor
+        self.entity_extractor = entity_extractor
+        self.conversation_manager = conversation_manager
+        self.vector_store = vector_store
+        self.device_detector = device_detector or DeviceDetector()
+        
+        self.file_task = FileOperationTask()
+        self.reminder_task = ReminderTask(device_detector=self.device_detector)
+        self.script_task = ScriptRunnerTask()
+        self.excel_task = ExcelOperationTask()
+        
+        self.command_handler = CommandHandler(
+            response_generator=ResponseGenerator(),
+            file_task=self.file_task,
+            reminder_task=self.reminder_task,
+            script_task=self.script_task,
+            excel_task=self.excel_task,
+        )
+        self.adaptive_processor = AdaptiveProcessor()
+        self.ingest_queue = InteractionIngestQueue(self.vector_store)
+        
+        self.task_executor = TaskExecutor(task_handlers={
+            "file_operation": self.file_task,
+            "reminder": self.reminder_task,
+            "script_runner": self.script_task,
+        })
+        
+        self.chat_service = ChatService(
+            intent_predictor=self.intent_predictor,
+            entity_extractor=self.entity_extractor,
+            conversation_manager=self.conversation_manager,
+            vector_store=self.vector_store,
+            command_handler=self.command_handler,
+            adaptive_processor=self.adaptive_processor,
+            ingest_queue=self.ingest_queue,
+        )
+        
+        logger.info("Service container ready")
+    
+    async def start(self):
+        self.adaptive_processor.load_patterns()
+        await self.ingest_queue.start()
+        await self.conversation_manager.start()
+    
+    async def close(self):
+        await self.conversation_manager.close()
+        await self.ingest_queue.close()
+        self.adaptive_processor.save_patterns()
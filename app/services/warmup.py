@@ -0,0 +1,121 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class Readiness:
+    def __init__(self):
+        self.ready = False
+        self.components: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.retries = 0
+        self.started_at = time.perf_counter()
+        self.completed_at: Optional[float] = None
+    
+    def mark_ready(self):
+        self.ready = True
+        self.completed_at = time.perf_counter()
+    
+    def mark_complete(self):
+        """End of warm-up: ready only if no component failed."""
+        self.ready = not self.errors
+        self.completed_at = time.perf_counter()
+    
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "ready": self.ready,
+            "failed_components": sorted(self.errors),
+            "components": {name: round(seconds, 4) for name, seconds in self.components.items()},
+            "errors": self.errors,
+            "retries": self.retries,
+            "warmup_seconds": (
+                round(self.completed_at - self.started_at, 4) if self.completed_at else None
+            ),
+        }
+
+
+async def warm_up(
+    readiness: Readiness,
+    intent_predictor,
+    entity_extractor,
+    vector_store,
+    messages: Optional[List[str]] = None,
+    iterations: Optional[int] = None,
+    retry_backoff: Optional[float] = None,
+    max_backoff: Optional[float] = None,
+):
+    """Warm every component, then retry the failed ones until all succeed.
+    
+    Retries wait ``retry_backoff`` seconds, doubling up to ``max_backoff``;
+    ``/ready`` turns 200 once the last failed component warms up.
+    """
+    messages = messages or settings.WARMUP_MESSAGES
+    iterations = iterations if iterations is not None else settings.WARMUP_ITERATIONS
+    delay = retry_backoff if retry_backoff is not None else settings.WARMUP_RETRY_BACKOFF
+    max_backoff = max_backoff if max_backoff is not None else settings.WARMUP_RETRY_MAX_BACKOFF
+    
+    async def warm_intent_predictor():
+        for message in messages:
+            await intent_predictor.predict(message)
+        await intent_predictor.predict_batch(messages)
+    
+    async def warm_entity_extractor():
+        await entity_extractor.extract_batch(messages)
+    
+    async def warm_vector_store():
+        # A model that failed to load at startup is loaded again here.
+        if getattr(vector_store, "embedding_model", True) is None:
+            await vector_store.initialize()
+        await vector_store.embed(messages)
+    
+    components = {
+        "intent_predictor": warm_intent_predictor,
+        "entity_extractor": warm_entity_extractor,
+        "vector_store": warm_vector_store,
+    }
+    for name, warm in components.items():
+        await _run_component(readiness, name, warm, iterations)
+    readiness.mark_complete()
+    
+    while not readiness.ready and delay > 0:
+        logger.error(
+            f"Warm-up failed for {sorted(readiness.errors)}, retrying in {delay:.1f}s: "
+            f"{readiness.errors}"
+        )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_backoff)
+        
+        readiness.retries += 1
+        for name in sorted(readiness.errors):
+            await _run_component(readiness, name, components[name], iterations)
+        readiness.mark_complete()
+    
+    if readiness.ready:
+        logger.info(f"Warm-up complete: {readiness.to_dict()}")
+    else:
+        logger.error(f"Warm-up failed, staying unready: {readiness.to_dict()}")
+
+
+async def _run_component(
+    readiness: Readiness,
+    name: str,
+    warm: Callable[[], Awaitable[None]],
+    iterations: int,
+):
+    start = time.perf_counter()
+    try:
+        for _ in range(iterations):
+            await warm()
+        readiness.errors.pop(name, None)
+    except Exception as e:
+        readiness.errors[name] = str(e)
+        logger.warning(f"Warm-up of {name} failed: {e}")
+    finally:
+        readiness.components[name] = time.perf_counter() - start
@@ -1,25 +1,37 @@
-from typing import Dict, Any, Optional, List
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union
+from app.models.analyzed_message import AnalyzedMessage
 from app.models.schemas import Message
+from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from memory.conversation.session_context import SessionContext, location_hint
+from memory.learning.pattern_sketch import PatternSketch
 
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 class AdaptiveProcessor:
-    def __init__(self):
+    def __init__(self, memory_bytes: Optional[int] = None):
         self.context_memory = {}
-        self.common_patterns = {}
+        self.memory_bytes = memory_bytes or settings.ADAPTIVE_PATTERN_MEMORY_BYTES
+        self.common_patterns = PatternSketch(self.memory_bytes)
         
     def enhance_understanding(
         self, 
-        message: str, 
+        message: Union[str, AnalyzedMessage], 
         entities: Dict[str, Any],
-        history: List[Message]
+        history: List[Message],
+        context: Optional[SessionContext] = None
     ) -> Dict[str, Any]:
+        message = AnalyzedMessage.of(message)
         enhanced = entities.copy()
         
-        enhanced = self._infer_from_context(message, enhanced, history)
+        if context is None:
+            context = SessionContext.from_history(history[-3:])
+        
+        enhanced = self._infer_from_context(message, enhanced, context)
         enhanced = self._apply_common_sense(message, enhanced)
         enhanced = self._expand_abbreviations(message, enhanced)
         
@@ -27,37 +39,24 @@ class AdaptiveProcessor:
     
     def _infer_from_context(
         self, 
-        message: str, 
+        message: AnalyzedMessage, 
         entities: Dict[str, Any],
-        history: List[Message]
+        context: SessionContext
     ) -> Dict[str, Any]:
         
-        if not entities.get("file_path") and history:
-            for msg in reversed(history[-3:]):
-                if msg.role.value == "user" and any(word in msg.content.lower() for word in ["file", "folder", "document"]):
-                    words = msg.content.split()
-                    for word in words:
-                        if len(word) > 2 and word[0].isupper():
-                            entities["inferred_filename"] = word
-                            break
+        if not entities.get("file_path"):
+            filename = context.recent_file
+            if filename:
+                entities["inferred_filename"] = filename
         
         return entities
     
-    def _apply_common_sense(self, message: str, entities: Dict[str, Any]) -> Dict[str, Any]:
-        message_lower = message.lower()
-        
-        location_hints = {
-            "desktop": "Desktop",
-            "downloads": "Downloads",
-            "documents": "Documents",
-            "pictures": "Pictures",
-            "home": "~",
-        }
+    def _apply_common_sense(self, message: AnalyzedMessage, entities: Dict[str, Any]) -> Dict[str, Any]:
+        message_lower = message.lower
         
-        for hint, path in location_hints.items():
-            if hint in message_lower:
-                entities["location_hint"] = path
-                break
+        hint = location_hint(message)
+        if hint:
+            entities["location_hint"] = hint
         
         if any(word in message_lower for word in ["urgent", "asap", "now", "quickly"]):
             entities["priority"] = "high"
@@ -67,7 +66,7 @@ class AdaptiveProcessor:
         
         return entities
     
-    def _expand_abbreviations(self, message: str, entities: Dict[str, Any]) -> Dict[str, Any]:
+    def _expand_abbreviations(self, message: AnalyzedMessage, entities: Dict[str, Any]) -> Dict[str, Any]:
         abbreviations = {
             "doc": "document",
             "docs": "documents",
@@ -81,7 +80,7 @@ class AdaptiveProcessor:
             "pref": "preference",
         }
         
-        message_lower = message.lower()
+        message_lower = message.lower
         for abbr, full in abbreviations.items():
             if abbr in message_lower:
                 entities["expanded_term"] = full
@@ -91,24 +90,33 @@ class AdaptiveProcessor:
     
     def learn_from_interaction(
         self,
-        message: str,
+        message: Union[str, AnalyzedMessage],
         intent: str,
         success: bool
     ):
         
+        message = AnalyzedMessage.of(message).text
         key = f"{intent}:{message[:30]}"
-        if key not in self.common_patterns:
-            self.common_patterns[key] = {
-                "count": 0,
-                "success_rate": 0.0,
-            }
-        
-        pattern = self.common_patterns[key]
-        pattern["count"] += 1
-        pattern["success_rate"] = (
-            (pattern["success_rate"] * (pattern["count"] - 1) + (1 if success else 0))
-            / pattern["count"]
-        )
-        
-        logger.info(f"Learned pattern: {key[:50]} (success rate: {pattern['success_rate']:.2f})")
+        self.common_patterns.record(key, success)
+        
+        logger.info(f"Learned pattern: {key[:50]} (success rate: {self.common_patterns.success_rate(key):.2f})")
+    
+    def save_patterns(self, path: Optional[Path] = None):
+        if not self.common_patterns.total:
+            return
+        
+        path = Path(path or settings.ADAPTIVE_PATTERNS_PATH)
+        self.common_patterns.save(path)
+        logger.info(f"Saved {len(self.common_patterns.top)} learned patterns to {path}")
+    
+    def load_patterns(self, path: Optional[Path] = None):
+        path = Path(path or settings.ADAPTIVE_PATTERNS_PATH)
+        if not path.exists():
+            return
+        
+        try:
+            self.common_patterns = PatternSketch.load(path, self.memory_bytes)
+            logger.info(f"Restored {self.common_patterns.total} learned interactions from {path}")
+        except Exception as e:
+            logger.warning(f"Could not restore learned patterns from {path}: {e}")
 
@@ -1,36 +1,63 @@
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union
 from uuid import uuid4
 import os
+import time
 from pathlib import Path
 
+from app.models.analyzed_message import AnalyzedMessage
 from app.models.schemas import Intent, IntentType, Message
 from automation.handlers.response_generator import ResponseGenerator
 from automation.tasks.file_operations import FileOperationTask
 from automation.tasks.reminder_task import ReminderTask
 from automation.tasks.script_runner import ScriptRunnerTask
 from automation.tasks.excel_operations import ExcelOperationTask
+from memory.conversation.session_context import excel_path
+from app.core.metrics import get_metrics
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
 
+command_handler_duration = get_metrics().histogram(
+    "command_handler_duration_seconds",
+    "Time spent in each CommandHandler branch",
+    ["handler", "intent"],
+)
+
+HANDLER_NAMES = {
+    IntentType.FILE_OPERATION: "file_operation",
+    IntentType.SCHEDULE_REMINDER: "reminder",
+    IntentType.RUN_SCRIPT: "script_execution",
+    IntentType.SEARCH: "search",
+    IntentType.SYSTEM_INFO: "system_info",
+    IntentType.EXCEL_OPERATION: "excel_operation",
+}
+
 
 class CommandHandler:
-    def __init__(self):
-        self.response_generator = ResponseGenerator()
-        self.file_task = FileOperationTask()
-        self.reminder_task = ReminderTask()
-        self.script_task = ScriptRunnerTask()
-        self.excel_task = ExcelOperationTask()
+    def __init__(
+        self,
+        response_generator: Optional[ResponseGenerator] = None,
+        file_task: Optional[FileOperationTask] = None,
+        reminder_task: Optional[ReminderTask] = None,
+        script_task: Optional[ScriptRunnerTask] = None,
+        excel_task: Optional[ExcelOperationTask] = None,
+    ):
+        self.response_generator = response_generator or ResponseGenerator()
+        self.file_task = file_task or FileOperationTask()
+        self.reminder_task = reminder_task or ReminderTask()
+        self.script_task = script_task or ScriptRunnerTask()
+        self.excel_task = excel_task or ExcelOperationTask()
     
     async def handle(
         self,
         intent: Intent,
-        message: str,
+        message: Union[str, AnalyzedMessage],
         context: Dict[str, Any],
         history: List[Message],
     ) -> Tuple[str, Optional[str]]:
         logger.info(f"Handling intent: {intent.type} with confidence {intent.confidence}")
+        message = AnalyzedMessage.of(message)
         
         active_mode = context.get("active_mode", "chat")
         
@@ -38,6 +65,22 @@ class CommandHandler:
         if not mode_check["allowed"]:
             return mode_check["message"], None
         
+        started_at = time.perf_counter()
+        try:
+            return await self._dispatch(intent, message, history)
+        finally:
+            command_handler_duration.observe(
+                time.perf_counter() - started_at,
+                handler=HANDLER_NAMES.get(intent.type, "chat"),
+                intent=intent.type.value,
+            )
+    
+    async def _dispatch(
+        self,
+        intent: Intent,
+        message: AnalyzedMessage,
+        history: List[Message],
+    ) -> Tuple[str, Optional[str]]:
         if intent.type == IntentType.FILE_OPERATION:
             return await self._handle_file_operation(intent, message)
         
@@ -92,13 +135,13 @@ class CommandHandler:
         return {"allowed": True, "message": None}
     
     async def _handle_file_operation(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
         entities = intent.entities
         operation = entities.get("operation", "create")
         file_path = entities.get("file_path", entities.get("directory_path"))
         
-        message_lower = message.lower()
+        message_lower = message.lower
         
         if not operation:
             if "folder" in message_lower or "directory" in message_lower:
@@ -122,18 +165,16 @@ class CommandHandler:
             logger.error(f"File operation failed: {e}")
             return f"Sorry, I couldn't {operation} the file: {str(e)}", None
     
-    def _extract_filename_from_message(self, message: str) -> Optional[str]:
-        import re
-        
-        quoted = re.findall(r'["\']([^"\']+)["\']', message)
-        if quoted:
-            return quoted[0]
+    def _extract_filename_from_message(self, message: Union[str, AnalyzedMessage]) -> Optional[str]:
+        message = AnalyzedMessage.of(message)
+        if message.quoted:
+            return message.quoted[0]
         
-        words = message.split()
+        words = message.tokens
         
         trigger_words = ["named", "called", "name", "titled", "as"]
-        for i, word in enumerate(words):
-            if word.lower() in trigger_words:
+        for i, word in enumerate(message.lower_tokens):
+            if word in trigger_words:
                 if i + 1 < len(words):
                     return words[i + 1].strip('"\'')
         
@@ -145,9 +186,9 @@ class CommandHandler:
         }
         
         potential_names = []
-        for word in words:
+        for word, word_lower in zip(words, message.lower_tokens):
             clean = word.strip('.,!?"\'"')
-            if clean and len(clean) > 1 and clean.lower() not in stop_words:
+            if clean and len(clean) > 1 and word_lower.strip('.,!?"\'"') not in stop_words:
                 potential_names.append(clean)
         
         if potential_names:
@@ -156,17 +197,18 @@ class CommandHandler:
         return None
     
     async def _execute_file_operation(
-        self, operation: str, file_path: str, original_message: str
+        self, operation: str, file_path: str, original_message: Union[str, AnalyzedMessage]
     ) -> Dict[str, Any]:
         home = str(Path.home())
         desktop = os.path.join(home, "Desktop")
+        message_lower = AnalyzedMessage.of(original_message).lower
         
-        if "desktop" in original_message.lower():
+        if "desktop" in message_lower:
             full_path = os.path.join(desktop, file_path)
         else:
             full_path = file_path
         
-        if operation in ["create_folder", "create"] and ("folder" in original_message.lower() or "directory" in original_message.lower()):
+        if operation in ["create_folder", "create"] and ("folder" in message_lower or "directory" in message_lower):
             os.makedirs(full_path, exist_ok=True)
             return {
                 "success": True,
@@ -218,15 +260,15 @@ class CommandHandler:
             }
     
     async def _handle_reminder(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
         entities = intent.entities
         scheduled_time = entities.get("scheduled_datetime")
         
-        reminder_message = message
+        reminder_message = message.text
         reminder_type = "reminder"
         
-        if any(word in message.lower() for word in ["meeting", "event", "appointment", "schedule"]):
+        if any(word in message.lower for word in ["meeting", "event", "appointment", "schedule"]):
             reminder_type = "calendar"
         
         try:
@@ -251,7 +293,7 @@ class CommandHandler:
             return f"Couldn't set reminder: {str(e)}", None
     
     async def _handle_script_execution(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
         entities = intent.entities
         script_name = entities.get("script_name")
@@ -275,56 +317,31 @@ class CommandHandler:
             return f"Couldn't execute script: {str(e)}", None
     
     async def _handle_search(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
-        entities = intent.entities
-        search_query = message
-        
-        import os
-        from pathlib import Path
-        
         home = str(Path.home())
         desktop = os.path.join(home, "Desktop")
         
         search_locations = [desktop, home]
         
         results = []
-        search_term = None
-        
-        words = message.lower().split()
-        if 'named' in words:
-            idx = words.index('named')
-            if idx + 1 < len(words):
-                search_term = words[idx + 1].strip('"\'')
-        elif 'called' in words:
-            idx = words.index('called')
-            if idx + 1 < len(words):
-                search_term = words[idx + 1].strip('"\'')
-        else:
-            import re
-            quoted = re.findall(r'["\']([^"\']+)["\']', message)
-            if quoted:
-                search_term = quoted[0]
-        
-        if not search_term:
-            potential = [w.strip('.,!?"\'') for w in words if len(w) > 3 and w not in ['find', 'search', 'folder', 'file', 'where', 'locate', 'help', 'please', 'exact', 'location', 'this', 'that', 'tell']]
-            if potential:
-                search_term = potential[-1]
+        search_term = self._extract_search_term(message)
         
         if search_term:
+            term_lower = search_term.lower()
             for location in search_locations:
                 try:
                     for root, dirs, files in os.walk(location):
-                        if search_term.lower() in root.lower():
+                        if term_lower in root.lower():
                             results.append(root)
                         
                         for d in dirs:
-                            if search_term.lower() in d.lower():
+                            if term_lower in d.lower():
                                 full_path = os.path.join(root, d)
                                 results.append(full_path)
                         
                         for f in files:
-                            if search_term.lower() in f.lower():
+                            if term_lower in f.lower():
                                 full_path = os.path.join(root, f)
                                 results.append(full_path)
                         
@@ -348,19 +365,42 @@ class CommandHandler:
         
         return response, None
     
+    def _extract_search_term(self, message: Union[str, AnalyzedMessage]) -> Optional[str]:
+        message = AnalyzedMessage.of(message)
+        search_term = None
+        
+        words = message.lower_tokens
+        if 'named' in words:
+            idx = words.index('named')
+            if idx + 1 < len(words):
+                search_term = words[idx + 1].strip('"\'')
+        elif 'called' in words:
+            idx = words.index('called')
+            if idx + 1 < len(words):
+                search_term = words[idx + 1].strip('"\'')
+        elif message.quoted:
+            search_term = message.quoted[0]
+        
+        if not search_term:
+            potential = [w.strip('.,!?"\'') for w in words if len(w) > 3 and w not in ['find', 'search', 'folder', 'file', 'where', 'locate', 'help', 'please', 'exact', 'location', 'this', 'that', 'tell']]
+            if potential:
+                search_term = potential[-1]
+        
+        return search_term
+    
     async def _handle_system_info(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
         response = await self.response_generator.generate_system_info_response()
         return response, None
     
     async def _handle_excel_operation(
-        self, intent: Intent, message: str
+        self, intent: Intent, message: AnalyzedMessage
     ) -> Tuple[str, Optional[str]]:
         entities = intent.entities
         file_path = entities.get("file_path", entities.get("directory_path"))
         
-        message_lower = message.lower()
+        message_lower = message.lower
         
         operation = "organize"
         if "duplicate" in message_lower:
@@ -392,26 +432,11 @@ class CommandHandler:
             logger.error(f"Excel operation failed: {e}")
             return f"Sorry, I couldn't process the Excel file: {str(e)}", None
     
-    def _extract_excel_file_from_message(self, message: str) -> Optional[str]:
-        import re
-        
-        excel_extensions = ['.xlsx', '.xls', '.csv']
-        
-        quoted = re.findall(r'["\']([^"\']+)["\']', message)
-        for quote in quoted:
-            if any(quote.lower().endswith(ext) for ext in excel_extensions):
-                return quote
-        
-        words = message.split()
-        for word in words:
-            clean_word = word.strip('.,!?"\'')
-            if any(clean_word.lower().endswith(ext) for ext in excel_extensions):
-                return clean_word
-        
-        return None
+    def _extract_excel_file_from_message(self, message: Union[str, AnalyzedMessage]) -> Optional[str]:
+        return excel_path(message)
     
     async def _handle_chat(
-        self, intent: Intent, message: str, history: List[Message]
+        self, intent: Intent, message: AnalyzedMessage, history: List[Message]
     ) -> Tuple[str, Optional[str]]:
         response = await self.response_generator.generate_chat_response(
             message, history
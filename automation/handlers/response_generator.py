@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Union
 import random
 from datetime import datetime
 import platform
@@ -6,6 +6,7 @@ import psutil
 import subprocess
 import os
 
+from app.models.analyzed_message import AnalyzedMessage
 from app.models.schemas import Message
 from app.core.logging_config import get_logger
 
@@ -37,9 +38,9 @@ class ResponseGenerator:
         ]
     
     async def generate_chat_response(
-        self, message: str, history: List[Message]
+        self, message: Union[str, AnalyzedMessage], history: List[Message]
     ) -> str:
-        message_lower = message.lower()
+        message_lower = AnalyzedMessage.of(message).lower
         
         if any(greet in message_lower for greet in ["hello", "hi", "hey", "greetings"]):
             return random.choice(self.greeting_responses)
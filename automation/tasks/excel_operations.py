@@ -1,8 +1,8 @@
-import pandas as pd
 import os
 from typing import Dict, Any, List
 from pathlib import Path
 
+from app.core.profiling import lazy_import
 from app.core.logging_config import get_logger
 
 
@@ -55,7 +55,7 @@ class ExcelOperationTask:
     
     async def _remove_duplicates(self, file_path: str) -> Dict[str, Any]:
         try:
-            df = pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+            df = self._read_file(file_path)
             
             original_count = len(df)
             df_cleaned = df.drop_duplicates()
@@ -84,7 +84,7 @@ class ExcelOperationTask:
     
     async def _sort_alphabetical(self, file_path: str) -> Dict[str, Any]:
         try:
-            df = pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+            df = self._read_file(file_path)
             
             text_columns = df.select_dtypes(include=['object']).columns
             
@@ -119,7 +119,7 @@ class ExcelOperationTask:
     
     async def _organize_data(self, file_path: str) -> Dict[str, Any]:
         try:
-            df = pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+            df = self._read_file(file_path)
             
             original_count = len(df)
             
@@ -157,7 +157,7 @@ class ExcelOperationTask:
     
     async def _clean_data(self, file_path: str) -> Dict[str, Any]:
         try:
-            df = pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+            df = self._read_file(file_path)
             
             original_count = len(df)
             
@@ -197,13 +197,17 @@ class ExcelOperationTask:
                 "message": f"Failed to clean data: {str(e)}"
             }
     
+    def _read_file(self, file_path: str):
+        pd = lazy_import("pandas")
+        return pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+    
     def _get_output_path(self, original_path: str, suffix: str) -> str:
         path = Path(original_path)
         return str(path.parent / f"{path.stem}{suffix}{path.suffix}")
     
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         try:
-            df = pd.read_excel(file_path) if file_path.endswith(('.xlsx', '.xls')) else pd.read_csv(file_path)
+            df = self._read_file(file_path)
             
             return {
                 "success": True,
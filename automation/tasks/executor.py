@@ -1,6 +1,6 @@
 import asyncio
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.models.schemas import TaskStatus
 from automation.tasks.file_operations import FileOperationTask
@@ -13,8 +13,8 @@ logger = get_logger(__name__)
 
 
 class TaskExecutor:
-    def __init__(self):
-        self.task_handlers = {
+    def __init__(self, task_handlers: Optional[Dict[str, Any]] = None):
+        self.task_handlers = task_handlers or {
             "file_operation": FileOperationTask(),
             "reminder": ReminderTask(),
             "script_runner": ScriptRunnerTask(),
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from automation.tasks.device_detector import DeviceDetector
@@ -11,8 +11,8 @@ logger = get_logger(__name__)
 
 
 class ReminderTask:
-    def __init__(self):
-        self.device_detector = DeviceDetector()
+    def __init__(self, device_detector: Optional[DeviceDetector] = None):
+        self.device_detector = device_detector or DeviceDetector()
         self.device_info = self.device_detector.get_device_info()
         
         logger.info(f"Device detected: {self.device_info['os']} ({self.device_info['machine']})")
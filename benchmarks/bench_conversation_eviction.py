@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.models.schemas import Message, MessageRole
+from memory.conversation.manager import ConversationManager
+
+
+def workload(manager: ConversationManager, sessions: int, messages: int, seed: int = 11):
+    """Sessions start one after another; most messages go to one started
+    recently, a few to one from long ago, which then has to be reloaded.
+    
+    Eviction runs inline whenever the budget is exceeded, where the service
+    would run it in the background, so its cost is included, and so are
+    the restores ChatService awaits before a spilled session's next message.
+    """
+    rng = random.Random(seed)
+    loop = asyncio.new_event_loop()
+    for i in range(sessions * messages):
+        newest = i // messages
+        if rng.random() < 0.05:
+            session = rng.randint(0, newest)
+        else:
+            session = max(0, newest - int(rng.expovariate(1 / 20)))
+        session_id = f"session-{session}"
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        if session_id in manager.spilled:
+            loop.run_until_complete(manager.restore(session_id))
+        manager.add_message(
+            session_id,
+            Message(role=role, content=f"open the quarterly report number {i} on my desktop"),
+        )
+        if manager.over_budget:
+            loop.run_until_complete(manager.evict())
+    loop.close()
+
+
+def run(sessions: int, messages: int, budget: int):
+    print(f"{sessions} sessions, {sessions * messages} messages")
+    print(f"{'budget':<10}{'us/message':>11}{'resident MiB':>14}{'spilled':>9}{'disk MiB':>10}{'reloads':>9}{'reload ms':>11}")
+    
+    for label, memory_budget in (("none", 0), (f"{budget >> 20} MiB", budget)):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            manager = ConversationManager(memory_budget=memory_budget, idle_ttl=0, spill_dir=Path(spill_dir))
+            start = time.perf_counter()
+            workload(manager, sessions, messages)
+            elapsed = time.perf_counter() - start
+            reloads = manager.reloads
+            
+            # Traced on a separate run, which tracemalloc slows down.
+            tracemalloc.start()
+            traced = ConversationManager(memory_budget=memory_budget, idle_ttl=0, spill_dir=Path(spill_dir) / "traced")
+            workload(traced, sessions, messages)
+            resident = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del traced
+            
+            disk = sum(path.stat().st_size for path in Path(spill_dir).glob("*.json.gz"))
+            reload_ms = 0.0
+            if manager.spilled:
+                spilled = sorted(manager.spilled)[:100]
+                loop = asyncio.new_event_loop()
+                start = time.perf_counter()
+                for session_id in spilled:
+                    loop.run_until_complete(manager.get_conversation(session_id))
+                reload_ms = (time.perf_counter() - start) / len(spilled) * 1e3
+                loop.close()
+            
+            print(
+                f"{label:<10}{elapsed / (sessions * messages) * 1e6:>11.1f}{resident / 2**20:>14.1f}"
+                f"{len(manager.spilled):>9}{disk / 2**20:>10.1f}{reloads:>9}{reload_ms:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ConversationManager with and without a memory budget")
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--messages", type=int, default=6)
+    parser.add_argument("--budget", type=int, default=16 * 2**20)
+    args = parser.parse_args()
+    
+    run(args.sessions, args.messages, args.budget)
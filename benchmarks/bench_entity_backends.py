@@ -0,0 +1,108 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from ml.training.data_generator import tagged_messages
+
+
+BATCH_SIZES = (1, 8, 32, 128)
+
+
+def _time(fn: Callable[[List[str]], object], messages: List[str], batch_size: int, rounds: int) -> float:
+    """Median seconds to run ``fn`` over ``messages`` in batches of ``batch_size``."""
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    fn(batches[0])
+    
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for batch in batches:
+            fn(batch)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _recall(extract: Callable[[List[str]], List[dict]], labelled) -> float:
+    found = total = 0
+    for (text, spans), entities in zip(labelled, extract([text for text, _ in labelled])):
+        for entity, start, end in spans:
+            values = entities.get(entity)
+            values = values if isinstance(values, list) else [values]
+            found += text[start:end] in values
+            total += 1
+    return found / total
+
+
+def _elapsed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(count: int, rounds: int):
+    os.environ["ENTITY_BACKEND"] = "model"
+    from ml.inference.entity_extractor import EntityExtractorModel
+    from ml.inference.entity_tagger import log_softmax, tokenize, viterbi_decode
+    
+    extractor = EntityExtractorModel()
+    tagger = extractor.tagger
+    if tagger is None:
+        raise SystemExit("No trained entity tagger found; run ml/training/train_entity_tagger.py first")
+    
+    # A seed the tagger was not trained on.
+    labelled = tagged_messages(count, seed=12345)
+    messages = [text for text, _ in labelled]
+    
+    def regex_only(batch):
+        return [extractor._extract(text) for text in batch]
+    
+    def with_model(batch):
+        tagged = tagger.tag_batch(batch)
+        return [extractor._extract(text, entities) for text, entities in zip(batch, tagged)]
+    
+    print(f"{count} generated messages, median of {rounds} rounds")
+    print(f"Slot recall: regex {_recall(regex_only, labelled):.3f}, regex + model {_recall(with_model, labelled):.3f}")
+    print(f"{'batch':>6}{'regex msg/s':>14}{'model msg/s':>14}")
+    for batch_size in BATCH_SIZES:
+        regex_seconds = _time(regex_only, messages, batch_size, rounds)
+        model_seconds = _time(with_model, messages, batch_size, rounds)
+        print(f"{batch_size:>6}{count / regex_seconds:>14.0f}{count / model_seconds:>14.0f}")
+    
+    token_lists = [[token for token, _, _ in tokenize(text)] for text in messages]
+    ids, lengths = tagger.encode(token_lists)
+    emissions = log_softmax(np.asarray(tagger.model(ids)))
+    
+    def batched():
+        return viterbi_decode(emissions, tagger.transitions, tagger.start, lengths)
+    
+    def per_sequence():
+        return [
+            viterbi_decode(emissions[i:i + 1, :length], tagger.transitions, tagger.start, lengths[i:i + 1])
+            for i, length in enumerate(lengths)
+        ]
+    
+    for path, single in zip(batched(), per_sequence()):
+        assert np.array_equal(path[:single.shape[1]], single[0])
+    
+    batched_seconds = min(_elapsed(batched) for _ in range(rounds))
+    loop_seconds = min(_elapsed(per_sequence) for _ in range(rounds))
+    print(
+        f"Viterbi over {count} sequences: {batched_seconds * 1000:.1f} ms batched, "
+        f"{loop_seconds * 1000:.1f} ms one at a time ({loop_seconds / batched_seconds:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entity extraction throughput: regex only vs regex + BiLSTM tagger")
+    parser.add_argument("--messages", type=int, default=2048)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    
+    run(args.messages, args.rounds)
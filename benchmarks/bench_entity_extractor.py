@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import time
+from typing import List
+
+from ml.inference.entity_extractor import EntityExtractorModel
+from tests.legacy_reference import LegacyEntityExtractor, comparable_entities, synthetic_messages
+
+
+def _time(extract, messages: List[str], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for message in messages:
+            extract(message)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) / len(messages) * 1e6
+
+
+def run(count: int, rounds: int):
+    messages = synthetic_messages(count)
+    legacy = LegacyEntityExtractor()
+    compiled = EntityExtractorModel()
+    
+    mismatches = [
+        m for m in messages if comparable_entities(legacy._extract(m)) != comparable_entities(compiled._extract(m))
+    ]
+    if mismatches:
+        raise SystemExit(f"Compiled extractor disagrees with the legacy one on: {mismatches[:10]}")
+    
+    legacy_us = _time(legacy._extract, messages, rounds)
+    compiled_us = _time(compiled._extract, messages, rounds)
+    
+    print(f"{len(messages)} synthetic messages, median of {rounds} rounds")
+    print(f"{'implementation':<18}{'us/message':>12}")
+    print(f"{'legacy':<18}{legacy_us:>12.2f}")
+    print(f"{'compiled':<18}{compiled_us:>12.2f}")
+    print(f"Speedup: {legacy_us / compiled_us:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entity extraction: legacy vs compiled patterns")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    run(args.messages, args.rounds)
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import statistics
+import subprocess
+import time
+
+from ml.training.data_generator import IntentDataGenerator
+
+
+BACKENDS = ("keras", "onnx", "linear")
+BATCH_SIZES = (1, 8, 32)
+
+
+def _messages():
+    samples = IntentDataGenerator().training_samples
+    return [message for group in samples.values() for message in group]
+
+
+def measure(backend: str, rounds: int):
+    os.environ["INTENT_BACKEND"] = backend
+    
+    import psutil
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    
+    start = time.perf_counter()
+    from ml.inference.intent_predictor import IntentPredictor
+    predictor = IntentPredictor()
+    load_seconds = time.perf_counter() - start
+    
+    if predictor.model is None:
+        raise SystemExit(f"No trained {backend} model found; train and export it first")
+    
+    messages = _messages()
+    predictions = predictor._model_predict_batch(messages)
+    
+    latencies = {}
+    for batch_size in BATCH_SIZES:
+        batch = (messages * batch_size)[:batch_size]
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            predictor._model_predict_batch(batch)
+            samples.append(time.perf_counter() - start)
+        latencies[batch_size] = statistics.median(samples) * 1000
+    
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_mb": (process.memory_info().rss - rss_before) / 1024 / 1024,
+        "tensorflow_imported": "tensorflow" in sys.modules,
+        "latency_ms": latencies,
+        "predictions": [
+            [prediction["intent"].value, prediction["confidence"]] for prediction in predictions
+        ],
+    }))
+
+
+def run(rounds: int):
+    results = {}
+    for backend in BACKENDS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", backend, "--rounds", str(rounds)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results[backend] = json.loads(output.strip().splitlines()[-1])
+    
+    header = f"{'backend':<8}{'load s':>9}{'rss MB':>9}{'tf':>6}"
+    header += "".join(f"{f'batch {size} ms':>14}" for size in BATCH_SIZES)
+    print(header)
+    for backend, result in results.items():
+        line = (
+            f"{backend:<8}{result['load_seconds']:>9.2f}{result['rss_mb']:>9.0f}"
+            f"{'yes' if result['tensorflow_imported'] else 'no':>6}"
+        )
+        line += "".join(f"{result['latency_ms'][str(size)]:>14.2f}" for size in BATCH_SIZES)
+        print(line)
+    
+    keras_predictions = results["keras"]["predictions"]
+    for backend in BACKENDS[1:]:
+        predictions = results[backend]["predictions"]
+        agree = sum(k[0] == o[0] for k, o in zip(keras_predictions, predictions))
+        max_diff = max(abs(k[1] - o[1]) for k, o in zip(keras_predictions, predictions))
+        print(
+            f"Parity {backend} vs keras: {agree}/{len(keras_predictions)} labels agree, "
+            f"max confidence diff {max_diff:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent classifier latency: Keras vs ONNX Runtime vs the linear model")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        measure(args.child, args.rounds)
+    else:
+        run(args.rounds)
@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+
+from ml.training.data_generator import IntentDataGenerator
+
+
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9, 0.95)
+
+
+def _labelled_messages():
+    samples = IntentDataGenerator().training_samples
+    return [(message, intent) for intent, group in samples.items() for message in group]
+
+
+async def measure(predictor, messages, threshold, rounds: int):
+    predictor.cascade_threshold = threshold
+    predictor.tier_answers.clear()
+    
+    results = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [await predictor.predict(message) for message in messages]
+    elapsed = (time.perf_counter() - start) / rounds
+    
+    return results, elapsed, predictor.tier_answers["fallback"] / (len(messages) * rounds)
+
+
+async def run(backend: str, rounds: int):
+    os.environ["INTENT_BACKEND"] = backend
+    os.environ["INTENT_BATCH_WINDOW_MS"] = "0"
+    from ml.inference.intent_predictor import IntentPredictor
+    
+    predictor = IntentPredictor()
+    if predictor.model is None:
+        raise SystemExit(f"No trained {backend} model found; train it first")
+    
+    labelled = _labelled_messages()
+    messages = [message for message, _ in labelled]
+    labels = [intent for _, intent in labelled]
+    
+    model_results, model_seconds, _ = await measure(predictor, messages, None, rounds)
+    print(f"Backend: {backend}, {len(messages)} generated messages, sequential predict calls")
+    print(f"{'threshold':<11}{'fallback %':>11}{'accuracy':>10}{'agree w/ model':>16}{'ms/msg':>9}{'speedup':>9}")
+    
+    def row(name, results, seconds, share):
+        accuracy = sum(r["intent"].value == label for r, label in zip(results, labels)) / len(labels)
+        agree = sum(r["intent"] == m["intent"] for r, m in zip(results, model_results)) / len(labels)
+        print(
+            f"{name:<11}{share * 100:>10.1f}%{accuracy:>10.3f}{agree * 100:>15.1f}%"
+            f"{seconds / len(messages) * 1000:>9.3f}{model_seconds / seconds:>8.2f}x"
+        )
+    
+    row("model only", model_results, model_seconds, 0.0)
+    for threshold in THRESHOLDS:
+        row(f"{threshold:.2f}", *await measure(predictor, messages, threshold, rounds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share of traffic, accuracy and latency of the rule/model cascade per threshold")
+    parser.add_argument("--backend", choices=("keras", "onnx", "embedding"), default="onnx")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.backend, args.rounds))
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import time
+
+from ml.inference.fallback_rules import CompiledFallbackRules
+from ml.training.data_generator import IntentDataGenerator
+from tests.legacy_reference import legacy_fallback_predict
+
+
+def _messages():
+    samples = IntentDataGenerator().training_samples
+    messages = [message for group in samples.values() for message in group]
+    messages += [
+        "Hello, can you find the report I saved yesterday?",
+        "please remove duplicates from sales.xlsx and sort alphabetically",
+        "what is the cpu usage and memory status right now",
+        "create a folder called archive on my desktop",
+        "python backup.py --full at 5pm tomorrow",
+    ]
+    return messages
+
+
+def _time(fn, messages, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for message in messages:
+            fn(message)
+        samples.append((time.perf_counter() - start) / len(messages))
+    return statistics.median(samples) * 1e6
+
+
+def run(rounds: int):
+    messages = _messages()
+    rules = CompiledFallbackRules()
+    
+    mismatches = [m for m in messages if legacy_fallback_predict(m) != rules.predict(m)]
+    if mismatches:
+        raise SystemExit(f"Compiled rules disagree with the legacy fallback on: {mismatches}")
+    
+    legacy = _time(legacy_fallback_predict, messages, rounds)
+    compiled = _time(rules.predict, messages, rounds)
+    
+    print(f"{len(messages)} messages, median of {rounds} rounds")
+    print(f"{'implementation':<18}{'us/message':>12}")
+    print(f"{'legacy':<18}{legacy:>12.2f}")
+    print(f"{'compiled':<18}{compiled:>12.2f}")
+    print(f"Speedup: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule-based intent fallback: legacy vs compiled rules")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    run(args.rounds)
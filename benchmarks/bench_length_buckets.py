@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+import numpy as np
+
+from ml.training.data_generator import IntentDataGenerator
+
+
+BATCH_SIZES = (1, 8, 32)
+
+
+def _messages():
+    samples = IntentDataGenerator().training_samples
+    return [message for group in samples.values() for message in group]
+
+
+def throughput(predictor, messages, batch_size: int, buckets, seconds: float) -> float:
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    
+    for batch in batches:
+        predictor.model.predict(predictor.tokenizer.encode(batch, buckets=buckets), verbose=0)
+    
+    processed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for batch in batches:
+            encoded = predictor.tokenizer.encode(batch, buckets=buckets)
+            predictor.model.predict(encoded, verbose=0)
+            processed += len(batch)
+    return processed / (time.perf_counter() - start)
+
+
+def run(backend: str, seconds: float):
+    os.environ["INTENT_BACKEND"] = backend
+    from ml.inference.intent_predictor import IntentPredictor
+    
+    predictor = IntentPredictor()
+    if predictor.model is None:
+        raise SystemExit(f"No trained {backend} model found; train and export it first")
+    if predictor.length_buckets is None:
+        raise SystemExit("Model output depends on padding width; retrain it to benchmark buckets")
+    
+    messages = _messages()
+    buckets = predictor.length_buckets
+    
+    full = predictor.model.predict(predictor.tokenizer.encode(messages), verbose=0)
+    bucketed = np.concatenate([
+        predictor.model.predict(predictor.tokenizer.encode([message], buckets=buckets), verbose=0)
+        for message in messages
+    ])
+    widths = [predictor.tokenizer.encode([message], buckets=buckets).shape[1] for message in messages]
+    
+    print(f"Backend: {backend}, buckets {buckets}, max length {predictor.tokenizer.max_length}")
+    print(f"Messages: {len(messages)}, single-message widths: "
+          + ", ".join(f"{width}: {widths.count(width)}" for width in sorted(set(widths))))
+    print(f"Parity: {int((full.argmax(1) == bucketed.argmax(1)).sum())}/{len(messages)} labels agree, "
+          f"max probability diff {np.abs(full - bucketed).max():.2e}")
+    print()
+    
+    print(f"{'batch':<8}{'fixed msg/s':>14}{'bucketed msg/s':>17}{'speedup':>10}")
+    for batch_size in BATCH_SIZES:
+        fixed_rate = throughput(predictor, messages, batch_size, None, seconds)
+        bucketed_rate = throughput(predictor, messages, batch_size, buckets, seconds)
+        print(f"{batch_size:<8}{fixed_rate:>14.0f}{bucketed_rate:>17.0f}{bucketed_rate / fixed_rate:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent throughput with fixed vs length-bucketed padding")
+    parser.add_argument("--backend", choices=("keras", "onnx"), default="onnx")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measurement time per configuration")
+    args = parser.parse_args()
+    
+    run(args.backend, args.seconds)
@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from memory.learning.pattern_sketch import PatternSketch
+
+
+def legacy_record(patterns: Dict[str, dict], key: str, success: bool):
+    # AdaptiveProcessor.learn_from_interaction before the sketch.
+    if key not in patterns:
+        patterns[key] = {
+            "count": 0,
+            "success_rate": 0.0,
+        }
+    
+    pattern = patterns[key]
+    pattern["count"] += 1
+    pattern["success_rate"] = (
+        (pattern["success_rate"] * (pattern["count"] - 1) + (1 if success else 0))
+        / pattern["count"]
+    )
+
+
+def interactions(count: int, keys: int, seed: int = 5) -> List[Tuple[str, bool]]:
+    """Half Zipf-like head, half long tail of rare messages; each key has its own success rate."""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            rank = min(int(rng.paretovariate(1.05)), keys)
+        else:
+            rank = rng.randint(1, keys)
+        success = rng.random() < 0.5 + 0.4 * ((rank * 7919) % 100) / 100
+        events.append((f"file_operation:open the quarterly report {rank}", success))
+    return events
+
+
+def measure(record, make_store, events) -> Tuple[float, int, object]:
+    """us per record, and bytes held once every event is recorded (traced separately)."""
+    store = make_store()
+    start = time.perf_counter()
+    for key, success in events:
+        record(store, key, success)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    traced = make_store()
+    for key, success in events:
+        record(traced, key, success)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed / len(events) * 1e6, memory, store
+
+
+def run(count: int, keys: int, memory_bytes: int):
+    events = interactions(count, keys)
+    
+    legacy_us, legacy_memory, legacy = measure(legacy_record, dict, events)
+    sketch_us, sketch_memory, sketch = measure(PatternSketch.record, lambda: PatternSketch(memory_bytes), events)
+    
+    print(f"{count} interactions over {len(legacy)} distinct keys")
+    print(f"{'store':<10}{'us/record':>11}{'memory KiB':>12}")
+    print(f"{'dict':<10}{legacy_us:>11.2f}{legacy_memory / 1024:>12.0f}")
+    print(f"{'sketch':<10}{sketch_us:>11.2f}{sketch_memory / 1024:>12.0f}")
+    
+    for top in (10, 100):
+        heaviest = sorted(legacy, key=lambda key: legacy[key]["count"], reverse=True)[:top]
+        count_error = rate_error = 0.0
+        for key in heaviest:
+            estimated_count, estimated_rate = sketch.estimate(key)
+            count_error += abs(estimated_count - legacy[key]["count"]) / legacy[key]["count"]
+            rate_error += abs(estimated_rate - legacy[key]["success_rate"])
+        print(
+            f"Top {top} keys: mean count error {count_error / top * 100:.2f}%, "
+            f"mean success-rate error {rate_error / top:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Learned-pattern store: unbounded dict vs count-min sketch + heavy hitters")
+    parser.add_argument("--interactions", type=int, default=500000)
+    parser.add_argument("--keys", type=int, default=200000)
+    parser.add_argument("--memory-bytes", type=int, default=262144)
+    args = parser.parse_args()
+    
+    run(args.interactions, args.keys, args.memory_bytes)
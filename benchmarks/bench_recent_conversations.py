@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from app.models.schemas import Conversation, Message, MessageRole
+from memory.conversation.manager import ConversationManager
+
+
+async def legacy_recent_conversations(manager: ConversationManager, limit: int) -> List[Conversation]:
+    # ConversationManager.get_recent_conversations before the recency index.
+    sorted_sessions = sorted(
+        manager.metadata.items(),
+        key=lambda x: x[1].get("updated_at", datetime.min),
+        reverse=True,
+    )
+    
+    conversations = []
+    for session_id, _ in sorted_sessions[:limit]:
+        conv = await manager.get_conversation(session_id)
+        if conv:
+            conversations.append(conv)
+    
+    return conversations
+
+
+def populate(sessions: int, messages: int, seed: int = 3) -> ConversationManager:
+    rng = random.Random(seed)
+    manager = ConversationManager()
+    message = Message(role=MessageRole.USER, content="open the quarterly report")
+    for _ in range(sessions * messages):
+        manager.add_message(f"session-{rng.randrange(sessions)}", message)
+    return manager
+
+
+def time_call(fn: Callable[[], object], rounds: int, loop: asyncio.AbstractEventLoop) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            loop.run_until_complete(result)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def run(session_counts: List[int], messages: int, limit: int, rounds: int):
+    print(f"Top {limit} of N sessions, {messages} messages per session on average")
+    print(f"{'sessions':>9}{'sorted ms':>11}{'index ms':>10}{'summary ms':>12}")
+    loop = asyncio.new_event_loop()
+    for sessions in session_counts:
+        manager = populate(sessions, messages)
+        legacy = time_call(lambda: legacy_recent_conversations(manager, limit), rounds, loop)
+        indexed = time_call(lambda: manager.get_recent_conversations(limit), rounds, loop)
+        summary = time_call(lambda: manager.get_recent_summaries(limit), rounds, loop)
+        print(f"{sessions:>9}{legacy:>11.3f}{indexed:>10.3f}{summary:>12.3f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recent conversations: full sort vs recency index vs summaries")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--messages", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    run(args.sessions, args.messages, args.limit, args.rounds)
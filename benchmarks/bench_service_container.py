@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.chat_service import ChatService
+from app.services.container import ServiceContainer
+from ml.inference.intent_predictor import IntentPredictor
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+
+
+class NullVectorStore:
+    async def add_interaction(self, **kwargs):
+        return None
+    
+    async def add_interactions(self, interactions):
+        return None
+
+
+MESSAGES = [
+    "hello",
+    "tell me a joke",
+    "remind me tomorrow at 9am",
+    "search for my report",
+    "thanks",
+]
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+async def run(iterations: int):
+    intent_predictor = IntentPredictor()
+    entity_extractor = EntityExtractorModel()
+    conversation_manager = ConversationManager()
+    vector_store = NullVectorStore()
+    
+    per_request = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        chat_service = ChatService(
+            intent_predictor=intent_predictor,
+            entity_extractor=entity_extractor,
+            conversation_manager=conversation_manager,
+            vector_store=vector_store,
+        )
+        await chat_service.process_message(MESSAGES[i % len(MESSAGES)], "bench-before")
+        per_request.append(time.perf_counter() - start)
+    
+    container = ServiceContainer(
+        intent_predictor=intent_predictor,
+        entity_extractor=entity_extractor,
+        conversation_manager=conversation_manager,
+        vector_store=vector_store,
+    )
+    await container.start()
+    
+    shared = []
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            await container.chat_service.process_message(MESSAGES[i % len(MESSAGES)], "bench-after")
+            shared.append(time.perf_counter() - start)
+    finally:
+        await container.close()
+    
+    before = _summary(per_request)
+    after = _summary(shared)
+    
+    print(f"{'mode':<24}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'ChatService per request':<24}{before['mean_ms']:>10.2f}{before['p50_ms']:>10.2f}{before['p95_ms']:>10.2f}")
+    print(f"{'shared container':<24}{after['mean_ms']:>10.2f}{after['p50_ms']:>10.2f}{after['p95_ms']:>10.2f}")
+    print(f"Per-request overhead removed: {before['mean_ms'] - after['mean_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request ChatService construction overhead")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.iterations))
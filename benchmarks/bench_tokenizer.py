@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from ml.inference.text_encoder import TextEncoder
+from ml.training.data_generator import IntentDataGenerator
+
+
+BATCH_SIZES = (1, 8, 32, 256)
+
+
+def _time(fn, batch, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(batch)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def run(rounds: int):
+    from tensorflow.keras.preprocessing.text import Tokenizer
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    
+    samples = IntentDataGenerator().training_samples
+    messages = [message for group in samples.values() for message in group]
+    
+    tokenizer = Tokenizer(oov_token="<OOV>")
+    tokenizer.fit_on_texts(messages)
+    encoder = TextEncoder(oov_token="<OOV>")
+    encoder.fit_on_texts(messages)
+    
+    def keras_encode(batch):
+        return pad_sequences(
+            tokenizer.texts_to_sequences(batch), maxlen=50, padding='post', truncating='post'
+        )
+    
+    np.testing.assert_array_equal(keras_encode(messages), encoder.encode(messages))
+    
+    print(f"{'batch':>6}{'keras us':>12}{'encoder us':>12}{'speedup':>10}")
+    for batch_size in BATCH_SIZES:
+        batch = (messages * (batch_size // len(messages) + 1))[:batch_size]
+        keras_us = _time(keras_encode, batch, rounds)
+        encoder_us = _time(encoder.encode, batch, rounds)
+        print(f"{batch_size:>6}{keras_us:>12.1f}{encoder_us:>12.1f}{keras_us / encoder_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent preprocessing: Keras Tokenizer + pad_sequences vs TextEncoder")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    run(args.rounds)
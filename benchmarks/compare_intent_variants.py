@@ -0,0 +1,146 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.config import get_settings
+from ml.training.data_generator import IntentDataGenerator
+
+
+VARIANTS = {
+    "keras-float": ("keras", "float"),
+    "onnx-float": ("onnx", "float"),
+    "onnx-int8": ("onnx", "int8"),
+}
+BATCH_SIZES = (1, 8, 32)
+
+
+def validation_split(seed: int):
+    """The validation texts and intent names from ``IntentDataGenerator.generate()``.
+    
+    ``generate`` returns the split already encoded with a vocabulary fitted on
+    that shuffle, so it is decoded back to words here and each variant
+    re-encodes it with the vocabulary saved next to the model.
+    """
+    random.seed(seed)
+    generator = IntentDataGenerator()
+    _, (X_val, y_val), _, intent_map = generator.generate()
+    
+    words = {index: word for word, index in generator.tokenizer.word_index.items()}
+    intents = {index: intent for intent, index in intent_map.items()}
+    texts = [" ".join(words[int(i)] for i in row if i) for row in X_val]
+    return texts, [intents[int(label)] for label in y_val]
+
+
+def model_path(backend: str, variant: str) -> Path:
+    settings = get_settings()
+    if variant == "int8":
+        return Path(settings.INTENT_INT8_ONNX_PATH)
+    return Path(settings.INTENT_ONNX_PATH if backend == "onnx" else settings.INTENT_MODEL_PATH)
+
+
+def measure(name: str, texts_path: str, rounds: int):
+    backend, variant = VARIANTS[name]
+    os.environ["INTENT_BACKEND"] = backend
+    os.environ["INTENT_MODEL_VARIANT"] = variant
+    
+    with open(texts_path, "r") as f:
+        texts = json.load(f)
+    
+    import psutil
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    
+    start = time.perf_counter()
+    from ml.inference.intent_predictor import IntentPredictor
+    predictor = IntentPredictor()
+    load_seconds = time.perf_counter() - start
+    
+    if predictor.model is None:
+        raise SystemExit(f"No trained {name} model found; train and export it first")
+    
+    predictions = []
+    for i in range(0, len(texts), 32):
+        predictions.extend(predictor._model_predict_batch(texts[i:i + 32]))
+    
+    latencies = {}
+    for batch_size in BATCH_SIZES:
+        batch = (texts * batch_size)[:batch_size]
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            predictor._model_predict_batch(batch)
+            samples.append(time.perf_counter() - start)
+        latencies[batch_size] = statistics.median(samples) * 1000
+    
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_mb": (process.memory_info().rss - rss_before) / 1024 / 1024,
+        "latency_ms": latencies,
+        "predictions": [prediction["intent"].value for prediction in predictions],
+    }))
+
+
+def run(variants, rounds: int, seed: int):
+    texts, labels = validation_split(seed)
+    
+    results = {}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(texts, f)
+    try:
+        for name in variants:
+            path = model_path(*VARIANTS[name])
+            if not path.exists():
+                print(f"Skipping {name}: {path} not found")
+                continue
+            
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", name, "--texts", f.name, "--rounds", str(rounds)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+            results[name]["size_mb"] = path.stat().st_size / 1024 / 1024
+            results[name]["accuracy"] = sum(
+                predicted == label for predicted, label in zip(results[name]["predictions"], labels)
+            ) / len(labels)
+    finally:
+        os.unlink(f.name)
+    
+    if not results:
+        raise SystemExit("No trained models found; train and export them first")
+    
+    print(f"Validation split: {len(texts)} messages (seed {seed})")
+    reference = next(iter(results.values()))["accuracy"]
+    header = f"{'variant':<13}{'accuracy':>10}{'delta':>8}{'disk MB':>9}{'rss MB':>8}{'load s':>8}"
+    header += "".join(f"{f'batch {size} ms':>14}" for size in BATCH_SIZES)
+    print(header)
+    for name, result in results.items():
+        line = (
+            f"{name:<13}{result['accuracy']:>10.4f}{(result['accuracy'] - reference) * 100:>+7.2f}%"
+            f"{result['size_mb']:>9.2f}{result['rss_mb']:>8.0f}{result['load_seconds']:>8.2f}"
+        )
+        line += "".join(f"{result['latency_ms'][str(size)]:>14.2f}" for size in BATCH_SIZES)
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy, size, memory and latency of the float and int8 intent models")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generator's train/validation shuffle")
+    parser.add_argument("--child", choices=list(VARIANTS), help=argparse.SUPPRESS)
+    parser.add_argument("--texts", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        measure(args.child, args.texts, args.rounds)
+    else:
+        run(args.variants, args.rounds, args.seed)
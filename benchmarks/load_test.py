@@ -0,0 +1,275 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ml.training.data_generator import IntentDataGenerator
+
+
+ROOT = Path(__file__).resolve().parent.parent
+ENDPOINTS = ("chat", "tasks", "conversations")
+REPLAY_FIELDS = ("message", "title", "body")
+
+
+def generated_messages() -> List[str]:
+    samples = IntentDataGenerator().training_samples
+    return [message for messages in samples.values() for message in messages]
+
+
+def replay_messages(path: str) -> List[str]:
+    messages = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            record = json.loads(line)
+            for field in REPLAY_FIELDS:
+                if record.get(field):
+                    messages.append(str(record[field]))
+                    break
+    
+    if not messages:
+        raise ValueError(f"No messages found in {path} (looked for {', '.join(REPLAY_FIELDS)})")
+    return messages
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def build_workload(
+    messages: List[str],
+    total: int,
+    mix: Dict[str, int],
+    sessions: int,
+    seed: int,
+) -> List[Tuple[str, str, str, Optional[Dict[str, Any]]]]:
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    session_ids = [f"load-{i}" for i in range(sessions)]
+    
+    workload = []
+    for i in range(total):
+        endpoint = rng.choices(names, weights)[0]
+        session_id = rng.choice(session_ids)
+        
+        if endpoint == "chat":
+            workload.append((endpoint, "POST", "/api/v1/chat", {
+                "message": messages[i % len(messages)],
+                "session_id": session_id,
+            }))
+        elif endpoint == "tasks":
+            workload.append((endpoint, "POST", "/api/v1/tasks", {
+                "task_type": "file_operation",
+                "parameters": {"operation": "read", "file_path": str(ROOT / "README.md")},
+            }))
+        elif rng.random() < 0.5:
+            workload.append((endpoint, "GET", "/api/v1/conversations", None))
+        else:
+            workload.append((endpoint, "GET", f"/api/v1/conversations/{session_id}", None))
+    
+    return workload
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    index = math.ceil(q / 100 * len(samples)) - 1
+    return samples[max(0, min(len(samples) - 1, index))]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / duration if duration else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+@contextmanager
+def sandbox():
+    # Chat messages such as "create folder named project" or "run script.py" act on
+    # the working directory and ~/Desktop, so point both at a throwaway directory.
+    cwd = os.getcwd()
+    home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory(prefix="chatbot-load-") as directory:
+        os.chdir(directory)
+        os.environ["HOME"] = directory
+        try:
+            yield directory
+        finally:
+            os.chdir(cwd)
+            if home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = home
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        await asyncio.sleep(0.1)
+    print(f"App not ready after {timeout:.0f}s, measuring anyway")
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    workload: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+    concurrency: int,
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    latencies = {name: [] for name in ENDPOINTS}
+    errors = {name: 0 for name in ENDPOINTS}
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in workload:
+        queue.put_nowait(item)
+    
+    async def worker():
+        while not queue.empty():
+            endpoint, method, path, body = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 500
+            except Exception:
+                failed = True
+            latencies[endpoint].append(time.perf_counter() - start)
+            if failed:
+                errors[endpoint] += 1
+    
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started_at
+
+
+async def run(args) -> Dict[str, Any]:
+    from app.main import app
+    
+    messages = replay_messages(args.replay) if args.replay else generated_messages()
+    mix = parse_mix(args.mix)
+    workload = build_workload(messages, args.requests, mix, args.sessions, args.seed)
+    warmup = build_workload(messages, args.warmup, mix, args.sessions, args.seed + 1)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+            await wait_until_ready(client, args.ready_timeout)
+            
+            with sandbox():
+                await drive(client, warmup, args.concurrency)
+                latencies, errors, duration = await drive(client, workload, args.concurrency)
+    
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "workload": f"replay:{args.replay}" if args.replay else "generated",
+            "messages": len(messages),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "sessions": args.sessions,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "overall": summarize(all_latencies, sum(errors.values()), duration),
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], duration)
+            for name in ENDPOINTS if latencies[name]
+        },
+    }
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    rows = [("overall", results["overall"])] + list(results["endpoints"].items())
+    header = f"{'endpoint':<15}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if baseline:
+        header += f"{'p95 vs base':>14}"
+    print(header)
+    
+    for name, row in rows:
+        line = (
+            f"{name:<15}{row['requests']:>10}{row['errors']:>8}{row['throughput_rps']:>10.1f}"
+            f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+        )
+        if baseline:
+            base = baseline["overall"] if name == "overall" else baseline["endpoints"].get(name)
+            if base and base["p95_ms"]:
+                line += f"{(row['p95_ms'] / base['p95_ms'] - 1) * 100:>+13.1f}%"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-process load test for the chat, tasks and conversations APIs")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--mix", default="chat=8,tasks=1,conversations=1",
+                        help="Weighted endpoint mix, e.g. chat=8,tasks=1,conversations=1")
+    parser.add_argument("--replay", help="JSONL file to replay (uses the message, title or body field)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Earlier --output file to compare p95 latency against")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args))
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import cProfile
+import pstats
+import time
+from collections import Counter
+from typing import Callable, List
+
+from app.models.analyzed_message import AnalyzedMessage
+from app.models.schemas import Message, MessageRole
+from automation.handlers.adaptive_processor import AdaptiveProcessor
+from automation.handlers.command_handler import CommandHandler
+from automation.handlers.response_generator import ResponseGenerator
+from ml.inference.entity_extractor import EntityExtractorModel
+from ml.inference.fallback_rules import CompiledFallbackRules
+from tests.legacy_reference import synthetic_messages
+
+
+# Builtins that copy the message or part of it; each call is one new str or list.
+DERIVATIONS = {
+    "<method 'lower' of 'str' objects>": "lower",
+    "<method 'split' of 'str' objects>": "split",
+    "<method 'findall' of 're.Pattern' objects>": "findall",
+    "<method 'finditer' of 're.Pattern' objects>": "finditer",
+}
+
+
+def pipeline() -> Callable[[object], None]:
+    """The text-reading steps of one chat message, without the I/O.
+    
+    Every command handler helper runs, where a real message reaches only the
+    one its intent selects, so this is an upper bound on repeated work.
+    """
+    rules = CompiledFallbackRules()
+    extractor = EntityExtractorModel()
+    adaptive = AdaptiveProcessor()
+    handler = CommandHandler()
+    responses = ResponseGenerator()
+    history = [Message(role=MessageRole.USER, content="open the report")]
+    loop = asyncio.new_event_loop()
+    
+    def run(message):
+        rules.predict(message)
+        entities = extractor._extract(message)
+        adaptive.enhance_understanding(message, entities, history)
+        handler._extract_filename_from_message(message)
+        handler._extract_search_term(message)
+        handler._extract_excel_file_from_message(message)
+        loop.run_until_complete(responses.generate_chat_response(message, history))
+    
+    return run
+
+
+def derivations(run: Callable[[object], None], messages: List[object]) -> Counter:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for message in messages:
+        run(message)
+    profiler.disable()
+    
+    counts = Counter()
+    for (_, _, name), (_, ncalls, _, _, _) in pstats.Stats(profiler).stats.items():
+        if name in DERIVATIONS:
+            counts[DERIVATIONS[name]] += ncalls
+    return counts
+
+
+def run(count: int, rounds: int):
+    texts = synthetic_messages(count)
+    stages = pipeline()
+    
+    def per_stage():
+        # Each stage wraps the raw string itself, as when no analysis is shared.
+        for text in texts:
+            stages(text)
+    
+    def shared():
+        for text in texts:
+            stages(AnalyzedMessage(text))
+    
+    before = derivations(stages, texts)
+    after = derivations(lambda text: stages(AnalyzedMessage(text)), texts)
+    
+    print(f"{count} synthetic messages")
+    print(f"{'derivation':<12}{'per stage':>11}{'shared':>9}   (calls per message)")
+    for name in DERIVATIONS.values():
+        print(f"{name:<12}{before[name] / count:>11.2f}{after[name] / count:>9.2f}")
+    saved = sum(before.values()) - sum(after.values())
+    print(f"Allocations saved: {saved / count:.2f} per message")
+    
+    for label, fn in (("per stage", per_stage), ("shared", shared)):
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<12}{best / count * 1e6:>8.1f} us/message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lowercasing, splitting and quote scans per message, with and without a shared AnalyzedMessage")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    
+    run(args.messages, args.rounds)
@@ -1,77 +1,570 @@
-from typing import Dict, List, Optional
-from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+from itertools import chain, islice
 from datetime import datetime
+from pathlib import Path
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
 
-from app.models.schemas import Message, Conversation
+from app.models.schemas import Message, Conversation, ConversationSummary
+from memory.conversation.session_context import SessionContext
 from app.core.config import get_settings
+from app.core.metrics import get_metrics
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
 settings = get_settings()
+metrics = get_metrics()
+
+sessions_evicted_total = metrics.counter(
+    "conversation_sessions_evicted_total", "Sessions spilled to disk", ["reason"]
+)
+sessions_reloaded_total = metrics.counter(
+    "conversation_sessions_reloaded_total", "Spilled sessions brought back into memory"
+)
+spill_failures_total = metrics.counter(
+    "conversation_spill_failures_total", "Session spills that could not be written"
+)
+spill_read_failures_total = metrics.counter(
+    "conversation_spill_read_failures_total", "Spilled sessions that could not be read back"
+)
+spills_deleted_total = metrics.counter(
+    "conversation_spills_deleted_total", "Spilled sessions deleted to stay under the spill limit"
+)
+sessions_resident_bytes = metrics.gauge(
+    "conversation_sessions_resident_bytes", "Estimated size of the sessions held in memory"
+)
+
+# Estimated resident cost of a session (deque, metadata, context) and of a
+# message besides its text, measured with tracemalloc on CPython.
+SESSION_BYTES = 1536
+MESSAGE_BYTES = 512
+
+SPILL_SUFFIX = ".json.gz"
+
+
+def _message_bytes(message: Message) -> int:
+    return MESSAGE_BYTES + len(message.content)
 
 
 class ConversationManager:
-    def __init__(self):
-        self.conversations: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=settings.MAX_CONVERSATION_HISTORY)
+    """Conversation histories with idle and memory-budget eviction.
+    
+    Resident sessions are kept least recently updated first. ``evict``
+    spills the oldest ones to ``spill_dir`` as gzipped JSON while they have
+    been idle for ``idle_ttl`` seconds or the estimated size of all sessions
+    exceeds ``memory_budget`` bytes (0 disables either check). Once
+    ``start`` has been awaited it runs in a background task, every
+    ``eviction_interval`` seconds and as soon as a message takes the
+    sessions over budget; files are written off the event loop.
+    
+    A spilled session keeps a small metadata entry and its last message, so
+    it still appears in the recent listings; beyond ``max_spilled`` of them the oldest files are
+    deleted. Spill files are only read off the event loop: ``restore`` makes
+    a session resident again before it is used, and the async
+    ``get_conversation`` reads a copy. ``start`` indexes the files left by
+    an earlier run.
+    """
+    
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        spill_dir: Optional[Path] = None,
+        eviction_interval: Optional[float] = None,
+        max_spilled: Optional[int] = None,
+        clock=time.monotonic,
+    ):
+        self.memory_budget = settings.CONVERSATION_MEMORY_BUDGET_BYTES if memory_budget is None else memory_budget
+        self.idle_ttl = settings.CONVERSATION_IDLE_TTL if idle_ttl is None else idle_ttl
+        self.spill_dir = Path(spill_dir or settings.CONVERSATION_SPILL_DIR)
+        self.eviction_interval = (
+            eviction_interval if eviction_interval is not None
+            else settings.CONVERSATION_EVICTION_INTERVAL
+        )
+        self.max_spilled = settings.CONVERSATION_MAX_SPILLED_SESSIONS if max_spilled is None else max_spilled
+        self.clock = clock
+        
+        self.conversations: Dict[str, deque] = {}
+        # Kept in recency order, least recently updated first: add_message
+        # moves its session to the end, so the newest k are the last k and
+        # eviction candidates are the first.
+        self.metadata: "OrderedDict[str, dict]" = OrderedDict()
+        self.contexts: Dict[str, SessionContext] = {}
+        # Spilled sessions, in the order they were spilled. Sessions are
+        # spilled oldest first, so apart from the unspillable ones left
+        # behind, every entry here is older than the resident ones and the
+        # two chain into one recency order.
+        self.spilled: "OrderedDict[str, dict]" = OrderedDict()
+        # Sessions whose spill failed for a reason other than the disk; they
+        # stay resident until their next message.
+        self.unspillable: Set[str] = set()
+        
+        self.session_bytes: Dict[str, int] = {}
+        self.memory_bytes = 0
+        self.evictions = {"idle": 0, "budget": 0}
+        self.reloads = 0
+        self.spill_failures = 0
+        self.read_failures = 0
+        self.spills_deleted = 0
+        
+        self._wake: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._evicting = False
+    
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+    
+    @property
+    def over_budget(self) -> bool:
+        return 0 < self.memory_budget < self.memory_bytes
+    
+    async def start(self):
+        if self.running:
+            return
+        
+        await self.reindex()
+        self._wake = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Conversation eviction started (memory_budget={self.memory_budget}, "
+            f"idle_ttl={self.idle_ttl}s, spill_dir={self.spill_dir}, "
+            f"spilled_sessions={len(self.spilled)})"
         )
-        self.metadata: Dict[str, dict] = {}
     
-    def add_message(self, session_id: str, message: Message):
-        self.conversations[session_id].append(message)
+    async def close(self):
+        if not self.running:
+            return
+        
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+    
+    async def reindex(self):
+        """Index the spill files an earlier run left in ``spill_dir``."""
+        entries = await asyncio.to_thread(self._scan_spill_dir)
+        # A file for a session that is resident again is out of date.
+        stale = [session_id for session_id in entries if session_id in self.metadata]
+        await asyncio.to_thread(self._unlink_spills, stale)
+        
+        for session_id in stale:
+            del entries[session_id]
+        entries.update(self.spilled)
+        self.spilled = OrderedDict(sorted(entries.items(), key=lambda item: item[1]["updated_at"]))
+        await self._trim_spilled()
+    
+    async def restore(self, session_id: str):
+        """Make a spilled session resident again, reading it off the event loop."""
+        if session_id not in self.spilled:
+            return
         
+        record = await self._load_spill(session_id)
+        # Restored or removed by another caller while the file was read.
+        if record is not None and session_id in self.spilled:
+            self._make_resident(session_id, record)
+    
+    def add_message(self, session_id: str, message: Message):
         if session_id not in self.metadata:
-            self.metadata[session_id] = {
-                "created_at": datetime.utcnow(),
-                "message_count": 0,
-            }
+            record = None
+            if session_id in self.spilled:
+                # Callers on the event loop await restore() first, so this
+                # read only happens for the ones that do not.
+                logger.warning(f"Reading spilled session {session_id} on the caller's thread")
+                record = self._read_spill_or_forget(session_id)
+            self._make_resident(session_id, record)
+        
+        messages = self.conversations[session_id]
+        size = _message_bytes(message)
+        if len(messages) == messages.maxlen:
+            size -= _message_bytes(messages[0])
+        messages.append(message)
+        self._resize(session_id, size)
         
-        self.metadata[session_id]["updated_at"] = datetime.utcnow()
-        self.metadata[session_id]["message_count"] += 1
+        meta = self.metadata[session_id]
+        meta["updated_at"] = datetime.utcnow()
+        meta["message_count"] += 1
+        meta["touched_at"] = self.clock()
+        self.metadata.move_to_end(session_id)
+        self.unspillable.discard(session_id)
         
         logger.debug(f"Added message to session {session_id}")
+        if self.over_budget and self._wake is not None:
+            self._wake.set()
     
     def get_recent_messages(
         self, session_id: str, limit: int = 10
     ) -> List[Message]:
+        """Recent messages of a resident session; restore a spilled one first."""
         if session_id not in self.conversations:
             return []
         
         messages = list(self.conversations[session_id])
         return messages[-limit:] if len(messages) > limit else messages
     
-    def get_conversation(self, session_id: str) -> Optional[Conversation]:
-        if session_id not in self.conversations:
-            return None
+    def get_context(self, session_id: str) -> SessionContext:
+        if session_id not in self.metadata:
+            # Only resident sessions keep a record, so every stored one is
+            # evicted and spilled with its session.
+            return SessionContext()
         
-        messages = list(self.conversations[session_id])
-        meta = self.metadata.get(session_id, {})
+        context = self.contexts.get(session_id)
+        if context is None:
+            context = self.contexts[session_id] = SessionContext()
+        return context
+    
+    async def get_conversation(self, session_id: str) -> Optional[Conversation]:
+        if session_id in self.conversations:
+            messages = list(self.conversations[session_id])
+            meta = self.metadata[session_id]
+        elif session_id in self.spilled:
+            # A copy from disk; the session is not made resident.
+            meta = await self._load_spill(session_id)
+            if meta is None:
+                return None
+            messages = meta["messages"]
+        else:
+            return None
         
         return Conversation(
             session_id=session_id,
             messages=messages,
-            created_at=meta.get("created_at", datetime.utcnow()),
-            updated_at=meta.get("updated_at", datetime.utcnow()),
+            created_at=meta["created_at"],
+            updated_at=meta.get("updated_at", meta["created_at"]),
         )
     
-    def get_recent_conversations(self, limit: int = 10) -> List[Conversation]:
-        sorted_sessions = sorted(
-            self.metadata.items(),
-            key=lambda x: x[1].get("updated_at", datetime.min),
-            reverse=True,
-        )
-        
+    def recent_session_ids(self, limit: int = 10) -> List[str]:
+        return list(islice(chain(reversed(self.metadata), reversed(self.spilled)), max(limit, 0)))
+    
+    async def get_recent_conversations(self, limit: int = 10) -> List[Conversation]:
         conversations = []
-        for session_id, _ in sorted_sessions[:limit]:
-            conv = self.get_conversation(session_id)
+        for session_id in self.recent_session_ids(limit):
+            conv = await self.get_conversation(session_id)
             if conv:
                 conversations.append(conv)
         
         return conversations
     
+    def get_recent_summaries(self, limit: int = 10) -> List[ConversationSummary]:
+        """Like ``get_recent_conversations`` without copying any message list."""
+        summaries = []
+        for session_id in self.recent_session_ids(limit):
+            meta = self.metadata.get(session_id)
+            if meta is not None:
+                messages = self.conversations[session_id]
+                last_message = messages[-1] if messages else None
+            else:
+                meta = self.spilled[session_id]
+                last_message = meta["last_message"]
+            
+            summaries.append(ConversationSummary(
+                session_id=session_id,
+                message_count=meta["message_count"],
+                last_message=last_message,
+                created_at=meta["created_at"],
+                updated_at=meta.get("updated_at", meta["created_at"]),
+            ))
+        
+        return summaries
+    
     def clear_conversation(self, session_id: str):
+        entry = self.spilled.pop(session_id, None)
+        if entry is not None:
+            # Its history is being dropped, so there is nothing to read back.
+            self._unlink_spill(session_id)
+            self._make_resident(session_id, {
+                "created_at": entry["created_at"],
+                "updated_at": entry["updated_at"],
+                "message_count": entry["message_count"],
+                "messages": [],
+                "context": None,
+            })
+        
         if session_id in self.conversations:
-            self.conversations[session_id].clear()
+            messages = self.conversations[session_id]
+            self._resize(session_id, -sum(_message_bytes(message) for message in messages))
+            messages.clear()
+            
+            meta = self.metadata[session_id]
+            meta["updated_at"] = datetime.utcnow()
+            meta["touched_at"] = self.clock()
+            self.metadata.move_to_end(session_id)
             logger.info(f"Cleared conversation {session_id}")
-
+        
+        # Nothing left in the history for the context to refer back to.
+        self.contexts.pop(session_id, None)
+    
+    def remove_session(self, session_id: str):
+        self.conversations.pop(session_id, None)
+        self.metadata.pop(session_id, None)
+        self.contexts.pop(session_id, None)
+        self.unspillable.discard(session_id)
+        self.memory_bytes -= self.session_bytes.pop(session_id, 0)
+        sessions_resident_bytes.set(self.memory_bytes)
+        
+        if self.spilled.pop(session_id, None) is not None:
+            self._unlink_spill(session_id)
+        
+        logger.info(f"Removed session {session_id}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "resident_sessions": len(self.metadata),
+            "spilled_sessions": len(self.spilled),
+            "max_spilled_sessions": self.max_spilled,
+            "resident_bytes": self.memory_bytes,
+            "memory_budget": self.memory_budget,
+            "evictions": dict(self.evictions),
+            "reloads": self.reloads,
+            "spill_failures": self.spill_failures,
+            "unspillable_sessions": len(self.unspillable),
+            "read_failures": self.read_failures,
+            "spills_deleted": self.spills_deleted,
+        }
+    
+    async def evict(self):
+        """Spill idle sessions, then the oldest ones while over budget."""
+        if self._evicting:
+            return
+        
+        self._evicting = True
+        try:
+            while True:
+                candidate = self._eviction_candidate()
+                if candidate is None:
+                    break
+                
+                session_id, reason = candidate
+                meta = self.metadata[session_id]
+                version = (meta["message_count"], meta["updated_at"])
+                
+                try:
+                    record = self._spill_record(session_id)
+                    await asyncio.to_thread(self._write_spill, session_id, record)
+                except OSError as e:
+                    # The disk is at fault, not the session: it stays
+                    # resident and the next round tries again.
+                    self.spill_failures += 1
+                    spill_failures_total.inc()
+                    logger.error(f"Could not spill session {session_id}: {e}")
+                    break
+                except Exception as e:
+                    # Something in the session cannot be written; skip it
+                    # so that the sessions behind it can still be spilled.
+                    self.spill_failures += 1
+                    spill_failures_total.inc()
+                    self.unspillable.add(session_id)
+                    logger.error(f"Could not spill session {session_id}, keeping it resident: {e}", exc_info=True)
+                    continue
+                
+                meta = self.metadata.get(session_id)
+                if meta is None or (meta["message_count"], meta["updated_at"]) != version:
+                    # Changed or removed while the file was written, so the file is stale.
+                    await asyncio.to_thread(self._unlink_spill, session_id)
+                    continue
+                
+                self._drop_resident(session_id, reason)
+            
+            await self._trim_spilled()
+        finally:
+            self._evicting = False
+    
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.eviction_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            try:
+                await self.evict()
+            except Exception as e:
+                logger.error(f"Conversation eviction failed: {e}", exc_info=True)
+    
+    def _eviction_candidate(self) -> Optional[Tuple[str, str]]:
+        if not self.metadata:
+            return None
+        
+        newest = next(reversed(self.metadata))
+        for session_id, meta in self.metadata.items():
+            if session_id in self.unspillable:
+                continue
+            
+            if self.idle_ttl > 0 and self.clock() - meta["touched_at"] >= self.idle_ttl:
+                return session_id, "idle"
+            # The newest session stays, even when it alone is over budget.
+            if self.over_budget and session_id != newest:
+                return session_id, "budget"
+            return None
+        
+        return None
+    
+    async def _trim_spilled(self):
+        if self.max_spilled <= 0 or len(self.spilled) <= self.max_spilled:
+            return
+        
+        expired = []
+        while len(self.spilled) > self.max_spilled:
+            session_id, _ = self.spilled.popitem(last=False)
+            expired.append(session_id)
+        
+        await asyncio.to_thread(self._unlink_spills, expired)
+        self.spills_deleted += len(expired)
+        spills_deleted_total.inc(len(expired))
+        logger.info(f"Deleted {len(expired)} spilled session(s) over the limit of {self.max_spilled}")
+    
+    def _resize(self, session_id: str, delta: int):
+        self.session_bytes[session_id] += delta
+        self.memory_bytes += delta
+        sessions_resident_bytes.set(self.memory_bytes)
+    
+    def _spill_path(self, session_id: str) -> Path:
+        digest = hashlib.blake2b(session_id.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+        return self.spill_dir / f"{digest}{SPILL_SUFFIX}"
+    
+    def _spill_record(self, session_id: str) -> Dict[str, Any]:
+        meta = self.metadata[session_id]
+        context = self.contexts.get(session_id)
+        return {
+            "session_id": session_id,
+            "created_at": meta["created_at"].isoformat(),
+            "updated_at": meta["updated_at"].isoformat(),
+            "message_count": meta["message_count"],
+            "messages": [message.model_dump(mode="json") for message in self.conversations[session_id]],
+            "context": context.to_dict() if context is not None else None,
+        }
+    
+    def _write_spill(self, session_id: str, record: Dict[str, Any]):
+        path = self._spill_path(session_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = gzip.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+        
+        # Written beside the target and renamed, so a crash never leaves half a session.
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    
+    def _unlink_spill(self, session_id: str):
+        try:
+            self._spill_path(session_id).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not delete the spill file of session {session_id}: {e}")
+    
+    def _unlink_spills(self, session_ids: List[str]):
+        for session_id in session_ids:
+            self._unlink_spill(session_id)
+    
+    def _scan_spill_dir(self) -> Dict[str, dict]:
+        entries = {}
+        if not self.spill_dir.is_dir():
+            return entries
+        
+        for path in self.spill_dir.iterdir():
+            if path.name.endswith(".tmp"):
+                # Left by a write that never finished.
+                path.unlink(missing_ok=True)
+                continue
+            if not path.name.endswith(SPILL_SUFFIX):
+                continue
+            
+            try:
+                record = self._parse_spill(path.read_bytes())
+            except Exception as e:
+                logger.error(f"Deleting unreadable spill file {path}: {e}")
+                path.unlink(missing_ok=True)
+                continue
+            
+            entries[record["session_id"]] = self._spill_entry(record, record["messages"])
+        
+        return entries
+    
+    def _spill_entry(self, meta: Dict[str, Any], messages) -> Dict[str, Any]:
+        # The last message is kept so that summaries look the same whether
+        # or not the session is resident.
+        return {
+            "created_at": meta["created_at"],
+            "updated_at": meta["updated_at"],
+            "message_count": meta["message_count"],
+            "last_message": messages[-1] if messages else None,
+        }
+    
+    def _drop_resident(self, session_id: str, reason: str):
+        meta = self.metadata.pop(session_id)
+        messages = self.conversations.pop(session_id)
+        self.contexts.pop(session_id, None)
+        self.memory_bytes -= self.session_bytes.pop(session_id)
+        sessions_resident_bytes.set(self.memory_bytes)
+        
+        self.spilled[session_id] = self._spill_entry(meta, messages)
+        self.evictions[reason] += 1
+        sessions_evicted_total.inc(reason=reason)
+        logger.debug(f"Spilled session {session_id} ({reason})")
+    
+    def _parse_spill(self, payload: bytes) -> Dict[str, Any]:
+        record = json.loads(gzip.decompress(payload))
+        record["created_at"] = datetime.fromisoformat(record["created_at"])
+        record["updated_at"] = datetime.fromisoformat(record["updated_at"])
+        record["messages"] = [Message.model_validate(message) for message in record["messages"]]
+        return record
+    
+    def _read_spill(self, session_id: str) -> Dict[str, Any]:
+        return self._parse_spill(self._spill_path(session_id).read_bytes())
+    
+    def _forget_spill(self, session_id: str, error: Exception):
+        # A missing or corrupt file loses that session's history, not the request.
+        logger.error(f"Could not read spilled session {session_id}, dropping it: {error}")
+        self.spilled.pop(session_id, None)
+        self.read_failures += 1
+        spill_read_failures_total.inc()
+    
+    async def _load_spill(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.to_thread(self._read_spill, session_id)
+        except Exception as e:
+            if session_id in self.spilled:
+                self._forget_spill(session_id, e)
+                await asyncio.to_thread(self._unlink_spill, session_id)
+            return None
+    
+    def _read_spill_or_forget(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._read_spill(session_id)
+        except Exception as e:
+            self._forget_spill(session_id, e)
+            self._unlink_spill(session_id)
+            return None
+    
+    def _make_resident(self, session_id: str, record: Optional[Dict[str, Any]] = None):
+        messages = deque(maxlen=settings.MAX_CONVERSATION_HISTORY)
+        meta = {"created_at": datetime.utcnow(), "updated_at": datetime.utcnow(), "message_count": 0}
+        
+        if record is not None:
+            messages.extend(record["messages"])
+            meta = {
+                "created_at": record["created_at"],
+                "updated_at": record["updated_at"],
+                "message_count": record["message_count"],
+            }
+            if record["context"] is not None:
+                self.contexts[session_id] = SessionContext.from_dict(record["context"])
+            
+            if self.spilled.pop(session_id, None) is not None:
+                self._unlink_spill(session_id)
+                self.reloads += 1
+                sessions_reloaded_total.inc()
+        
+        meta["touched_at"] = self.clock()
+        self.conversations[session_id] = messages
+        self.metadata[session_id] = meta
+        self.session_bytes[session_id] = 0
+        self._resize(session_id, SESSION_BYTES + sum(_message_bytes(message) for message in messages))
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Iterable, Optional, Union
+
+from app.models.analyzed_message import AnalyzedMessage
+from app.models.schemas import Message
+
+
+LOCATION_HINTS = {
+    "desktop": "Desktop",
+    "downloads": "Downloads",
+    "documents": "Documents",
+    "pictures": "Pictures",
+    "home": "~",
+}
+EXCEL_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+FILE_WORDS = ("file", "folder", "document")
+# A filename is inferred from the current or the previous user message, the
+# user turns that fit in the last three messages of a conversation.
+FILENAME_TURNS = 2
+
+
+def location_hint(message: Union[str, AnalyzedMessage]) -> Optional[str]:
+    message_lower = AnalyzedMessage.of(message).lower
+    for hint, path in LOCATION_HINTS.items():
+        if hint in message_lower:
+            return path
+    return None
+
+
+def excel_path(message: Union[str, AnalyzedMessage]) -> Optional[str]:
+    message = AnalyzedMessage.of(message)
+    
+    for quote in message.quoted:
+        if quote.lower().endswith(EXCEL_EXTENSIONS):
+            return quote
+    
+    for word, word_lower in zip(message.tokens, message.lower_tokens):
+        if word_lower.strip('.,!?"\'').endswith(EXCEL_EXTENSIONS):
+            return word.strip('.,!?"\'')
+    
+    return None
+
+
+def mentioned_filename(message: Union[str, AnalyzedMessage]) -> Optional[str]:
+    """First capitalized word of a message that talks about a file, folder or document."""
+    message = AnalyzedMessage.of(message)
+    if not any(word in message.lower for word in FILE_WORDS):
+        return None
+    
+    for word in message.tokens:
+        if len(word) > 2 and word[0].isupper():
+            return word
+    return None
+
+
+class SessionContext:
+    """What a session last referred to, updated as each user message arrives.
+    
+    ``ChatService`` feeds every user message to ``observe``;
+    ``AdaptiveProcessor`` then reads ``recent_file`` instead of rescanning
+    the conversation history. ``ConversationManager`` owns one per session and
+    drops it with the session.
+    """
+    
+    def __init__(self):
+        self.turn = 0
+        self.last_file: Optional[str] = None
+        self.last_file_turn = 0
+    
+    @classmethod
+    def from_history(cls, history: Iterable[Message]) -> "SessionContext":
+        """Rebuild the record from messages, for callers without session state."""
+        context = cls()
+        for message in history:
+            if message.role.value == "user":
+                context.observe(message.content)
+        return context
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionContext":
+        context = cls()
+        # Files spilled by older versions may carry fields no longer kept.
+        vars(context).update((key, value) for key, value in data.items() if key in vars(context))
+        return context
+    
+    def observe(self, message: Union[str, AnalyzedMessage]):
+        self.turn += 1
+        
+        filename = mentioned_filename(message)
+        if filename:
+            self.last_file = filename
+            self.last_file_turn = self.turn
+    
+    @property
+    def recent_file(self) -> Optional[str]:
+        if self.last_file and self.turn - self.last_file_turn < FILENAME_TURNS:
+            return self.last_file
+        return None
@@ -0,0 +1,181 @@
+import hashlib
+import heapq
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+DEPTH = 4
+# Share of the memory budget for the heavy-hitter table, and what one entry
+# (key string, dict slot, two-int list) costs on CPython.
+TOP_K_SHARE = 0.25
+ENTRY_BYTES = 256
+
+
+class PatternSketch:
+    """Fixed-memory interaction counts and success rates per pattern key.
+    
+    Two count-min sketches (``DEPTH`` rows of 32-bit counters) hold the
+    number of interactions and of successes for every key ever seen; they
+    never grow and never underestimate. The most frequent keys also get an
+    exact entry in a small heavy-hitters table, sized from the same budget,
+    which a key enters once its sketched count beats the table's smallest.
+    Keys are hashed with BLAKE2b rather than ``hash()`` so a snapshot means
+    the same thing after a restart.
+    """
+    
+    def __init__(self, memory_bytes: int = 256 * 1024, depth: int = DEPTH):
+        self.memory_bytes = memory_bytes
+        self.depth = depth
+        self.top_k = max(1, int(memory_bytes * TOP_K_SHARE) // ENTRY_BYTES)
+        sketch_bytes = memory_bytes - self.top_k * ENTRY_BYTES
+        self.width = max(16, sketch_bytes // (2 * depth * 4))
+        
+        self.counts = np.zeros((depth, self.width), dtype=np.uint32)
+        self.successes = np.zeros((depth, self.width), dtype=np.uint32)
+        self.total = 0
+        
+        # Flat views of the tables: indexing them with Python ints is far
+        # cheaper than numpy fancy indexing for four cells at a time.
+        self._count_cells = memoryview(self.counts).cast("B").cast("I")
+        self._success_cells = memoryview(self.successes).cast("B").cast("I")
+        
+        self.top: Dict[str, List[int]] = {}
+        # Min-heap of (count, key) over the table; entries go stale as counts
+        # grow and are refreshed when they reach the top.
+        self._heap: List[Tuple[int, str]] = []
+    
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.successes.nbytes + self.top_k * ENTRY_BYTES
+    
+    def _cells(self, key: str) -> List[int]:
+        # Double hashing: one 128-bit digest yields a column for every row.
+        digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (first + row * second) % width for row in range(self.depth)]
+    
+    def record(self, key: str, success: bool):
+        self.total += 1
+        entry = self.top.get(key)
+        cells = self._cells(key)
+        count = self._update(self._count_cells, cells)
+        if success:
+            successes = self._update(self._success_cells, cells)
+        else:
+            successes = min(self._success_cells[cell] for cell in cells)
+        
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += bool(success)
+        elif len(self.top) < self.top_k:
+            self._insert(key, count, min(successes, count))
+        elif count > self._heap[0][0]:
+            self._admit(key, count, min(successes, count))
+    
+    def estimate(self, key: str) -> Tuple[int, float]:
+        """(interactions, success rate) for ``key``; sketched values are upper bounds."""
+        entry = self.top.get(key)
+        if entry is not None:
+            count, successes = entry
+        else:
+            cells = self._cells(key)
+            count = min(self._count_cells[cell] for cell in cells)
+            successes = min(min(self._success_cells[cell] for cell in cells), count)
+        return count, successes / count if count else 0.0
+    
+    def success_rate(self, key: str) -> float:
+        return self.estimate(key)[1]
+    
+    def heavy_hitters(self, limit: Optional[int] = None) -> List[Tuple[str, int, float]]:
+        """(key, interactions, success rate) of the most frequent keys."""
+        ranked = sorted(self.top.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [(key, count, successes / count) for key, (count, successes) in ranked]
+    
+    def stats(self) -> Dict[str, object]:
+        return {
+            "interactions": self.total,
+            "tracked_keys": len(self.top),
+            "top_k": self.top_k,
+            "width": self.width,
+            "depth": self.depth,
+            "bytes": self.nbytes,
+        }
+    
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        keys = list(self.top)
+        
+        # Written beside the target and renamed, so a crash never leaves half a snapshot.
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                memory_bytes=np.int64(self.memory_bytes),
+                total=np.int64(self.total),
+                counts=self.counts,
+                successes=self.successes,
+                top_keys=np.asarray(keys, dtype=str),
+                top_values=np.asarray([self.top[key] for key in keys], dtype=np.int64).reshape(-1, 2),
+            )
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], memory_bytes: int, depth: int = DEPTH) -> "PatternSketch":
+        """The snapshot at ``path``, or an empty sketch if it was taken with another budget."""
+        sketch = cls(memory_bytes, depth)
+        with np.load(path, allow_pickle=False) as snapshot:
+            if snapshot["counts"].shape != sketch.counts.shape:
+                logger.warning(
+                    f"Pattern snapshot {path} has shape {snapshot['counts'].shape}, "
+                    f"expected {sketch.counts.shape}; starting empty"
+                )
+                return sketch
+            
+            sketch.counts[:] = snapshot["counts"]
+            sketch.successes[:] = snapshot["successes"]
+            sketch.total = int(snapshot["total"])
+            for key, (count, successes) in zip(snapshot["top_keys"].tolist(), snapshot["top_values"].tolist()):
+                sketch._insert(key, count, successes)
+        
+        return sketch
+    
+    @staticmethod
+    def _update(table: memoryview, cells: List[int]) -> int:
+        # Conservative update: raise only the counters below the new
+        # estimate, which keeps it an upper bound with less overcounting.
+        estimate = min(table[cell] for cell in cells) + 1
+        for cell in cells:
+            if table[cell] < estimate:
+                table[cell] = estimate
+        return estimate
+    
+    def _insert(self, key: str, count: int, successes: int):
+        self.top[key] = [count, successes]
+        heapq.heappush(self._heap, (count, key))
+    
+    def _admit(self, key: str, count: int, successes: int):
+        # Heap counts only ever lag behind the table, so refresh stale
+        # entries until the top is the true smallest.
+        while True:
+            smallest_count, smallest = self._heap[0]
+            current = self.top[smallest][0]
+            if current == smallest_count:
+                break
+            heapq.heapreplace(self._heap, (current, smallest))
+        
+        if count <= smallest_count:
+            return
+        
+        heapq.heappop(self._heap)
+        del self.top[smallest]
+        self._insert(key, count, successes)
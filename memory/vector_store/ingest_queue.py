@@ -0,0 +1,168 @@
+import asyncio
+from typing import Dict, Any, List, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+metrics = get_metrics()
+
+ingest_queue_depth = metrics.gauge(
+    "vector_ingest_queue_depth", "Interactions waiting to be written to the vector store"
+)
+ingest_written_total = metrics.counter(
+    "vector_ingest_written_total", "Interactions written to the vector store"
+)
+ingest_failed_total = metrics.counter(
+    "vector_ingest_failed_total", "Interactions the vector store failed to write"
+)
+ingest_backpressure_total = metrics.counter(
+    "vector_ingest_backpressure_total", "Submissions that waited on a full ingest queue"
+)
+
+_STOP = object()
+
+
+class InteractionIngestQueue:
+    """Write-behind buffer between the chat path and the vector store.
+    
+    Interactions are collected in a bounded queue and written with one
+    ``VectorStore.add_interactions`` call per batch. A batch is flushed when
+    it reaches ``batch_size`` or when ``flush_interval`` seconds have passed
+    since its first item. ``submit`` waits while the queue is full. A batch
+    the store raises on is counted in ``failed`` and dropped.
+    """
+    
+    def __init__(
+        self,
+        vector_store,
+        max_size: int = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+    ):
+        self.vector_store = vector_store
+        self.max_size = max_size or settings.VECTOR_INGEST_QUEUE_SIZE
+        self.batch_size = batch_size or settings.VECTOR_INGEST_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else settings.VECTOR_INGEST_FLUSH_INTERVAL
+        )
+        
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.backpressure_waits = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+    
+    async def start(self):
+        if self.running:
+            return
+        
+        self.queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Interaction ingest queue started "
+            f"(max_size={self.max_size}, batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s)"
+        )
+    
+    async def submit(self, interaction: Dict[str, Any]):
+        if not self.running:
+            await self._write([interaction])
+            return
+        
+        if self.queue.full():
+            self.backpressure_waits += 1
+            ingest_backpressure_total.inc()
+        
+        await self.queue.put(interaction)
+        self.submitted += 1
+        ingest_queue_depth.set(self.queue.qsize())
+    
+    async def submit_many(self, interactions: List[Dict[str, Any]]):
+        if not self.running:
+            await self._write(interactions)
+            return
+        
+        for interaction in interactions:
+            await self.submit(interaction)
+    
+    async def close(self):
+        if not self.running:
+            return
+        
+        await self.queue.put(_STOP)
+        await self._worker
+        self._worker = None
+        
+        logger.info(
+            f"Interaction ingest queue flushed and stopped "
+            f"({self.written} interactions in {self.batches} batches, {self.failed} failed)"
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_size": self.max_size,
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "backpressure_waits": self.backpressure_waits,
+        }
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            item = await self.queue.get()
+            if item is _STOP:
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            await self._write(batch)
+            
+            if stop:
+                return
+    
+    async def _write(self, batch: List[Dict[str, Any]]):
+        try:
+            await self.vector_store.add_interactions(batch)
+            self.written += len(batch)
+            self.batches += 1
+            ingest_written_total.inc(len(batch))
+        except Exception as e:
+            self.failed += len(batch)
+            ingest_failed_total.inc(len(batch))
+            logger.error(f"Error writing batch of {len(batch)} interaction(s): {e}")
+        finally:
+            if self.queue is not None:
+                ingest_queue_depth.set(self.queue.qsize())
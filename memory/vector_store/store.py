@@ -1,13 +1,17 @@
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any
 from pathlib import Path
 
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.profiling import lazy_import
+from ml.inference.executor import get_inference_executor
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 class VectorStore:
@@ -15,14 +19,22 @@ class VectorStore:
         self.client = None
         self.collection = None
         self.embedding_model = None
+        self.executor = get_inference_executor()
+        self.embedding_cache = TTLCache(
+            "embeddings", settings.EMBEDDING_CACHE_SIZE, settings.EMBEDDING_CACHE_TTL
+        )
     
     async def initialize(self):
         try:
             persist_dir = Path("data/chromadb")
             persist_dir.mkdir(parents=True, exist_ok=True)
             
+            chromadb = lazy_import("chromadb")
+            chromadb_config = lazy_import("chromadb.config")
+            sentence_transformers = lazy_import("sentence_transformers")
+            
             self.client = chromadb.Client(
-                Settings(
+                chromadb_config.Settings(
                     persist_directory=str(persist_dir),
                     anonymized_telemetry=False,
                 )
@@ -33,8 +45,8 @@ class VectorStore:
                 metadata={"description": "Chat interactions for learning"},
             )
             
-            self.embedding_model = SentenceTransformer(
-                'sentence-transformers/all-MiniLM-L6-v2'
+            self.embedding_model = sentence_transformers.SentenceTransformer(
+                settings.EMBEDDING_MODEL
             )
             
             logger.info("Vector store initialized successfully")
@@ -50,38 +62,60 @@ class VectorStore:
         intent: str,
     ):
         try:
-            interaction_text = f"User: {user_message}\nAssistant: {assistant_response}"
-            embedding = self.embedding_model.encode(interaction_text).tolist()
-            
-            interaction_id = f"{session_id}_{hash(interaction_text)}"
-            
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[interaction_text],
-                metadatas=[{
-                    "session_id": session_id,
-                    "user_message": user_message,
-                    "assistant_response": assistant_response,
-                    "intent": intent,
-                }],
-                ids=[interaction_id],
+            await self.add_interactions([{
+                "session_id": session_id,
+                "user_message": user_message,
+                "assistant_response": assistant_response,
+                "intent": intent,
+            }])
+        except Exception as e:
+            logger.error(f"Error adding interaction to vector store: {e}")
+    
+    async def add_interactions(self, interactions: List[Dict[str, Any]]):
+        """Store ``interactions`` in one write; raises if they were not stored."""
+        if not interactions:
+            return
+        
+        if self.collection is None or self.embedding_model is None:
+            raise RuntimeError("Vector store is not initialized")
+        
+        documents = []
+        metadatas = []
+        ids = []
+        seen_ids = set()
+        
+        for interaction in interactions:
+            interaction_text = (
+                f"User: {interaction['user_message']}\n"
+                f"Assistant: {interaction['assistant_response']}"
             )
+            interaction_id = f"{interaction['session_id']}_{hash(interaction_text)}"
             
-            logger.debug(f"Added interaction to vector store: {interaction_id}")
+            if interaction_id in seen_ids:
+                continue
+            seen_ids.add(interaction_id)
             
-        except Exception as e:
-            logger.error(f"Error adding interaction to vector store: {e}")
+            documents.append(interaction_text)
+            metadatas.append({
+                "session_id": interaction["session_id"],
+                "user_message": interaction["user_message"],
+                "assistant_response": interaction["assistant_response"],
+                "intent": interaction["intent"],
+            })
+            ids.append(interaction_id)
+        
+        await self.executor.run(self._write_batch, documents, metadatas, ids)
+        
+        logger.debug(f"Added {len(ids)} interaction(s) to vector store")
+    
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return await self.executor.run(self._encode, texts)
     
     async def search_similar(
         self, query: str, limit: int = 5
     ) -> List[Dict[str, Any]]:
         try:
-            query_embedding = self.embedding_model.encode(query).tolist()
-            
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-            )
+            results = await self.executor.run(self._query, query, limit)
             
             similar_interactions = []
             if results["documents"]:
@@ -98,6 +132,55 @@ class VectorStore:
             logger.error(f"Error searching vector store: {e}")
             return []
     
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts``, reusing vectors computed for the same text recently.
+        
+        The embedding intent backend and search queries go through here.
+        Stored interactions are embedded separately from their full
+        document, so the intent backend shares the model with storage, not
+        the embedding of a message.
+        """
+        if self.embedding_model is None:
+            raise RuntimeError("Embedding model is not loaded")
+        
+        vectors = [self.embedding_cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            computed = dict(zip(missing, self.embedding_model.encode(missing)))
+            for text, vector in computed.items():
+                self.embedding_cache.set(text, vector)
+            vectors = [computed[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        
+        return np.stack(vectors)
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+    
+    def _write_batch(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+    ):
+        # Every row is embedded from the "User: ...\nAssistant: ..." document,
+        # whatever the intent backend, so rows stay comparable with each other.
+        embeddings = self.embedding_model.encode(documents).tolist()
+        
+        self.collection.add(
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids,
+        )
+    
+    def _query(self, query: str, limit: int) -> Dict[str, Any]:
+        query_embedding = self._encode([query])[0]
+        
+        return self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=limit,
+        )
+    
     async def close(self):
         logger.info("Vector store closed")
 
@@ -0,0 +1,98 @@
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+DEFAULT_SCALE = 20.0
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIntentModel:
+    """Nearest-centroid intent classifier over sentence embeddings.
+    
+    Each intent is the normalized mean embedding of its examples. A message is
+    scored by cosine similarity to every centroid and the scores go through a
+    softmax at ``scale``. ``embed`` runs the vector store's sentence model,
+    so classifying needs neither TensorFlow nor a second model; the vector
+    store still embeds each stored interaction on its own.
+    """
+    
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        intents: Sequence[str],
+        embed: Embedder,
+        scale: float = DEFAULT_SCALE,
+        embedding_model: Optional[str] = None,
+    ):
+        self.centroids = _normalize(np.asarray(centroids, dtype=np.float32))
+        self.intents = list(intents)
+        self.embed = embed
+        self.scale = scale
+        self.embedding_model = embedding_model
+    
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        embed: Embedder,
+        scale: float = DEFAULT_SCALE,
+        embedding_model: Optional[str] = None,
+    ) -> "EmbeddingIntentModel":
+        return cls.fit_vectors(
+            embed(list(texts)), labels, embed, scale=scale, embedding_model=embedding_model
+        )
+    
+    @classmethod
+    def fit_vectors(
+        cls,
+        vectors: np.ndarray,
+        labels: Sequence[str],
+        embed: Embedder,
+        scale: float = DEFAULT_SCALE,
+        embedding_model: Optional[str] = None,
+    ) -> "EmbeddingIntentModel":
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        labels = np.asarray(labels)
+        intents = list(dict.fromkeys(labels.tolist()))
+        
+        centroids = np.stack([vectors[labels == intent].mean(axis=0) for intent in intents])
+        return cls(centroids, intents, embed, scale=scale, embedding_model=embedding_model)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], embed: Embedder) -> "EmbeddingIntentModel":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                centroids=artifact["centroids"],
+                intents=artifact["intents"].tolist(),
+                embed=embed,
+                scale=float(artifact["scale"]),
+                embedding_model=str(artifact["embedding_model"]) or None,
+            )
+    
+    def save(self, path: Union[str, Path]):
+        np.savez(
+            path,
+            centroids=self.centroids,
+            intents=np.asarray(self.intents),
+            scale=np.float32(self.scale),
+            embedding_model=np.asarray(self.embedding_model or ""),
+        )
+    
+    def predict(self, texts: Sequence[str], verbose: int = 0) -> np.ndarray:
+        return self.predict_vectors(self.embed(list(texts)))
+    
+    def predict_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        logits = self.scale * vectors @ self.centroids.T
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
@@ -1,33 +1,152 @@
 import re
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
-import os
 
+from app.core.config import get_settings
+from app.models.analyzed_message import AnalyzedMessage
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+ENTITY_BACKENDS = ("regex", "model")
+
+ENTITY_PATTERNS = {
+    "file_path": r'["\']([^"\']+\.[a-zA-Z0-9]+)["\']|(?:file|path):\s*([^\s]+)',
+    "directory_path": r'["\']([^"\']+/)["\']|(?:directory|folder):\s*([^\s]+)',
+    "time": r'\b(\d{1,2}:\d{2}(?:\s*[AP]M)?)\b',
+    "date": r'\b(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})\b',
+    "relative_time": r'\b(tomorrow|today|tonight|later|next week|next month)\b',
+    "script_name": r'["\']([^"\']+\.py)["\']|\b(\w+\.py)\b',
+    "command": r'(?:run|execute)\s+["\']([^"\']+)["\']',
+    "number": r'\b(\d+)\b',
+    "month_date": r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2}),?\s+(\d{4})\b',
+}
+
+# Characters a pattern cannot match without. A message lacking all of them
+# skips the scan, which for typical chat text rules out most patterns.
+PATTERN_REQUIREMENTS = {
+    "file_path": "\"':",
+    "directory_path": "\"':",
+    "script_name": ".",
+    "command": "\"'",
+}
+DIGIT_PATTERNS = {"time", "date", "number", "month_date"}
+
+# Tried in order on the lowercased message; the first that matches wins.
+TIME_PATTERNS = [
+    r'(\d{1,2}):(\d{2})\s*(am|pm)',
+    r'(\d{1,2})\s*(am|pm)',
+    r'at\s+(\d{1,2}):(\d{2})',
+]
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+# The first operation with any variation in the message wins, so the order matters.
+FILE_OPERATIONS = {
+    'create': ['create', 'make', 'new', 'add', 'build', 'generate'],
+    'open': ['open', 'show', 'display', 'view'],
+    'read': ['read', 'see', 'check', 'look at'],
+    'delete': ['delete', 'remove', 'erase', 'trash', 'clear'],
+    'move': ['move', 'transfer', 'relocate', 'shift'],
+    'copy': ['copy', 'duplicate', 'clone'],
+    'write': ['write', 'save', 'store', 'put'],
+    'rename': ['rename', 'change name'],
+}
 
 
 class EntityExtractorModel:
+    """Rule-based entity extraction with every pattern compiled once.
+    
+    Patterns whose required characters (a digit, a quote, ...) are absent
+    from the message are skipped, and the time, date and operation scans
+    share one lowercased copy of the message.
+    
+    With ``ENTITY_BACKEND=model`` a trained BiLSTM tagger also runs on each
+    batch; its spans fill entity types the patterns did not find.
+    """
+    
     def __init__(self):
-        self.entity_patterns = {
-            "file_path": r'["\']([^"\']+\.[a-zA-Z0-9]+)["\']|(?:file|path):\s*([^\s]+)',
-            "directory_path": r'["\']([^"\']+/)["\']|(?:directory|folder):\s*([^\s]+)',
-            "time": r'\b(\d{1,2}:\d{2}(?:\s*[AP]M)?)\b',
-            "date": r'\b(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})\b',
-            "relative_time": r'\b(tomorrow|today|tonight|later|next week|next month)\b',
-            "script_name": r'["\']([^"\']+\.py)["\']|\b(\w+\.py)\b',
-            "command": r'(?:run|execute)\s+["\']([^"\']+)["\']',
-            "number": r'\b(\d+)\b',
-            "month_date": r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2}),?\s+(\d{4})\b',
-        }
+        self.entity_patterns = ENTITY_PATTERNS
+        self.compiled_patterns: List[Tuple[str, re.Pattern, Optional[str]]] = [
+            (entity_type, re.compile(pattern, re.IGNORECASE), PATTERN_REQUIREMENTS.get(entity_type))
+            for entity_type, pattern in ENTITY_PATTERNS.items()
+        ]
+        self.digit = re.compile(r'\d')
+        self.time_patterns = [re.compile(pattern) for pattern in TIME_PATTERNS]
+        self.month_date = re.compile(ENTITY_PATTERNS["month_date"])
+        self.file_operations = [
+            (variation, operation)
+            for operation, variations in FILE_OPERATIONS.items()
+            for variation in variations
+        ]
+        
+        self.tagger = None
+        self.executor = None
+        self._load_tagger()
+    
+    def _load_tagger(self):
+        backend = settings.ENTITY_BACKEND.lower()
+        if backend not in ENTITY_BACKENDS:
+            logger.warning(f"Unknown ENTITY_BACKEND '{settings.ENTITY_BACKEND}', using regex")
+            return
+        if backend == "regex":
+            return
+        
+        model_path = Path(settings.ENTITY_MODEL_PATH)
+        tags_path = model_path.parent / "entity_tags.json"
+        if not (model_path.exists() and tags_path.exists()):
+            logger.info("No trained entity tagger found, using regex extraction only")
+            return
+        
+        try:
+            from ml.inference.entity_tagger import EntityTagger
+            from ml.inference.executor import get_inference_executor
+            
+            self.tagger = EntityTagger.load(model_path, tags_path)
+            self.executor = get_inference_executor()
+            logger.info(f"Loaded entity tagger from {model_path}")
+        except Exception as e:
+            logger.warning(f"Could not load entity tagger: {e}")
+            self.tagger = None
     
-    async def extract(self, text: str) -> Dict[str, Any]:
+    async def extract(self, text: Union[str, AnalyzedMessage]) -> Dict[str, Any]:
+        if self.tagger is None:
+            return self._extract(text)
+        return (await self.extract_batch([text]))[0]
+    
+    async def extract_batch(self, texts: Sequence[Union[str, AnalyzedMessage]]) -> List[Dict[str, Any]]:
+        if self.tagger is None:
+            return [self._extract(text) for text in texts]
+        
+        messages = [AnalyzedMessage.of(text) for text in texts]
+        tagged = await self.executor.run(self.tagger.tag_batch, [message.text for message in messages])
+        return [self._extract(message, model_entities) for message, model_entities in zip(messages, tagged)]
+    
+    def _extract(
+        self,
+        text: Union[str, AnalyzedMessage],
+        model_entities: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, Any]:
+        message = AnalyzedMessage.of(text)
+        text = message.text
         entities = {}
+        has_digit = self.digit.search(text) is not None
         
-        for entity_type, pattern in self.entity_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for entity_type, pattern, required in self.compiled_patterns:
+            if entity_type in DIGIT_PATTERNS:
+                if not has_digit:
+                    continue
+            elif required is not None and not any(char in text for char in required):
+                continue
+            
+            matches = pattern.findall(text)
             if matches:
                 if isinstance(matches[0], tuple):
                     values = [m for match in matches for m in match if m]
@@ -37,18 +156,21 @@ class EntityExtractorModel:
                 if values:
                     entities[entity_type] = values[0] if len(values) == 1 else values
         
-        extracted_time = self._extract_time_from_message(text)
+        if model_entities:
+            self._merge_model_entities(entities, model_entities)
+        
+        text_lower = message.lower
+        # Both need a digit, and lowercasing neither adds nor removes digits.
+        extracted_time = self._extract_time_from_message(text_lower) if has_digit else None
         if extracted_time:
             entities["extracted_time"] = extracted_time
         
-        extracted_date = self._extract_date_from_message(text)
+        extracted_date = self._extract_date_from_message(text_lower) if has_digit else None
         if extracted_date:
             entities["extracted_date"] = extracted_date
         
         if "relative_time" in entities:
-            entities["scheduled_datetime"] = self._parse_relative_time(
-                entities["relative_time"]
-            )
+            self.resolve_relative_time(entities)
         elif "date" in entities and "time" in entities:
             entities["scheduled_datetime"] = f"{entities['date']} {entities['time']}"
         elif "date" in entities and extracted_time:
@@ -62,10 +184,47 @@ class EntityExtractorModel:
             else:
                 entities["scheduled_datetime"] = formatted_date
         
-        self._extract_file_operations(text, entities)
+        self._extract_file_operations(text_lower, entities)
         
         return entities
     
+    def _merge_model_entities(self, entities: Dict[str, Any], model_entities: Dict[str, List[str]]):
+        # Pattern matches are precise where they fire, so the tagger only adds
+        # what they missed, such as unquoted file names.
+        for entity_type, values in model_entities.items():
+            if entity_type == "time":
+                values = self._normalize_model_times(values)
+                if not values:
+                    continue
+            
+            if entity_type not in entities:
+                entities[entity_type] = values[0] if len(values) == 1 else values
+            elif entity_type == "time" and entities["time"] not in values:
+                logger.debug(
+                    f"Entity tagger found time {values}, keeping the pattern's {entities['time']!r}"
+                )
+    
+    def _normalize_model_times(self, spans: List[str]) -> List[str]:
+        # Tagged spans can take in neighbouring words ("date 5pm"); only the
+        # time they contain goes on to scheduling, as HH:MM:SS.
+        times = []
+        for span in spans:
+            time = self._extract_time_from_message(span.lower())
+            if time is None:
+                logger.debug(f"Dropping tagged time {span!r} with no clock time in it")
+            elif time not in times:
+                times.append(time)
+        return times
+    
+    def resolve_relative_time(self, entities: Dict[str, Any]) -> Dict[str, Any]:
+        if "relative_time" in entities:
+            relative_time = entities["relative_time"]
+            if isinstance(relative_time, list):
+                # "today ... later" matches twice; schedule for the first.
+                relative_time = relative_time[0]
+            entities["scheduled_datetime"] = self._parse_relative_time(relative_time)
+        return entities
+    
     def _parse_relative_time(self, relative_time: str) -> str:
         now = datetime.now()
         relative_time = relative_time.lower()
@@ -89,81 +248,48 @@ class EntityExtractorModel:
         
         return now.isoformat()
     
-    def _extract_time_from_message(self, message: str) -> str:
-        import re
-        
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm)',
-            r'(\d{1,2})\s*(am|pm)',
-            r'at\s+(\d{1,2}):(\d{2})',
-            r'at\s+(\d{1,2})',
-        ]
-        
-        message_lower = message.lower()
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, message_lower)
+    def _extract_time_from_message(self, message_lower: str) -> Optional[str]:
+        for pattern in self.time_patterns:
+            match = pattern.search(message_lower)
             if match:
                 groups = match.groups()
-                if len(groups) >= 2:
-                    hour = int(groups[0])
-                    
-                    if groups[1] in ['am', 'pm']:
-                        minute = 0
-                        ampm = groups[1]
-                    else:
-                        minute = int(groups[1]) if groups[1].isdigit() else 0
-                        ampm = groups[2] if len(groups) > 2 and groups[2] in ['am', 'pm'] else None
-                    
-                    if ampm:
-                        if ampm == 'pm' and hour != 12:
-                            hour += 12
-                        elif ampm == 'am' and hour == 12:
-                            hour = 0
-                    
-                    return f"{hour:02d}:{minute:02d}:00"
+                hour = int(groups[0])
+                
+                if groups[1] in ['am', 'pm']:
+                    minute = 0
+                    ampm = groups[1]
+                else:
+                    minute = int(groups[1])
+                    ampm = groups[2] if len(groups) > 2 else None
+                
+                if ampm:
+                    if ampm == 'pm' and hour != 12:
+                        hour += 12
+                    elif ampm == 'am' and hour == 12:
+                        hour = 0
+                
+                return f"{hour:02d}:{minute:02d}:00"
         
         return None
     
-    def _extract_date_from_message(self, message: str) -> str:
-        import re
-        from datetime import datetime
-        
-        month_names = {
-            'january': 1, 'february': 2, 'march': 3, 'april': 4,
-            'may': 5, 'june': 6, 'july': 7, 'august': 8,
-            'september': 9, 'october': 10, 'november': 11, 'december': 12
-        }
-        
-        message_lower = message.lower()
-        
-        pattern = r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2}),?\s+(\d{4})\b'
-        match = re.search(pattern, message_lower)
+    def _extract_date_from_message(self, message_lower: str) -> Optional[str]:
+        match = self.month_date.search(message_lower)
         
         if match:
             month_name, day, year = match.groups()
-            month_num = month_names[month_name]
             
             try:
-                dt = datetime(int(year), month_num, int(day))
+                dt = datetime(int(year), MONTHS[month_name], int(day))
                 return dt.strftime('%m/%d/%Y')
             except ValueError:
                 return None
         
         return None
     
-    def _format_month_date(self, month_date_tuple) -> str:
-        from datetime import datetime
-        
-        month_names = {
-            'january': 1, 'february': 2, 'march': 3, 'april': 4,
-            'may': 5, 'june': 6, 'july': 7, 'august': 8,
-            'september': 9, 'october': 10, 'november': 11, 'december': 12
-        }
-        
+    def _format_month_date(self, month_date_tuple) -> Optional[str]:
         if isinstance(month_date_tuple, tuple) and len(month_date_tuple) >= 3:
             month_name, day, year = month_date_tuple[:3]
-            month_num = month_names.get(month_name.lower(), 1)
+            month_num = MONTHS.get(month_name.lower(), 1)
             
             try:
                 dt = datetime(int(year), month_num, int(day))
@@ -173,27 +299,8 @@ class EntityExtractorModel:
         
         return None
     
-    def _extract_file_operations(self, text: str, entities: Dict[str, Any]):
-        operations_map = {
-            'create': ['create', 'make', 'new', 'add', 'build', 'generate'],
-            'open': ['open', 'show', 'display', 'view'],
-            'read': ['read', 'see', 'check', 'look at'],
-            'delete': ['delete', 'remove', 'erase', 'trash', 'clear'],
-            'move': ['move', 'transfer', 'relocate', 'shift'],
-            'copy': ['copy', 'duplicate', 'clone'],
-            'write': ['write', 'save', 'store', 'put'],
-            'rename': ['rename', 'change name'],
-        }
-        
-        text_lower = text.lower()
-        
-        for base_op, variations in operations_map.items():
-            for variation in variations:
-                if variation in text_lower:
-                    entities["operation"] = base_op
-                    return
-        
-        if 'folder' in text_lower or 'directory' in text_lower:
-            if 'create' not in entities and any(word in text_lower for word in ['make', 'new', 'create', 'build']):
-                entities["operation"] = 'create'
-
+    def _extract_file_operations(self, text_lower: str, entities: Dict[str, Any]):
+        for variation, operation in self.file_operations:
+            if variation in text_lower:
+                entities["operation"] = operation
+                return
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+metrics = get_metrics()
+
+inference_queue_depth = metrics.gauge(
+    "inference_queue_depth", "Model calls waiting for an inference worker"
+)
+inference_active = metrics.gauge(
+    "inference_active", "Model calls currently running on an inference worker"
+)
+inference_wait_seconds = metrics.histogram(
+    "inference_wait_seconds", "Time model calls spent queued before running"
+)
+inference_run_seconds = metrics.histogram(
+    "inference_run_seconds", "Time model calls spent running on an inference worker"
+)
+
+
+class InferenceExecutor:
+    """Bounded thread pool for blocking model calls.
+    
+    Keras ``predict`` and ``SentenceTransformer.encode`` release the GIL for
+    most of their work, so running them here keeps the event loop free while
+    capping concurrent inference at ``MAX_CONCURRENT_TASKS``.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.MAX_CONCURRENT_TASKS
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+    
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        submitted_at = time.perf_counter()
+        
+        def call():
+            started_at = time.perf_counter()
+            wait = started_at - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self._update_gauges()
+            inference_wait_seconds.observe(wait)
+            
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                run = time.perf_counter() - started_at
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.total_run += run
+                    self._update_gauges()
+                inference_run_seconds.observe(run)
+        
+        with self._lock:
+            self.queued += 1
+            self._update_gauges()
+        
+        future = self._get_pool().submit(call)
+        
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancel():
+                with self._lock:
+                    self.queued -= 1
+                    self._update_gauges()
+            raise
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": completed,
+                "avg_wait_ms": (self.total_wait / completed * 1000) if completed else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_run_ms": (self.total_run / completed * 1000) if completed else 0.0,
+            }
+    
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        
+        if pool is not None:
+            pool.shutdown(wait=True)
+            logger.info("Inference executor shut down")
+    
+    def _update_gauges(self):
+        inference_queue_depth.set(self.queued)
+        inference_active.set(self.active)
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="inference",
+                )
+            return self._pool
+
+
+@lru_cache()
+def get_inference_executor() -> InferenceExecutor:
+    return InferenceExecutor()
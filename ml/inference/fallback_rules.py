@@ -0,0 +1,238 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from app.models.analyzed_message import AnalyzedMessage
+from app.models.schemas import IntentType
+
+
+PATTERNS = {
+    IntentType.FILE_OPERATION: [
+        r'\b(open|create|delete|move|copy|read|write|save)\b.*\b(file|folder|directory)\b',
+        r'\b(file|folder|directory)\b',
+    ],
+    IntentType.SCHEDULE_REMINDER: [
+        r'\b(remind|schedule|alarm|notify)\b',
+        r'\b(tomorrow|today|later|at \d+)\b',
+    ],
+    IntentType.RUN_SCRIPT: [
+        r'\b(run|execute|start|launch)\b.*\b(script|program|command)\b',
+        r'\bpython\b.*\.py\b',
+    ],
+    IntentType.SEARCH: [
+        r'\b(search|find|look for|query)\b',
+        r'\bwhere is\b',
+    ],
+    IntentType.SYSTEM_INFO: [
+        r'\b(system|cpu|memory|disk|process)\b.*\b(info|status|usage)\b',
+        r'\bwhat.*\b(time|date|weather)\b',
+    ],
+    IntentType.EXCEL_OPERATION: [
+        r'\b(excel|spreadsheet|csv|xlsx|xls)\b',
+        r'\b(remove|delete|eliminate)\s+(duplicates|duplicate)\b',
+        r'\b(sort|organize|arrange)\s+(alphabetically|alphabetical)\b',
+        r'\b(clean|organize|arrange)\s+(data|excel|spreadsheet)\b',
+        r'\b(remove|delete)\s+(empty|blank)\s+(rows|cells)\b',
+    ],
+}
+
+ACTION_VERBS = {
+    IntentType.FILE_OPERATION: [
+        'create', 'make', 'new', 'add', 'build', 'generate',
+        'open', 'display', 'view', 'read',
+        'delete', 'remove', 'erase', 'clear', 'trash',
+        'move', 'transfer', 'relocate', 'shift',
+        'copy', 'duplicate', 'clone',
+        'write', 'save', 'store', 'put',
+        'rename', 'change', 'modify', 'update',
+    ],
+    IntentType.SCHEDULE_REMINDER: [
+        'remind', 'reminder', 'remember', 'notify', 'alert',
+        'schedule', 'plan', 'set', 'arrange',
+        'alarm', 'wake', 'ping', 'tell',
+    ],
+    IntentType.RUN_SCRIPT: [
+        'run', 'execute', 'start', 'launch', 'fire',
+        'perform', 'do', 'activate', 'trigger',
+        'call', 'invoke', 'process',
+    ],
+    IntentType.SEARCH: [
+        'search', 'find', 'look', 'locate', 'discover',
+        'where', 'query', 'seek', 'hunt', 'browse', 'show',
+    ],
+    IntentType.SYSTEM_INFO: [
+        'time', 'date', 'clock', 'calendar',
+        'system', 'computer', 'machine', 'status',
+        'info', 'information', 'details', 'stats',
+    ],
+    IntentType.EXCEL_OPERATION: [
+        'excel', 'spreadsheet', 'csv', 'xlsx', 'xls',
+        'duplicate', 'duplicates', 'remove', 'delete',
+        'sort', 'organize', 'arrange', 'alphabetical',
+        'clean', 'data', 'rows', 'cells', 'empty',
+    ],
+}
+
+SEARCH_PHRASES = ['find', 'look for', 'search for', 'where is', 'locate', 'show me']
+FILE_RELATED = ['file', 'folder', 'directory', 'doc', 'document', 'text', 'data', 'path']
+FOLDER_WORDS = ['folder', 'directory']
+SEARCH_WORDS = ['find', 'search', 'where', 'locate', 'look']
+SCHEDULE_WORDS = ['tomorrow', 'later', 'at', 'pm', 'am', 'o\'clock']
+SCRIPT_MARKERS = ['.py', '.sh', 'script']
+GREETING_WORDS = ['hello', 'hi', 'hey', 'greetings', 'sup', 'yo']
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional group: prefer the longer keyword, fall back to the one ending here.
+        return "(?:" + body + ")?" if "" in node else body
+    
+    return build(trie)
+
+
+def _literal_triggers(pattern: str) -> Optional[FrozenSet[str]]:
+    """Literals of which at least one must occur for ``pattern`` to match, or None."""
+    body = pattern[2:] if pattern.startswith(r'\b') else pattern
+    if body.startswith('('):
+        alternatives = body[1:body.index(')')].split('|')
+    else:
+        alternatives = [body]
+    
+    triggers = set()
+    for alternative in alternatives:
+        literal = re.match(r"[a-z0-9' ]*", alternative).group()
+        if alternative[len(literal):len(literal) + 1] in ('?', '*', '{'):
+            literal = literal[:-1]
+        if not literal:
+            return None
+        triggers.add(literal)
+    
+    return frozenset(triggers)
+
+
+class CompiledFallbackRules:
+    """The rule-based intent fallback, compiled once.
+    
+    Every substring and ``startswith`` test becomes one keyword scan: a single
+    trie-shaped regex inside a lookahead, so every position yields its longest
+    keyword and the table of prefixes fills in the shorter keywords starting
+    there. Regex patterns only run when one of their leading literals was seen
+    by the scan, and verb tests are lookups against the message split on
+    spaces. Scores are then summed in the same order as the original per-rule
+    loops so the floats, and therefore ties, come out identical.
+    """
+    
+    def __init__(self):
+        # Scores live in a list indexed like IntentType; hashing Enum members
+        # on every dict update costs more than the matching itself.
+        self.intents: List[IntentType] = list(IntentType)
+        index = {intent: i for i, intent in enumerate(self.intents)}
+        self.file_index = index[IntentType.FILE_OPERATION]
+        self.schedule_index = index[IntentType.SCHEDULE_REMINDER]
+        self.script_index = index[IntentType.RUN_SCRIPT]
+        self.search_index = index[IntentType.SEARCH]
+        self.chat_index = index[IntentType.CHAT]
+        
+        self.patterns: List[Tuple[int, re.Pattern, Optional[FrozenSet[str]]]] = [
+            (index[intent], re.compile(pattern), _literal_triggers(pattern))
+            for intent, patterns in PATTERNS.items()
+            for pattern in patterns
+        ]
+        
+        self.verb_index: Dict[str, List[int]] = {}
+        for intent, verbs in ACTION_VERBS.items():
+            for verb in verbs:
+                self.verb_index.setdefault(verb, []).append(index[intent])
+        
+        keywords = set(self.verb_index)
+        for group in (
+            SEARCH_PHRASES, FILE_RELATED, FOLDER_WORDS, SEARCH_WORDS,
+            SCHEDULE_WORDS, SCRIPT_MARKERS, GREETING_WORDS,
+        ):
+            keywords.update(group)
+        for _, _, triggers in self.patterns:
+            keywords.update(triggers or ())
+        
+        self.keyword_scan = re.compile("(?=(" + _trie_pattern(keywords) + "))")
+        self.prefixes: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(k for k in keywords if keyword.startswith(k))
+            for keyword in keywords
+        }
+        
+        self.search_phrases = SEARCH_PHRASES
+        self.file_related = frozenset(FILE_RELATED)
+        self.folder_words = frozenset(FOLDER_WORDS)
+        self.search_words = frozenset(SEARCH_WORDS)
+        self.schedule_words = frozenset(SCHEDULE_WORDS)
+        self.script_markers = frozenset(SCRIPT_MARKERS)
+        self.greeting_words = frozenset(GREETING_WORDS)
+    
+    def predict(self, text: Union[str, AnalyzedMessage]) -> dict:
+        text_lower = AnalyzedMessage.of(text).lower
+        found, at_start = self._scan(text_lower)
+        scores = [0.0] * len(self.intents)
+        
+        for index, pattern, triggers in self.patterns:
+            if triggers is not None and triggers.isdisjoint(found):
+                continue
+            if pattern.search(text_lower):
+                scores[index] += 0.3
+        
+        for phrase in self.search_phrases:
+            if phrase in found:
+                scores[self.search_index] += 0.6
+        
+        file_related = not self.file_related.isdisjoint(found)
+        for word in set(text_lower.split(' ')) | at_start:
+            for index in self.verb_index.get(word, ()):
+                scores[index] += 0.4
+                if index == self.file_index and file_related:
+                    scores[index] += 0.3
+        
+        if not self.folder_words.isdisjoint(found) and self.search_words.isdisjoint(found):
+            scores[self.file_index] += 0.5
+        
+        if not self.schedule_words.isdisjoint(found):
+            scores[self.schedule_index] += 0.3
+        
+        if not self.script_markers.isdisjoint(found):
+            scores[self.script_index] += 0.4
+        
+        if not self.greeting_words.isdisjoint(at_start):
+            scores[self.chat_index] += 0.8
+        
+        best = max(scores)
+        if best > 0:
+            predicted_intent = self.intents[scores.index(best)]
+            confidence = min(best, 0.95)
+        else:
+            predicted_intent = IntentType.CHAT
+            confidence = 0.6
+        
+        return {
+            "intent": predicted_intent,
+            "confidence": confidence,
+        }
+    
+    def _scan(self, text_lower: str) -> Tuple[Set[str], FrozenSet[str]]:
+        found: Set[str] = set()
+        at_start: FrozenSet[str] = frozenset()
+        
+        for match in self.keyword_scan.finditer(text_lower):
+            prefixes = self.prefixes[match.group(1)]
+            found.update(prefixes)
+            if match.start() == 0:
+                at_start = prefixes
+        
+        return found, at_start
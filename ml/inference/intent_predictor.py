@@ -1,20 +1,135 @@
-import tensorflow as tf
 import numpy as np
 from pathlib import Path
+import asyncio
 import json
-import re
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+from app.models.analyzed_message import AnalyzedMessage
 from app.models.schemas import IntentType
+from app.core.config import get_settings
+from app.core.metrics import get_metrics
+from app.core.profiling import lazy_import
+from ml.inference.executor import InferenceExecutor, get_inference_executor
+from ml.inference.fallback_rules import CompiledFallbackRules
+from ml.inference.text_encoder import TextEncoder
 from app.core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+INTENT_BACKENDS = ("keras", "onnx", "embedding", "linear")
+INTENT_MODEL_VARIANTS = ("float", "int8")
+BUCKET_PROBE_TOLERANCE = 1e-4
+
+intent_batch_size = get_metrics().histogram(
+    "intent_batch_size",
+    "Number of messages per micro-batched intent forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+intent_cascade_answers = get_metrics().counter(
+    "intent_cascade_answers_total",
+    "Intent predictions answered by each cascade tier",
+    ["tier"],
+)
+intent_cascade_tier_duration = get_metrics().histogram(
+    "intent_cascade_tier_duration_seconds",
+    "Time spent in each cascade tier per predict call",
+    ["tier"],
+)
+
+
+class IntentMicroBatcher:
+    """Coalesces concurrent single-message predictions into one forward pass.
+    
+    Calls to ``submit`` are held for up to ``window_ms`` milliseconds or until
+    ``max_batch_size`` messages are waiting, then the whole group is sent to
+    ``predict_batch`` on the inference executor and each caller gets its own row.
+    """
+    
+    def __init__(
+        self,
+        predict_batch: Callable[[List[str]], List[dict]],
+        executor: InferenceExecutor,
+        max_batch_size: int = None,
+        window_ms: float = None,
+    ):
+        self.predict_batch = predict_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size or settings.INTENT_BATCH_MAX_SIZE
+        self.window_ms = window_ms if window_ms is not None else settings.INTENT_BATCH_WINDOW_MS
+        
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        
+        self.batch_sizes: Counter = Counter()
+    
+    async def submit(self, text: str) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        
+        return await future
+    
+    def stats(self) -> Dict[str, object]:
+        batches = sum(self.batch_sizes.values())
+        requests = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window_ms,
+            "batches": batches,
+            "requests": requests,
+            "avg_batch_size": requests / batches if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+        }
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        self.batch_sizes[len(batch)] += 1
+        intent_batch_size.observe(len(batch))
+        
+        try:
+            results = await self.executor.run(
+                self.predict_batch, [text for text, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
 
 
 class IntentPredictor:
-    def __init__(self):
+    def __init__(self, embedder: Optional[Callable[[List[str]], np.ndarray]] = None):
+        self.embedder = embedder
         self.model = None
         self.tokenizer = None
+        self.length_buckets: Optional[List[int]] = None
         self.intent_labels = [
             IntentType.CHAT,
             IntentType.FILE_OPERATION,
@@ -26,32 +141,129 @@ class IntentPredictor:
             IntentType.UNKNOWN,
         ]
         
+        self.executor = get_inference_executor()
+        self.batcher: Optional[IntentMicroBatcher] = None
+        
+        self.cascade_threshold: Optional[float] = settings.INTENT_CASCADE_THRESHOLD
+        self.tier_answers: Counter = Counter()
+        self.tier_seconds: Counter = Counter()
+        
         self._load_trained_model()
         self._initialize_fallback()
+        
+        if self.model is not None and settings.INTENT_BATCH_WINDOW_MS > 0:
+            self.batcher = IntentMicroBatcher(self._model_predict_batch, self.executor)
     
     def _load_trained_model(self):
-        model_path = Path("models/saved_models/intent_classifier.keras")
-        intent_map_path = Path("models/saved_models/intent_map.json")
+        backend = settings.INTENT_BACKEND.lower()
+        if backend not in INTENT_BACKENDS:
+            logger.warning(f"Unknown INTENT_BACKEND '{settings.INTENT_BACKEND}', using keras")
+            backend = "keras"
+        
+        if backend == "embedding":
+            self._load_embedding_model(Path(settings.INTENT_CENTROIDS_PATH))
+            return
+        if backend == "linear":
+            self._load_linear_model(Path(settings.INTENT_LINEAR_PATH))
+            return
+        
+        variant = settings.INTENT_MODEL_VARIANT.lower()
+        if variant not in INTENT_MODEL_VARIANTS:
+            logger.warning(f"Unknown INTENT_MODEL_VARIANT '{settings.INTENT_MODEL_VARIANT}', using float")
+            variant = "float"
+        
+        if variant == "int8":
+            # The quantized variant is an ONNX graph, so only ONNX Runtime can serve it.
+            if backend != "onnx":
+                logger.info("The int8 intent model is served by the onnx backend")
+            backend = "onnx"
+            model_path = Path(settings.INTENT_INT8_ONNX_PATH)
+        elif backend == "onnx":
+            model_path = Path(settings.INTENT_ONNX_PATH)
+        else:
+            model_path = Path(settings.INTENT_MODEL_PATH)
+        intent_map_path = model_path.parent / "intent_map.json"
         
         if model_path.exists() and intent_map_path.exists():
             try:
-                self.model = tf.keras.models.load_model(model_path)
+                if backend == "onnx":
+                    from ml.inference.onnx_backend import OnnxIntentModel
+                    
+                    self.model = OnnxIntentModel(model_path)
+                else:
+                    tf = lazy_import("tensorflow")
+                    from ml.intent.model import IntentClassifier
+                    
+                    self.model = tf.keras.models.load_model(
+                        model_path,
+                        custom_objects={"IntentClassifier": IntentClassifier},
+                    )
                 
                 with open(intent_map_path, 'r') as f:
                     intent_map = json.load(f)
                 
-                self.tokenizer = self._load_tokenizer()
-                logger.info(f"Loaded trained model from {model_path}")
+                self.intent_labels = [
+                    IntentType(name)
+                    for name, _ in sorted(intent_map.items(), key=lambda item: item[1])
+                ]
+                
+                self.tokenizer = self._load_tokenizer(model_path.parent / "intent_vocab.json")
+                self.length_buckets = self._check_length_buckets(settings.INTENT_LENGTH_BUCKETS)
+                logger.info(f"Loaded trained {backend} {variant} model from {model_path}")
             except Exception as e:
                 logger.warning(f"Could not load trained model: {e}")
                 self.model = None
         else:
             logger.info("No trained model found, using fallback logic only")
     
-    def _load_tokenizer(self):
-        from tensorflow.keras.preprocessing.text import Tokenizer
+    def _load_embedding_model(self, centroids_path: Path):
+        if self.embedder is None:
+            logger.warning("The embedding intent backend needs the vector store's embedder; using fallback logic only")
+            return
+        if not centroids_path.exists():
+            logger.info("No intent centroids found, using fallback logic only")
+            return
         
-        tokenizer = Tokenizer(oov_token="<OOV>")
+        try:
+            from ml.inference.embedding_backend import EmbeddingIntentModel
+            
+            self.model = EmbeddingIntentModel.load(centroids_path, self.embedder)
+            self.intent_labels = [IntentType(name) for name in self.model.intents]
+            
+            if self.model.embedding_model not in (None, settings.EMBEDDING_MODEL):
+                logger.warning(
+                    f"Intent centroids were built with {self.model.embedding_model} "
+                    f"but the vector store uses {settings.EMBEDDING_MODEL}; retrain them"
+                )
+            logger.info(f"Loaded intent centroids from {centroids_path}")
+        except Exception as e:
+            logger.warning(f"Could not load intent centroids: {e}")
+            self.model = None
+    
+    def _load_linear_model(self, model_path: Path):
+        if not model_path.exists():
+            logger.info("No linear intent model found, using fallback logic only")
+            return
+        
+        try:
+            from ml.inference.linear_backend import LinearIntentModel
+            
+            self.model = LinearIntentModel.load(model_path)
+            self.intent_labels = [IntentType(name) for name in self.model.intents]
+            logger.info(f"Loaded linear intent model from {model_path}")
+        except Exception as e:
+            logger.warning(f"Could not load linear intent model: {e}")
+            self.model = None
+    
+    def _load_tokenizer(self, vocab_path: Path) -> TextEncoder:
+        if vocab_path.exists():
+            return TextEncoder.load(vocab_path)
+        
+        logger.warning(
+            f"No vocabulary at {vocab_path}; rebuilding an approximate one. "
+            "Retrain the model to save the vocabulary it was trained with."
+        )
+        tokenizer = TextEncoder(oov_token="<OOV>")
         tokenizer.fit_on_texts([
             "hello", "hi", "how are you", "what's up", "good morning",
             "open file", "create folder", "delete document", "move file to",
@@ -62,166 +274,159 @@ class IntentPredictor:
         ])
         return tokenizer
     
+    def _check_length_buckets(self, buckets: List[int]) -> Optional[List[int]]:
+        """Return ``buckets`` if padding to them leaves the model's output unchanged.
+        
+        Narrower padding is only safe when the model masks padding out of
+        attention and pooling. Probing each bucket also traces its input shape
+        once here rather than on the first request that needs it.
+        """
+        buckets = sorted(b for b in buckets if 0 < b < self.tokenizer.max_length)
+        if not buckets:
+            return None
+        
+        if not settings.WARMUP_MESSAGES:
+            logger.info("No warm-up messages to probe the intent model with; length buckets disabled")
+            return None
+        
+        # A failed probe only turns bucketing off, never the model itself.
+        try:
+            probe = self.tokenizer.encode(settings.WARMUP_MESSAGES)
+            full = self.model.predict(probe, verbose=0)
+            for bucket in buckets:
+                if np.count_nonzero(probe[:, bucket:]):
+                    continue
+                
+                narrow = self.model.predict(probe[:, :bucket], verbose=0)
+                if not np.allclose(narrow, full, atol=BUCKET_PROBE_TOLERANCE):
+                    logger.info(
+                        "Intent model output depends on padding width; length buckets "
+                        "disabled. Retrain the model to enable them."
+                    )
+                    return None
+        except Exception as e:
+            logger.error(f"Could not probe intent length buckets, padding to full length: {e}")
+            return None
+        
+        return buckets
+    
     def _initialize_fallback(self):
-        self.patterns = {
-            IntentType.FILE_OPERATION: [
-                r'\b(open|create|delete|move|copy|read|write|save)\b.*\b(file|folder|directory)\b',
-                r'\b(file|folder|directory)\b',
-            ],
-            IntentType.SCHEDULE_REMINDER: [
-                r'\b(remind|schedule|alarm|notify)\b',
-                r'\b(tomorrow|today|later|at \d+)\b',
-            ],
-            IntentType.RUN_SCRIPT: [
-                r'\b(run|execute|start|launch)\b.*\b(script|program|command)\b',
-                r'\bpython\b.*\.py\b',
-            ],
-            IntentType.SEARCH: [
-                r'\b(search|find|look for|query)\b',
-                r'\bwhere is\b',
-            ],
-            IntentType.SYSTEM_INFO: [
-                r'\b(system|cpu|memory|disk|process)\b.*\b(info|status|usage)\b',
-                r'\bwhat.*\b(time|date|weather)\b',
-            ],
-            IntentType.EXCEL_OPERATION: [
-                r'\b(excel|spreadsheet|csv|xlsx|xls)\b',
-                r'\b(remove|delete|eliminate)\s+(duplicates|duplicate)\b',
-                r'\b(sort|organize|arrange)\s+(alphabetically|alphabetical)\b',
-                r'\b(clean|organize|arrange)\s+(data|excel|spreadsheet)\b',
-                r'\b(remove|delete)\s+(empty|blank)\s+(rows|cells)\b',
-            ],
+        self.fallback_rules = CompiledFallbackRules()
+    
+    def cascade_stats(self) -> Dict[str, object]:
+        answered = sum(self.tier_answers.values())
+        return {
+            "threshold": self.cascade_threshold,
+            "answered": dict(self.tier_answers),
+            "fallback_share": self.tier_answers["fallback"] / answered if answered else 0.0,
+            "seconds": {tier: round(seconds, 6) for tier, seconds in self.tier_seconds.items()},
         }
     
-    async def predict(self, text: str) -> dict:
+    async def predict(self, text: Union[str, AnalyzedMessage]) -> dict:
+        # The rules read the shared analysis; the models take the raw text.
+        message = AnalyzedMessage.of(text)
         try:
             if self.model is None:
-                return self._fallback_predict(text)
+                return self._fallback_predict(message)
             
-            return self._model_predict(text)
+            if self.cascade_threshold is not None:
+                return await self._cascade_predict(message)
+            
+            return await self._model_predict_async(message.text)
             
         except Exception as e:
             logger.warning(f"Error in prediction, using fallback: {e}")
-            return self._fallback_predict(text)
+            return self._fallback_predict(message)
     
-    def _model_predict(self, text: str) -> dict:
-        from tensorflow.keras.preprocessing.sequence import pad_sequences
-        
-        sequence = self.tokenizer.texts_to_sequences([text])
-        padded_sequence = pad_sequences(sequence, maxlen=50, padding='post')
-        
-        prediction = self.model.predict(padded_sequence, verbose=0)[0]
-        predicted_class_index = np.argmax(prediction)
-        confidence = float(prediction[predicted_class_index])
-        
-        predicted_intent = self.intent_labels[predicted_class_index]
+    async def predict_batch(self, texts: Sequence[Union[str, AnalyzedMessage]]) -> List[dict]:
+        if not texts:
+            return []
         
-        return {
-            "intent": predicted_intent,
-            "confidence": confidence,
-        }
+        messages = [AnalyzedMessage.of(text) for text in texts]
+        try:
+            if self.model is None:
+                return [self._fallback_predict(message) for message in messages]
+            
+            if self.cascade_threshold is not None:
+                return await self._cascade_predict_batch(messages)
+            
+            return await self.executor.run(self._model_predict_batch, [message.text for message in messages])
+            
+        except Exception as e:
+            logger.warning(f"Error in batch prediction, using fallback: {e}")
+            return [self._fallback_predict(message) for message in messages]
     
-    def _fallback_predict(self, text: str) -> dict:
-        text_lower = text.lower()
-        
-        scores = {intent: 0.0 for intent in IntentType}
-        
-        for intent, patterns in self.patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    scores[intent] += 0.3
-        
-        action_verbs = {
-            IntentType.FILE_OPERATION: [
-                'create', 'make', 'new', 'add', 'build', 'generate',
-                'open', 'display', 'view', 'read',
-                'delete', 'remove', 'erase', 'clear', 'trash',
-                'move', 'transfer', 'relocate', 'shift',
-                'copy', 'duplicate', 'clone',
-                'write', 'save', 'store', 'put',
-                'rename', 'change', 'modify', 'update',
-            ],
-            IntentType.SCHEDULE_REMINDER: [
-                'remind', 'reminder', 'remember', 'notify', 'alert',
-                'schedule', 'plan', 'set', 'arrange',
-                'alarm', 'wake', 'ping', 'tell',
-            ],
-            IntentType.RUN_SCRIPT: [
-                'run', 'execute', 'start', 'launch', 'fire',
-                'perform', 'do', 'activate', 'trigger',
-                'call', 'invoke', 'process',
-            ],
-            IntentType.SEARCH: [
-                'search', 'find', 'look', 'locate', 'discover',
-                'where', 'query', 'seek', 'hunt', 'browse', 'show',
-            ],
-            IntentType.SYSTEM_INFO: [
-                'time', 'date', 'clock', 'calendar',
-                'system', 'computer', 'machine', 'status',
-                'info', 'information', 'details', 'stats',
-            ],
-            IntentType.EXCEL_OPERATION: [
-                'excel', 'spreadsheet', 'csv', 'xlsx', 'xls',
-                'duplicate', 'duplicates', 'remove', 'delete',
-                'sort', 'organize', 'arrange', 'alphabetical',
-                'clean', 'data', 'rows', 'cells', 'empty',
-            ],
-        }
-        
-        search_phrases = ['find', 'look for', 'search for', 'where is', 'locate', 'show me']
-        for phrase in search_phrases:
-            if phrase in text_lower:
-                scores[IntentType.SEARCH] += 0.6
-        
-        file_related = ['file', 'folder', 'directory', 'doc', 'document', 'text', 'data', 'path']
+    async def _model_predict_async(self, text: str) -> dict:
+        if self.batcher is not None:
+            return await self.batcher.submit(text)
         
-        for intent, verbs in action_verbs.items():
-            for verb in verbs:
-                if f' {verb} ' in f' {text_lower} ' or text_lower.startswith(verb):
-                    scores[intent] += 0.4
-                    
-                    if intent == IntentType.FILE_OPERATION:
-                        if any(f in text_lower for f in file_related):
-                            scores[intent] += 0.3
-        
-        if any(word in text_lower for word in ['folder', 'directory']):
-            if not any(search_word in text_lower for search_word in ['find', 'search', 'where', 'locate', 'look']):
-                scores[IntentType.FILE_OPERATION] += 0.5
+        return await self.executor.run(self._model_predict, text)
+    
+    async def _cascade_predict(self, message: AnalyzedMessage) -> dict:
+        start = time.perf_counter()
+        result = self._fallback_predict(message)
+        self._record_tier("fallback", time.perf_counter() - start)
         
-        if any(word in text_lower for word in ['tomorrow', 'later', 'at', 'pm', 'am', 'o\'clock']):
-            scores[IntentType.SCHEDULE_REMINDER] += 0.3
+        if result["confidence"] >= self.cascade_threshold:
+            self._record_answers("fallback", 1)
+            return result
         
-        if '.py' in text_lower or '.sh' in text_lower or 'script' in text_lower:
-            scores[IntentType.RUN_SCRIPT] += 0.4
+        start = time.perf_counter()
+        result = await self._model_predict_async(message.text)
+        self._record_tier("model", time.perf_counter() - start)
+        self._record_answers("model", 1)
+        return result
+    
+    async def _cascade_predict_batch(self, messages: List[AnalyzedMessage]) -> List[dict]:
+        start = time.perf_counter()
+        results = [self._fallback_predict(message) for message in messages]
+        self._record_tier("fallback", time.perf_counter() - start)
         
-        greeting_words = ['hello', 'hi', 'hey', 'greetings', 'sup', 'yo']
-        if any(text_lower.startswith(g) for g in greeting_words):
-            scores[IntentType.CHAT] += 0.8
+        ambiguous = [i for i, result in enumerate(results) if result["confidence"] < self.cascade_threshold]
+        self._record_answers("fallback", len(messages) - len(ambiguous))
+        if not ambiguous:
+            return results
         
-        if max(scores.values()) > 0:
-            predicted_intent = max(scores, key=scores.get)
-            confidence = min(scores[predicted_intent], 0.95)
-        else:
-            predicted_intent = IntentType.CHAT
-            confidence = 0.6
+        start = time.perf_counter()
+        model_results = await self.executor.run(
+            self._model_predict_batch, [messages[i].text for i in ambiguous]
+        )
+        self._record_tier("model", time.perf_counter() - start)
+        self._record_answers("model", len(ambiguous))
         
-        return {
-            "intent": predicted_intent,
-            "confidence": confidence,
-        }
+        for i, result in zip(ambiguous, model_results):
+            results[i] = result
+        return results
+    
+    def _record_tier(self, tier: str, seconds: float):
+        self.tier_seconds[tier] += seconds
+        intent_cascade_tier_duration.observe(seconds, tier=tier)
+    
+    def _record_answers(self, tier: str, count: int):
+        self.tier_answers[tier] += count
+        intent_cascade_answers.inc(count, tier=tier)
     
     def _model_predict(self, text: str) -> dict:
-        processed = self._preprocess(text)
-        prediction = self.model.predict(processed, verbose=0)
+        return self._model_predict_batch([text])[0]
+    
+    def _model_predict_batch(self, texts: List[str]) -> List[dict]:
+        if self.tokenizer is None:
+            # The embedding and linear backends featurize raw text themselves.
+            inputs = texts
+        else:
+            inputs = self.tokenizer.encode(texts, buckets=self.length_buckets)
         
-        intent_idx = np.argmax(prediction[0])
-        confidence = float(prediction[0][intent_idx])
+        predictions = self.model.predict(inputs, verbose=0)
+        predicted_class_indices = np.argmax(predictions, axis=1)
         
-        return {
-            "intent": self.intent_labels[intent_idx],
-            "confidence": confidence,
-        }
+        results = []
+        for row, predicted_class_index in zip(predictions, predicted_class_indices):
+            results.append({
+                "intent": self.intent_labels[predicted_class_index],
+                "confidence": float(row[predicted_class_index]),
+            })
+        
+        return results
     
-    def _preprocess(self, text: str):
-        return text
-
+    def _fallback_predict(self, message: Union[str, AnalyzedMessage]) -> dict:
+        return self.fallback_rules.predict(message)
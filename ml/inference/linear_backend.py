@@ -0,0 +1,140 @@
+from collections import Counter
+from pathlib import Path
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+
+DEFAULT_N_FEATURES = 2 ** 18
+
+
+def _vectorizers(n_features: int) -> Tuple[HashingVectorizer, HashingVectorizer]:
+    words = HashingVectorizer(
+        n_features=n_features,
+        analyzer="word",
+        ngram_range=(1, 2),
+        token_pattern=r"(?u)\b\w+\b",
+        alternate_sign=False,
+    )
+    chars = HashingVectorizer(
+        n_features=n_features,
+        analyzer="char_wb",
+        ngram_range=(2, 4),
+        alternate_sign=False,
+    )
+    return words, chars
+
+
+class LinearIntentModel:
+    """Softmax regression over hashed word and character n-grams.
+    
+    The vectorizers are stateless, so the artifact holds only the weight rows
+    of the hashed features seen in training. Training uses scikit-learn's
+    ``HashingVectorizer``; serving hashes the same analyzer output itself and
+    sums the matching weight rows, which skips building sparse matrices and
+    costs tens of microseconds per message. No deep learning framework is
+    imported.
+    """
+    
+    def __init__(
+        self,
+        columns: np.ndarray,
+        weights: np.ndarray,
+        intercept: np.ndarray,
+        intents: Sequence[str],
+        n_features: int = DEFAULT_N_FEATURES,
+    ):
+        self.columns = np.asarray(columns, dtype=np.int64)
+        self.intents = list(intents)
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+        self.n_features = n_features
+        self.vectorizers = _vectorizers(n_features)
+        
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.rows = {int(column): row for row, column in enumerate(self.columns)}
+        self.analyzers = [vectorizer.build_analyzer() for vectorizer in self.vectorizers]
+    
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        n_features: int = DEFAULT_N_FEATURES,
+        C: float = 10.0,
+    ) -> "LinearIntentModel":
+        from sklearn.linear_model import LogisticRegression
+        
+        features = cls._features(_vectorizers(n_features), texts)
+        # Columns no example touches get zero weight under L2, so fit on the rest.
+        columns = np.unique(features.indices)
+        classifier = LogisticRegression(C=C, max_iter=1000)
+        classifier.fit(features[:, columns], labels)
+        
+        weights = classifier.coef_.T
+        intercept = classifier.intercept_
+        intents = classifier.classes_.tolist()
+        
+        return cls(columns, weights, intercept, intents, n_features=n_features)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LinearIntentModel":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                columns=artifact["columns"],
+                weights=artifact["weights"],
+                intercept=artifact["intercept"],
+                intents=artifact["intents"].tolist(),
+                n_features=int(artifact["n_features"]),
+            )
+    
+    def save(self, path: Union[str, Path]):
+        np.savez_compressed(
+            path,
+            columns=self.columns,
+            weights=self.weights,
+            intercept=self.intercept,
+            intents=np.asarray(self.intents),
+            n_features=np.int64(self.n_features),
+        )
+    
+    def predict(self, texts: Sequence[str], verbose: int = 0) -> np.ndarray:
+        logits = np.tile(self.intercept, (len(texts), 1))
+        for i, text in enumerate(texts):
+            rows, values = self._hashed_features(text)
+            if rows:
+                logits[i] += np.asarray(values, dtype=np.float32) @ self.weights[rows]
+        
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+    
+    def _hashed_features(self, text: str) -> Tuple[List[int], List[float]]:
+        """Trained weight rows and l2-normalized counts, as ``HashingVectorizer`` computes them."""
+        rows, values = [], []
+        for offset, analyze in zip((0, self.n_features), self.analyzers):
+            counts = Counter(
+                abs(murmurhash3_32(token)) % self.n_features for token in analyze(text)
+            )
+            if not counts:
+                continue
+            
+            # The norm covers every hashed column, trained or not.
+            norm = sum(count * count for count in counts.values()) ** 0.5
+            for column, count in counts.items():
+                row = self.rows.get(column + offset)
+                if row is not None:
+                    rows.append(row)
+                    values.append(count / norm)
+        return rows, values
+    
+    @staticmethod
+    def _features(
+        vectorizers: Tuple[HashingVectorizer, HashingVectorizer],
+        texts: Sequence[str],
+    ) -> sparse.csr_matrix:
+        words, chars = vectorizers
+        texts = list(texts)
+        return sparse.hstack([words.transform(texts), chars.transform(texts)], format="csr")
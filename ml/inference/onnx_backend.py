@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from app.core.profiling import lazy_import
+
+
+class OnnxIntentModel:
+    """ONNX Runtime session for an exported ``IntentClassifier``.
+    
+    Exposes the ``predict(inputs, verbose=0)`` call ``IntentPredictor`` makes on
+    a Keras model, so either backend can sit behind ``IntentPredictor.model``.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        ort = lazy_import("onnxruntime")
+        
+        self.path = Path(path)
+        self.session = ort.InferenceSession(
+            str(self.path), providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+    
+    def predict(self, inputs: np.ndarray, verbose: int = 0) -> np.ndarray:
+        return self.session.run(
+            None, {self.input_name: np.asarray(inputs, dtype=np.int32)}
+        )[0]
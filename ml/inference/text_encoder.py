@@ -0,0 +1,139 @@
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+# Replacing FILTERS with spaces and splitting on " " leaves exactly the runs of
+# characters that are neither, which one findall extracts directly.
+WORD_PATTERN = re.compile("[^" + re.escape(FILTERS + " ") + "]+")
+
+
+class TextEncoder:
+    """Word-index tokenizer with the semantics of the Keras ``Tokenizer``.
+    
+    Text is lowercased, punctuation in ``FILTERS`` becomes a space, words are
+    indexed by descending frequency (first occurrence breaks ties) and unknown
+    words map to the OOV index. ``encode`` pads like ``pad_sequences``. None of
+    it needs TensorFlow, so the ONNX backend can serve without importing it.
+    
+    Training saves the fitted vocabulary with ``save``; inference loads it with
+    ``load`` so both sides index words identically.
+    """
+    
+    def __init__(
+        self,
+        oov_token: Optional[str] = "<OOV>",
+        word_index: Optional[Dict[str, int]] = None,
+        max_length: int = 50,
+        padding: str = "post",
+        truncating: str = "post",
+    ):
+        self.oov_token = oov_token
+        self.word_index: Dict[str, int] = dict(word_index or {})
+        self.max_length = max_length
+        self.padding = padding
+        self.truncating = truncating
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TextEncoder":
+        with open(path, "r") as f:
+            artifact = json.load(f)
+        
+        return cls(
+            oov_token=artifact["oov_token"],
+            word_index={word: index for index, word in enumerate(artifact["words"], start=1)},
+            max_length=artifact["max_length"],
+            padding=artifact["padding"],
+            truncating=artifact["truncating"],
+        )
+    
+    def save(self, path: Union[str, Path]):
+        # Indices are contiguous from 1, so the word list alone encodes the mapping.
+        words = sorted(self.word_index, key=self.word_index.get)
+        with open(path, "w") as f:
+            json.dump({
+                "oov_token": self.oov_token,
+                "max_length": self.max_length,
+                "padding": self.padding,
+                "truncating": self.truncating,
+                "words": words,
+            }, f, separators=(",", ":"))
+    
+    @property
+    def vocab_size(self) -> int:
+        return len(self.word_index) + 1
+    
+    def split(self, text: str) -> List[str]:
+        return WORD_PATTERN.findall(text.lower())
+    
+    def fit_on_texts(self, texts: Iterable[str]):
+        word_counts: "OrderedDict[str, int]" = OrderedDict()
+        for text in texts:
+            for word in self.split(text):
+                word_counts[word] = word_counts.get(word, 0) + 1
+        
+        ordered = sorted(word_counts.items(), key=lambda item: item[1], reverse=True)
+        vocabulary = ([self.oov_token] if self.oov_token is not None else []) + [
+            word for word, _ in ordered
+        ]
+        self.word_index = {word: index for index, word in enumerate(vocabulary, start=1)}
+    
+    def texts_to_sequences(self, texts: Iterable[str]) -> List[List[int]]:
+        return [self._sequence(text) for text in texts]
+    
+    def encode(
+        self,
+        texts: Sequence[str],
+        max_length: Optional[int] = None,
+        padding: Optional[str] = None,
+        truncating: Optional[str] = None,
+        buckets: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Encode ``texts`` into an int32 array of shape (len(texts), width).
+        
+        ``width`` is ``max_length`` unless ``buckets`` is given, in which case
+        it is the smallest bucket that fits the longest sequence in the batch.
+        """
+        max_length = max_length or self.max_length
+        pad_post = (padding or self.padding) == "post"
+        truncate_post = (truncating or self.truncating) == "post"
+        
+        sequences = []
+        for text in texts:
+            sequence = self._sequence(text, max_length if truncate_post else None)
+            sequences.append(sequence if truncate_post else sequence[-max_length:])
+        
+        width = max_length
+        if buckets:
+            longest = max(map(len, sequences), default=0)
+            width = next((bucket for bucket in buckets if longest <= bucket < max_length), max_length)
+        
+        encoded = np.zeros((len(sequences), width), dtype=np.int32)
+        for row, sequence in enumerate(sequences):
+            if not sequence:
+                continue
+            
+            if pad_post:
+                encoded[row, :len(sequence)] = sequence
+            else:
+                encoded[row, width - len(sequence):] = sequence
+        
+        return encoded
+    
+    def _sequence(self, text: str, limit: Optional[int] = None) -> List[int]:
+        words = self.split(text)
+        lookup = self.word_index.get
+        oov_index = self.word_index.get(self.oov_token)
+        
+        if oov_index is None:
+            return [index for index in map(lookup, words) if index is not None][:limit]
+        
+        # With an OOV index every word yields one id, so post-truncation can
+        # happen before the lookups.
+        return [lookup(word, oov_index) for word in words[:limit]]
@@ -12,9 +12,13 @@ class IntentClassifier(keras.Model):
         embedding_dim: int = 128,
         num_intents: int = 7,
         max_length: int = 50,
+        mask_padding: bool = False,
     ):
         super().__init__()
         
+        self.max_length = max_length
+        self.mask_padding = mask_padding
+        
         self.embedding = layers.Embedding(
             input_dim=vocab_size,
             output_dim=embedding_dim,
@@ -45,10 +49,16 @@ class IntentClassifier(keras.Model):
         
         x = self.bidirectional_lstm(x, training=training)
         
-        attention_output = self.attention(x, x, training=training)
+        # Models trained before mask_padding existed let attention and pooling
+        # see the padding, so their outputs depend on the padded length.
+        mask = self.embedding.compute_mask(inputs) if self.mask_padding else None
+        
+        attention_output = self.attention(
+            x, x, query_mask=mask, value_mask=mask, training=training
+        )
         x = layers.Add()([x, attention_output])
         
-        x = self.global_pool(x)
+        x = self.global_pool(x, mask=mask)
         
         x = self.dropout1(x, training=training)
         x = self.dense1(x)
@@ -63,5 +73,7 @@ class IntentClassifier(keras.Model):
             "vocab_size": self.embedding.input_dim,
             "embedding_dim": self.embedding.output_dim,
             "num_intents": self.output_layer.units,
+            "max_length": self.max_length,
+            "mask_padding": self.mask_padding,
         }
 
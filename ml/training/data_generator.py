@@ -3,16 +3,23 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import numpy as np
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+from pathlib import Path
 from typing import Tuple, Dict, List
+import json
 import random
+import string
+
+from app.models.schemas import IntentType
+from ml.inference.text_encoder import TextEncoder
+
+
+CORRECTIONS_PATH = Path("data/feedback/training_corrections.jsonl")
 
 
 class IntentDataGenerator:
     def __init__(self, max_length: int = 50):
         self.max_length = max_length
-        self.tokenizer = Tokenizer(oov_token="<OOV>")
+        self.tokenizer = None
         
         self.training_samples = {
             "chat": [
@@ -74,16 +81,16 @@ class IntentDataGenerator:
         random.shuffle(combined)
         all_texts, all_labels = zip(*combined)
         
-        self.tokenizer.fit_on_texts(all_texts)
-        vocab_size = len(self.tokenizer.word_index) + 1
-        
-        sequences = self.tokenizer.texts_to_sequences(all_texts)
-        padded = pad_sequences(
-            sequences,
-            maxlen=self.max_length,
+        self.tokenizer = TextEncoder(
+            oov_token="<OOV>",
+            max_length=self.max_length,
             padding='post',
             truncating='post',
         )
+        self.tokenizer.fit_on_texts(all_texts)
+        vocab_size = self.tokenizer.vocab_size
+        
+        padded = self.tokenizer.encode(all_texts)
         
         labels = np.array(all_labels)
         
@@ -96,3 +103,113 @@ class IntentDataGenerator:
         
         return (X_train, y_train), (X_val, y_val), vocab_size, intent_map
 
+
+def load_corrections(path: Path) -> List[Tuple[str, str]]:
+    """Intent corrections written by ``FeedbackProcessor``, skipping unknown intents."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    
+    intents = {intent.value for intent in IntentType}
+    corrections = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            record = json.loads(line)
+            if record.get("text") and record.get("intent") in intents:
+                corrections.append((record["text"], record["intent"]))
+    return corrections
+
+
+def training_examples(corrections_path: Path = CORRECTIONS_PATH) -> Tuple[List[str], List[str]]:
+    examples = [
+        (text, intent)
+        for intent, samples in IntentDataGenerator().training_samples.items()
+        for text in samples
+    ]
+    examples.extend(load_corrections(corrections_path))
+    
+    texts, labels = zip(*examples)
+    return list(texts), list(labels)
+
+
+# Messages for the entity tagger. Each {slot} is filled from ENTITY_SLOTS and
+# its character span recorded, so every generated message comes labelled.
+ENTITY_TEMPLATES = [
+    "open {file_path}", "open file {file_path}", "please read {file_path}",
+    "show me {file_path}", "delete {file_path}", "delete {file_path} from {directory_path}",
+    "move {file_path} to {directory_path}", "copy {file_path} into {directory_path}",
+    "create a new file called {file_path}", "rename {file_path} to {file_path}",
+    "what is in {directory_path}", "list the folder {directory_path}",
+    "clean up {directory_path} {relative_time}", "save the notes to {file_path}",
+    "run {script_name}", "execute {script_name} {relative_time}",
+    "can you run {script_name} at {time}", "start {script_name} now",
+    "run command {command}", "execute {command}", "please run {command} in {directory_path}",
+    "remind me {relative_time}", "remind me {relative_time} at {time}",
+    "set an alarm for {time}", "set alarm {relative_time} at {time}",
+    "schedule the meeting on {date} at {time}", "remind me on {date}",
+    "remind me to send {file_path} {relative_time}", "back up {directory_path} at {time}",
+    "hello", "how are you", "what can you do", "thanks for the help",
+    "what time is it", "check system status", "find my files", "search for documents",
+    "tell me a joke", "show cpu usage", "good morning",
+]
+
+FILE_STEMS = [
+    "report", "notes", "budget", "todo", "invoice", "draft", "summary", "photo",
+    "config", "readme", "data", "letter", "resume", "meeting_notes", "q3-sales",
+]
+FILE_EXTENSIONS = ["txt", "md", "pdf", "docx", "xlsx", "csv", "json", "jpg", "png", "log"]
+SCRIPT_STEMS = ["backup", "deploy", "cleanup", "sync", "train", "report", "main", "build_index"]
+
+ENTITY_SLOTS = {
+    "directory_path": lambda rng: rng.choice([
+        "/tmp/archive", "~/documents", "projects/", "/var/log", "~/Desktop/old",
+        "C:\\Users\\me\\Downloads", "reports/2024", "./build",
+    ]),
+    "command": lambda rng: rng.choice(["ls", "git status", "npm test", "df -h", "make build", "pip list"]),
+    "time": lambda rng: rng.choice([
+        f"{rng.randint(1, 12)}am", f"{rng.randint(1, 12)}pm", f"{rng.randint(1, 12)}:{rng.choice(['00', '15', '30', '45'])} pm",
+        f"{rng.randint(0, 23):02d}:{rng.choice(['00', '30'])}",
+    ]),
+    "date": lambda rng: rng.choice([
+        f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/2026",
+    ]),
+    "relative_time": lambda rng: rng.choice(["tomorrow", "today", "tonight", "later", "next week", "next month"]),
+    "file_path": lambda rng: f"{rng.choice(FILE_STEMS)}.{rng.choice(FILE_EXTENSIONS)}",
+    "script_name": lambda rng: f"{rng.choice(SCRIPT_STEMS)}.{rng.choice(['py', 'sh'])}",
+}
+QUOTED_SLOTS = {"file_path", "directory_path", "script_name", "command"}
+
+
+def tagged_messages(count: int, seed: int = 0) -> List[Tuple[str, List[Tuple[str, int, int]]]]:
+    """``count`` messages from ENTITY_TEMPLATES with the (entity, start, end) of each slot."""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        template = rng.choice(ENTITY_TEMPLATES)
+        text, spans = "", []
+        for literal, slot, _, _ in string.Formatter().parse(template):
+            text += literal
+            if slot is None:
+                continue
+            
+            value = ENTITY_SLOTS[slot](rng)
+            if slot in QUOTED_SLOTS and rng.random() < 0.3:
+                quote = rng.choice("'\"")
+                text += quote
+                spans.append((slot, len(text), len(text) + len(value)))
+                text += value + quote
+            else:
+                spans.append((slot, len(text), len(text) + len(value)))
+                text += value
+        
+        if rng.random() < 0.3:
+            text = text[0].upper() + text[1:]
+        if rng.random() < 0.2:
+            text += rng.choice(["?", ".", " please", " now", "!"])
+        messages.append((text, spans))
+    return messages
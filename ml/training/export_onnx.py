@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+from pathlib import Path
+
+import tensorflow as tf
+
+from ml.intent.model import IntentClassifier
+
+
+def export_onnx(model: tf.keras.Model, output_path: Path) -> Path:
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    model.export(
+        str(output_path),
+        format="onnx",
+        input_signature=[tf.TensorSpec([None, None], tf.int32, name="input_ids")],
+        verbose=False,
+    )
+    return output_path
+
+
+def export_saved_model(model_path: Path, output_path: Path = None) -> Path:
+    model_path = Path(model_path)
+    model = tf.keras.models.load_model(
+        model_path,
+        custom_objects={"IntentClassifier": IntentClassifier},
+    )
+    return export_onnx(model, output_path or model_path.with_suffix(".onnx"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a trained intent classifier to ONNX")
+    parser.add_argument("--model", default="models/saved_models/intent_classifier.keras")
+    parser.add_argument("--output", help="Defaults to the model path with an .onnx suffix")
+    args = parser.parse_args()
+    
+    path = export_saved_model(args.model, args.output)
+    print(f"ONNX model saved to {path}")
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+from pathlib import Path
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+
+def int8_path(onnx_path: Path) -> Path:
+    onnx_path = Path(onnx_path)
+    return onnx_path.with_name(f"{onnx_path.stem}.int8{onnx_path.suffix}")
+
+
+def quantize_onnx(onnx_path: Path, output_path: Path = None) -> Path:
+    """Write a post-training int8 copy of an exported intent model.
+    
+    Weights of the matrix multiplications are stored as int8 and activations
+    are quantized per batch at run time, so no calibration data is needed.
+    """
+    onnx_path = Path(onnx_path)
+    output_path = Path(output_path or int8_path(onnx_path))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QInt8)
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize an exported intent classifier to int8")
+    parser.add_argument("--model", default="models/saved_models/intent_classifier.onnx")
+    parser.add_argument("--output", help="Defaults to the model path with an .int8.onnx suffix")
+    args = parser.parse_args()
+    
+    path = quantize_onnx(args.model, args.output)
+    print(f"Int8 model saved to {path}")
@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import random
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import get_settings
+from ml.inference.embedding_backend import EmbeddingIntentModel
+from ml.training.data_generator import CORRECTIONS_PATH, training_examples
+
+
+settings = get_settings()
+
+
+def train_embedding_intents(
+    corrections_path: Path = CORRECTIONS_PATH,
+    output_path: Path = None,
+    validation_split: float = 0.2,
+    seed: int = 0,
+) -> EmbeddingIntentModel:
+    from sentence_transformers import SentenceTransformer
+    
+    texts, labels = training_examples(corrections_path)
+    print(f"Training examples: {len(texts)}")
+    
+    embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
+    vectors = embedding_model.encode(texts)
+    
+    order = list(range(len(texts)))
+    random.Random(seed).shuffle(order)
+    split = int(len(order) * (1 - validation_split))
+    train, val = order[:split], order[split:]
+    
+    embed = embedding_model.encode
+    holdout = EmbeddingIntentModel.fit_vectors(vectors[train], [labels[i] for i in train], embed)
+    predicted = holdout.predict_vectors(vectors[val]).argmax(axis=1)
+    accuracy = np.mean([holdout.intents[p] == labels[i] for p, i in zip(predicted, val)])
+    print(f"Validation accuracy: {accuracy:.4f}")
+    
+    model = EmbeddingIntentModel.fit_vectors(
+        vectors, labels, embed, embedding_model=settings.EMBEDDING_MODEL
+    )
+    
+    output_path = Path(output_path or settings.INTENT_CENTROIDS_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    model.save(output_path)
+    print(f"Intent centroids saved to {output_path}")
+    
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build intent centroids over the vector store's sentence embeddings")
+    parser.add_argument("--corrections", default=str(CORRECTIONS_PATH),
+                        help="Feedback corrections (JSONL with text and intent) to add to the generated samples")
+    parser.add_argument("--output", help="Defaults to INTENT_CENTROIDS_PATH")
+    args = parser.parse_args()
+    
+    train_embedding_intents(Path(args.corrections), args.output)
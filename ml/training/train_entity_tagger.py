@@ -0,0 +1,123 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+from app.core.config import get_settings
+from ml.entity.model import EntityExtractor
+from ml.inference.entity_tagger import (
+    OOV_ID,
+    TAGS,
+    EntityTagger,
+    tag_spans,
+    token_key,
+    tokenize,
+    transition_scores,
+)
+from ml.training.data_generator import tagged_messages
+
+
+settings = get_settings()
+
+
+def token_tags(text: str, spans: Sequence[Tuple[str, int, int]]) -> Tuple[List[str], List[int]]:
+    """Tokens of ``text`` and the index in TAGS of each token's BIO tag."""
+    tokens, tags = [], []
+    for token, start, end in tokenize(text):
+        tag = "O"
+        for entity, span_start, span_end in spans:
+            if span_start <= start and end <= span_end:
+                tag = f"{'B' if start == span_start else 'I'}-{entity}"
+                break
+        tokens.append(token)
+        tags.append(TAGS.index(tag))
+    return tokens, tags
+
+
+def span_f1(tagger: EntityTagger, token_lists, tag_lists) -> float:
+    predicted = tagger.decode(token_lists)
+    expected = [[TAGS[index] for index in tags] for tags in tag_lists]
+    
+    true_positives = found = wanted = 0
+    for predicted_tags, expected_tags in zip(predicted, expected):
+        predicted_spans = set(tag_spans(predicted_tags))
+        expected_spans = set(tag_spans(expected_tags))
+        true_positives += len(predicted_spans & expected_spans)
+        found += len(predicted_spans)
+        wanted += len(expected_spans)
+    
+    precision = true_positives / found if found else 0.0
+    recall = true_positives / wanted if wanted else 0.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def train_entity_tagger(
+    samples: int = 6000,
+    output_path: Path = None,
+    epochs: int = 10,
+    word_dropout: float = 0.05,
+    seed: int = 0,
+) -> EntityTagger:
+    token_lists, tag_lists = zip(*(token_tags(text, spans) for text, spans in tagged_messages(samples, seed)))
+    split = int(0.8 * len(token_lists))
+    
+    counts = Counter(token_key(token) for tokens in token_lists[:split] for token in tokens)
+    words = [word for word, _ in counts.most_common()]
+    transitions, start = transition_scores(tag_lists[:split])
+    
+    tagger = EntityTagger(None, words, TAGS, transitions, start)
+    ids, lengths = tagger.encode(token_lists)
+    labels = np.zeros(ids.shape, dtype=np.int32)
+    for row, tags in enumerate(tag_lists):
+        labels[row, :lengths[row]] = tags
+    weights = (ids != 0).astype(np.float32)
+    
+    # Replacing a few known words with OOV teaches the tagger to lean on the
+    # context around words it has never seen.
+    rng = np.random.default_rng(seed)
+    train_ids = ids[:split].copy()
+    train_ids[(train_ids > OOV_ID) & (rng.random(train_ids.shape) < word_dropout)] = OOV_ID
+    
+    print(f"Vocabulary size: {len(words) + 2}")
+    print(f"Training messages: {split}, validation messages: {len(ids) - split}")
+    
+    model = EntityExtractor(vocab_size=len(words) + 2, num_entity_types=len(TAGS))
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=0.002),
+        loss=keras.losses.SparseCategoricalCrossentropy(from_logits=True),
+    )
+    model.fit(
+        train_ids, labels[:split],
+        sample_weight=weights[:split],
+        validation_data=(ids[split:], labels[split:], weights[split:]),
+        epochs=epochs,
+        batch_size=32,
+        verbose=1,
+    )
+    tagger.model = lambda ids: model(ids, training=False)
+    print(f"Validation span F1: {span_f1(tagger, token_lists[split:], tag_lists[split:]):.4f}")
+    
+    output_path = Path(output_path or settings.ENTITY_MODEL_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    model.save(output_path)
+    EntityTagger.save_tags(output_path.parent / "entity_tags.json", words, transitions, start)
+    print(f"Entity tagger saved to {output_path}")
+    
+    return tagger
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the BiLSTM entity tagger on generated messages")
+    parser.add_argument("--samples", type=int, default=6000)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--output", help="Defaults to ENTITY_MODEL_PATH")
+    args = parser.parse_args()
+    
+    train_entity_tagger(args.samples, args.output, args.epochs)
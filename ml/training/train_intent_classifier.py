@@ -10,16 +10,18 @@ import json
 
 from ml.intent.model import IntentClassifier
 from ml.training.data_generator import IntentDataGenerator
+from ml.training.export_onnx import export_onnx
+from ml.training.quantize import quantize_onnx
 
 
 def create_training_data():
     data_gen = IntentDataGenerator()
-    return data_gen.generate()
+    return data_gen.generate(), data_gen.tokenizer
 
 
 def train_model():
     print("Generating training data...")
-    train_data, val_data, vocab_size, intent_map = create_training_data()
+    (train_data, val_data, vocab_size, intent_map), tokenizer = create_training_data()
     
     X_train, y_train = train_data
     X_val, y_val = val_data
@@ -33,6 +35,7 @@ def train_model():
         embedding_dim=128,
         num_intents=len(intent_map),
         max_length=50,
+        mask_padding=True,
     )
     
     model.compile(
@@ -69,9 +72,23 @@ def train_model():
     
     model.save(models_dir / "intent_classifier.keras")
     
+    try:
+        onnx_path = export_onnx(model, models_dir / "intent_classifier.onnx")
+        print(f"ONNX model exported to {onnx_path}")
+    except Exception as e:
+        print(f"Skipping ONNX export ({e}); install tf2onnx to serve with INTENT_BACKEND=onnx")
+    else:
+        try:
+            int8_onnx_path = quantize_onnx(onnx_path)
+            print(f"Int8 model exported to {int8_onnx_path}")
+        except Exception as e:
+            print(f"Skipping int8 quantization ({e})")
+    
     with open(models_dir / "intent_map.json", "w") as f:
         json.dump(intent_map, f, indent=2)
     
+    tokenizer.save(models_dir / "intent_vocab.json")
+    
     print(f"Model saved to {models_dir}")
     print(f"Final validation accuracy: {history.history['val_accuracy'][-1]:.4f}")
     
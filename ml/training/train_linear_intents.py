@@ -0,0 +1,105 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from app.core.config import get_settings
+from ml.inference.linear_backend import LinearIntentModel
+from ml.training.data_generator import CORRECTIONS_PATH, training_examples
+
+
+settings = get_settings()
+
+TEACHER_BACKENDS = ("keras", "onnx")
+
+
+def teacher_labels(texts: List[str], backend: str = "keras") -> List[str]:
+    """Intents the trained neural model served by ``backend`` assigns to ``texts``."""
+    from ml.inference.intent_predictor import IntentPredictor
+    
+    if backend not in TEACHER_BACKENDS:
+        raise SystemExit(f"The teacher must be one of {TEACHER_BACKENDS}, not {backend}")
+    
+    # Pinned rather than read from INTENT_BACKEND, which may be "linear" and
+    # would make the model distill from itself.
+    configured = settings.INTENT_BACKEND
+    settings.INTENT_BACKEND = backend
+    try:
+        predictor = IntentPredictor()
+    finally:
+        settings.INTENT_BACKEND = configured
+    
+    if predictor.model is None:
+        raise SystemExit("No trained intent model to distill; run train_intent_classifier.py first")
+    
+    labels = []
+    for i in range(0, len(texts), 256):
+        labels.extend(result["intent"].value for result in predictor._model_predict_batch(texts[i:i + 256]))
+    return labels
+
+
+def train_linear_intents(
+    corrections_path: Path = CORRECTIONS_PATH,
+    output_path: Path = None,
+    distill: bool = False,
+    teacher: str = "keras",
+    unlabelled_path: Optional[Path] = None,
+    validation_split: float = 0.2,
+    seed: int = 0,
+) -> LinearIntentModel:
+    texts, labels = training_examples(corrections_path)
+    
+    if distill:
+        # The teacher relabels the generated samples and can also label raw
+        # traffic, which is where distillation adds examples.
+        if unlabelled_path:
+            with open(unlabelled_path, "r") as f:
+                texts.extend(line.strip() for line in f if line.strip())
+        labels = teacher_labels(texts, teacher)
+    print(f"Training examples: {len(texts)}{' (teacher labels)' if distill else ''}")
+    
+    # Stratifying needs two examples of every intent; one that only comes
+    # from a single feedback correction would make train_test_split raise.
+    counts = Counter(labels)
+    stratify = labels if min(counts.values()) >= 2 else None
+    if stratify is None:
+        rare = sorted(intent for intent, count in counts.items() if count < 2)
+        print(f"Not stratifying the validation split: single example for {', '.join(rare)}")
+    
+    train_texts, val_texts, train_labels, val_labels = train_test_split(
+        texts, labels, test_size=validation_split, random_state=seed, stratify=stratify,
+    )
+    holdout = LinearIntentModel.fit(train_texts, train_labels)
+    predicted = [holdout.intents[i] for i in holdout.predict(val_texts).argmax(axis=1)]
+    print(f"Validation accuracy: {np.mean([p == l for p, l in zip(predicted, val_labels)]):.4f}")
+    
+    model = LinearIntentModel.fit(texts, labels)
+    
+    output_path = Path(output_path or settings.INTENT_LINEAR_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    model.save(output_path)
+    print(f"Linear intent model ({len(model.columns)} hashed features) saved to {output_path}")
+    
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the hashed n-gram linear intent model")
+    parser.add_argument("--corrections", default=str(CORRECTIONS_PATH),
+                        help="Feedback corrections (JSONL with text and intent) to add to the generated samples")
+    parser.add_argument("--distill", action="store_true",
+                        help="Label the examples with the trained neural model instead of their own labels")
+    parser.add_argument("--teacher", choices=TEACHER_BACKENDS, default="keras",
+                        help="With --distill, the backend that serves the neural model")
+    parser.add_argument("--unlabelled", help="With --distill, a file of extra messages (one per line) to label and train on")
+    parser.add_argument("--output", help="Defaults to INTENT_LINEAR_PATH")
+    args = parser.parse_args()
+    
+    train_linear_intents(Path(args.corrections), args.output, args.distill, args.teacher, args.unlabelled)
@@ -0,0 +1,313 @@
+"""Implementations as they were before the optimizations that replaced them,
+and the synthetic messages they are compared on.
+
+The parity tests check the current code against these, and the benchmarks
+time them for the speedup they report.
+"""
+import random
+import re
+from typing import Any, Dict, List
+
+from app.models.schemas import IntentType
+from ml.inference.entity_extractor import EntityExtractorModel
+from ml.inference.fallback_rules import PATTERNS
+from ml.training.data_generator import IntentDataGenerator
+
+
+# IntentPredictor's keyword fallback before the rules were compiled.
+def legacy_fallback_predict(text: str) -> dict:
+    text_lower = text.lower()
+    
+    scores = {intent: 0.0 for intent in IntentType}
+    
+    for intent, patterns in PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, text_lower):
+                scores[intent] += 0.3
+    
+    action_verbs = {
+        IntentType.FILE_OPERATION: [
+            'create', 'make', 'new', 'add', 'build', 'generate',
+            'open', 'display', 'view', 'read',
+            'delete', 'remove', 'erase', 'clear', 'trash',
+            'move', 'transfer', 'relocate', 'shift',
+            'copy', 'duplicate', 'clone',
+            'write', 'save', 'store', 'put',
+            'rename', 'change', 'modify', 'update',
+        ],
+        IntentType.SCHEDULE_REMINDER: [
+            'remind', 'reminder', 'remember', 'notify', 'alert',
+            'schedule', 'plan', 'set', 'arrange',
+            'alarm', 'wake', 'ping', 'tell',
+        ],
+        IntentType.RUN_SCRIPT: [
+            'run', 'execute', 'start', 'launch', 'fire',
+            'perform', 'do', 'activate', 'trigger',
+            'call', 'invoke', 'process',
+        ],
+        IntentType.SEARCH: [
+            'search', 'find', 'look', 'locate', 'discover',
+            'where', 'query', 'seek', 'hunt', 'browse', 'show',
+        ],
+        IntentType.SYSTEM_INFO: [
+            'time', 'date', 'clock', 'calendar',
+            'system', 'computer', 'machine', 'status',
+            'info', 'information', 'details', 'stats',
+        ],
+        IntentType.EXCEL_OPERATION: [
+            'excel', 'spreadsheet', 'csv', 'xlsx', 'xls',
+            'duplicate', 'duplicates', 'remove', 'delete',
+            'sort', 'organize', 'arrange', 'alphabetical',
+            'clean', 'data', 'rows', 'cells', 'empty',
+        ],
+    }
+    
+    search_phrases = ['find', 'look for', 'search for', 'where is', 'locate', 'show me']
+    for phrase in search_phrases:
+        if phrase in text_lower:
+            scores[IntentType.SEARCH] += 0.6
+    
+    file_related = ['file', 'folder', 'directory', 'doc', 'document', 'text', 'data', 'path']
+    
+    for intent, verbs in action_verbs.items():
+        for verb in verbs:
+            if f' {verb} ' in f' {text_lower} ' or text_lower.startswith(verb):
+                scores[intent] += 0.4
+                
+                if intent == IntentType.FILE_OPERATION:
+                    if any(f in text_lower for f in file_related):
+                        scores[intent] += 0.3
+    
+    if any(word in text_lower for word in ['folder', 'directory']):
+        if not any(search_word in text_lower for search_word in ['find', 'search', 'where', 'locate', 'look']):
+            scores[IntentType.FILE_OPERATION] += 0.5
+    
+    if any(word in text_lower for word in ['tomorrow', 'later', 'at', 'pm', 'am', 'o\'clock']):
+        scores[IntentType.SCHEDULE_REMINDER] += 0.3
+    
+    if '.py' in text_lower or '.sh' in text_lower or 'script' in text_lower:
+        scores[IntentType.RUN_SCRIPT] += 0.4
+    
+    greeting_words = ['hello', 'hi', 'hey', 'greetings', 'sup', 'yo']
+    if any(text_lower.startswith(g) for g in greeting_words):
+        scores[IntentType.CHAT] += 0.8
+    
+    if max(scores.values()) > 0:
+        predicted_intent = max(scores, key=scores.get)
+        confidence = min(scores[predicted_intent], 0.95)
+    else:
+        predicted_intent = IntentType.CHAT
+        confidence = 0.6
+    
+    return {
+        "intent": predicted_intent,
+        "confidence": confidence,
+    }
+
+
+# EntityExtractorModel before its patterns were compiled.
+class LegacyEntityExtractor(EntityExtractorModel):
+    def __init__(self):
+        self.entity_patterns = {
+            "file_path": r'["\']([^"\']+\.[a-zA-Z0-9]+)["\']|(?:file|path):\s*([^\s]+)',
+            "directory_path": r'["\']([^"\']+/)["\']|(?:directory|folder):\s*([^\s]+)',
+            "time": r'\b(\d{1,2}:\d{2}(?:\s*[AP]M)?)\b',
+            "date": r'\b(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})\b',
+            "relative_time": r'\b(tomorrow|today|tonight|later|next week|next month)\b',
+            "script_name": r'["\']([^"\']+\.py)["\']|\b(\w+\.py)\b',
+            "command": r'(?:run|execute)\s+["\']([^"\']+)["\']',
+            "number": r'\b(\d+)\b',
+            "month_date": r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2}),?\s+(\d{4})\b',
+        }
+    
+    def _extract(self, text: str) -> Dict[str, Any]:
+        entities = {}
+        
+        for entity_type, pattern in self.entity_patterns.items():
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            if matches:
+                if isinstance(matches[0], tuple):
+                    values = [m for match in matches for m in match if m]
+                else:
+                    values = matches
+                
+                if values:
+                    entities[entity_type] = values[0] if len(values) == 1 else values
+        
+        extracted_time = self._extract_time_from_message(text)
+        if extracted_time:
+            entities["extracted_time"] = extracted_time
+        
+        extracted_date = self._extract_date_from_message(text)
+        if extracted_date:
+            entities["extracted_date"] = extracted_date
+        
+        if "relative_time" in entities:
+            self.resolve_relative_time(entities)
+        elif "date" in entities and "time" in entities:
+            entities["scheduled_datetime"] = f"{entities['date']} {entities['time']}"
+        elif "date" in entities and extracted_time:
+            entities["scheduled_datetime"] = f"{entities['date']} {extracted_time}"
+        elif extracted_date and extracted_time:
+            entities["scheduled_datetime"] = f"{extracted_date} {extracted_time}"
+        elif "month_date" in entities:
+            formatted_date = self._format_month_date(entities["month_date"])
+            if extracted_time:
+                entities["scheduled_datetime"] = f"{formatted_date} {extracted_time}"
+            else:
+                entities["scheduled_datetime"] = formatted_date
+        
+        self._extract_file_operations(text, entities)
+        
+        return entities
+    
+    def _extract_time_from_message(self, message: str) -> str:
+        import re
+        
+        time_patterns = [
+            r'(\d{1,2}):(\d{2})\s*(am|pm)',
+            r'(\d{1,2})\s*(am|pm)',
+            r'at\s+(\d{1,2}):(\d{2})',
+            r'at\s+(\d{1,2})',
+        ]
+        
+        message_lower = message.lower()
+        
+        for pattern in time_patterns:
+            match = re.search(pattern, message_lower)
+            if match:
+                groups = match.groups()
+                if len(groups) >= 2:
+                    hour = int(groups[0])
+                    
+                    if groups[1] in ['am', 'pm']:
+                        minute = 0
+                        ampm = groups[1]
+                    else:
+                        minute = int(groups[1]) if groups[1].isdigit() else 0
+                        ampm = groups[2] if len(groups) > 2 and groups[2] in ['am', 'pm'] else None
+                    
+                    if ampm:
+                        if ampm == 'pm' and hour != 12:
+                            hour += 12
+                        elif ampm == 'am' and hour == 12:
+                            hour = 0
+                    
+                    return f"{hour:02d}:{minute:02d}:00"
+        
+        return None
+    
+    def _extract_date_from_message(self, message: str) -> str:
+        import re
+        from datetime import datetime
+        
+        month_names = {
+            'january': 1, 'february': 2, 'march': 3, 'april': 4,
+            'may': 5, 'june': 6, 'july': 7, 'august': 8,
+            'september': 9, 'october': 10, 'november': 11, 'december': 12
+        }
+        
+        message_lower = message.lower()
+        
+        pattern = r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2}),?\s+(\d{4})\b'
+        match = re.search(pattern, message_lower)
+        
+        if match:
+            month_name, day, year = match.groups()
+            month_num = month_names[month_name]
+            
+            try:
+                dt = datetime(int(year), month_num, int(day))
+                return dt.strftime('%m/%d/%Y')
+            except ValueError:
+                return None
+        
+        return None
+    
+    def _format_month_date(self, month_date_tuple) -> str:
+        from datetime import datetime
+        
+        month_names = {
+            'january': 1, 'february': 2, 'march': 3, 'april': 4,
+            'may': 5, 'june': 6, 'july': 7, 'august': 8,
+            'september': 9, 'october': 10, 'november': 11, 'december': 12
+        }
+        
+        if isinstance(month_date_tuple, tuple) and len(month_date_tuple) >= 3:
+            month_name, day, year = month_date_tuple[:3]
+            month_num = month_names.get(month_name.lower(), 1)
+            
+            try:
+                dt = datetime(int(year), month_num, int(day))
+                return dt.strftime('%m/%d/%Y')
+            except ValueError:
+                return None
+        
+        return None
+    
+    def _extract_file_operations(self, text: str, entities: Dict[str, Any]):
+        operations_map = {
+            'create': ['create', 'make', 'new', 'add', 'build', 'generate'],
+            'open': ['open', 'show', 'display', 'view'],
+            'read': ['read', 'see', 'check', 'look at'],
+            'delete': ['delete', 'remove', 'erase', 'trash', 'clear'],
+            'move': ['move', 'transfer', 'relocate', 'shift'],
+            'copy': ['copy', 'duplicate', 'clone'],
+            'write': ['write', 'save', 'store', 'put'],
+            'rename': ['rename', 'change name'],
+        }
+        
+        text_lower = text.lower()
+        
+        for base_op, variations in operations_map.items():
+            for variation in variations:
+                if variation in text_lower:
+                    entities["operation"] = base_op
+                    return
+        
+        if 'folder' in text_lower or 'directory' in text_lower:
+            if 'create' not in entities and any(word in text_lower for word in ['make', 'new', 'create', 'build']):
+                entities["operation"] = 'create'
+
+
+FILLERS = [
+    "please", "can you", "hey", "i need to", "quickly", "for me", "thanks", "now",
+    "the", "my", "report", "project", "meeting", "notes", "and then", "again",
+]
+ENTITIES = [
+    "'notes.txt'", '"report.pdf"', "file: data.csv", "path:/tmp/out.log", "'projects/'",
+    "folder: archive", "directory:/var/log", "backup.py", "'deploy script.py'", "Run 'ls -la'",
+    "execute \"make build\"", "at 5", "at 10:30", "3pm", "11:45 AM", "12am", "7 pm",
+    "2025-03-14", "3/14/2025", "14-3-2025", "January 5, 2025", "february 30 2024",
+    "December 25 2025", "tomorrow", "Today", "tonight", "later", "next week", "next month",
+    "42", "in 2 hours", "create", "make a new", "show", "look at", "erase", "relocate",
+    "clone", "store", "change name", "folder", "directory", "new folder",
+]
+
+
+def synthetic_messages(count: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    samples = IntentDataGenerator().training_samples
+    plain = [message for group in samples.values() for message in group]
+    
+    messages = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            messages.append(rng.choice(plain))
+            continue
+        
+        parts = rng.choices(FILLERS, k=rng.randint(0, 4)) + rng.choices(ENTITIES, k=rng.randint(1, 3))
+        rng.shuffle(parts)
+        message = " ".join(parts)
+        if rng.random() < 0.2:
+            message = message.upper() if rng.random() < 0.5 else message.title()
+        messages.append(message)
+    return messages
+
+
+def comparable_entities(entities: Dict[str, Any]) -> Dict[str, Any]:
+    # Relative times resolve against the clock, so compare which one was found.
+    if "relative_time" in entities:
+        entities = dict(entities)
+        entities.pop("scheduled_datetime", None)
+    return entities
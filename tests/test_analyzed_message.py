@@ -0,0 +1,77 @@
+import pytest
+from app.models.analyzed_message import AnalyzedMessage
+from app.services.chat_service import ChatService
+from automation.handlers.command_handler import CommandHandler
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+
+
+def test_views_match_the_string_operations_they_replace():
+    text = "Open  'Q3 Report.xlsx'\tfrom the Desktop, please"
+    message = AnalyzedMessage(text)
+    
+    assert message.lower == text.lower()
+    assert message.tokens == text.split()
+    assert message.lower_tokens == text.lower().split()
+    assert [text[start:end] for start, end in message.token_offsets] == text.split()
+    assert message.quoted == ["Q3 Report.xlsx"]
+    assert AnalyzedMessage.of(message) is message
+    assert AnalyzedMessage.of(text).text == text
+
+
+def test_views_are_computed_once():
+    message = AnalyzedMessage("Find notes")
+    assert message.lower is message.lower
+    assert message.lower_tokens is message.lower_tokens
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("find the file named Budget.xlsx", "budget.xlsx"),
+    ("search for 'Tax Return'", "Tax Return"),
+    ("where is my presentation?", "presentation"),
+    ("find it", None),
+])
+def test_search_term(text, expected):
+    assert CommandHandler()._extract_search_term(text) == expected
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+    
+    async def handle(self, intent, message, context, history):
+        self.messages.append(message)
+        return "ok", None
+
+
+class Predictor:
+    def __init__(self):
+        self.messages = []
+    
+    async def predict(self, text):
+        self.messages.append(text)
+        return {"intent": "chat", "confidence": 0.9}
+
+
+class VectorStore:
+    async def add_interaction(self, **kwargs):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_chat_service_shares_one_analysis_across_stages():
+    predictor = Predictor()
+    handler = RecordingHandler()
+    service = ChatService(
+        intent_predictor=predictor,
+        entity_extractor=EntityExtractorModel(),
+        conversation_manager=ConversationManager(),
+        vector_store=VectorStore(),
+        command_handler=handler,
+    )
+    
+    await service.process_message("Open 'notes.txt'", "session")
+    
+    message = handler.messages[0]
+    assert isinstance(message, AnalyzedMessage)
+    assert predictor.messages == [message]
@@ -31,3 +31,16 @@ def test_chat_endpoint(client):
     assert "intent" in data
     assert "session_id" in data
 
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE chat_stage_duration_seconds histogram" in response.text
+
+
+def test_ready_endpoint_before_warmup(client):
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
@@ -0,0 +1,97 @@
+import pytest
+from app.models.schemas import ChatRequest
+from app.services.chat_service import ChatService, chat_stage_duration
+from ml.inference.intent_predictor import IntentPredictor
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+from memory.vector_store.ingest_queue import InteractionIngestQueue
+
+
+class RecordingVectorStore:
+    def __init__(self):
+        self.calls = []
+    
+    async def add_interaction(self, **kwargs):
+        self.calls.append([kwargs])
+    
+    async def add_interactions(self, interactions):
+        self.calls.append(interactions)
+
+
+MESSAGES = [
+    "open file 'document.txt'",
+    "run script.py",
+    "delete the old files",
+    "remove duplicates from 'sales.xlsx'",
+    "create folder named project",
+]
+
+
+def _build_service(predictor, extractor):
+    return ChatService(
+        intent_predictor=predictor,
+        entity_extractor=extractor,
+        conversation_manager=ConversationManager(),
+        vector_store=RecordingVectorStore(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_message_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = IntentPredictor()
+    extractor = EntityExtractorModel()
+    
+    single_service = _build_service(predictor, extractor)
+    single = [
+        await single_service.process_message(message, "session-1")
+        for message in MESSAGES
+    ]
+    
+    batch_service = _build_service(predictor, extractor)
+    batch = await batch_service.process_batch([
+        ChatRequest(message=message, session_id="session-1") for message in MESSAGES
+    ])
+    
+    assert len(batch) == len(single)
+    for expected, actual in zip(single, batch):
+        assert actual.intent == expected.intent
+        assert actual.response == expected.response
+    
+    assert len(batch_service.vector_store.calls) == 1
+    assert len(batch_service.vector_store.calls[0]) == len(MESSAGES)
+
+
+class CountingBatchPredictor:
+    def __init__(self):
+        self.batches = []
+    
+    async def predict_batch(self, messages):
+        self.batches.append([str(message) for message in messages])
+        return [{"intent": "chat", "confidence": 0.9} for _ in messages]
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_caches_and_ingest_queue():
+    predictor = CountingBatchPredictor()
+    vector_store = RecordingVectorStore()
+    queue = InteractionIngestQueue(vector_store, batch_size=4, flush_interval=0.01)
+    service = ChatService(
+        intent_predictor=predictor,
+        entity_extractor=EntityExtractorModel(),
+        conversation_manager=ConversationManager(),
+        vector_store=vector_store,
+        ingest_queue=queue,
+    )
+    await queue.start()
+    
+    await service.process_batch([ChatRequest(message="hello", session_id="s")])
+    await service.process_batch([
+        ChatRequest(message="hello", session_id="s"),
+        ChatRequest(message="how are you", session_id="s"),
+    ])
+    await queue.close()
+    
+    assert predictor.batches == [["hello"], ["how are you"]]
+    assert queue.submitted == 3
+    assert chat_stage_duration.count(stage="intent_prediction", intent="chat") > 0
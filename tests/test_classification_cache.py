@@ -0,0 +1,64 @@
+import pytest
+from app.core.cache import TTLCache
+from app.services.chat_service import ChatService
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingIntentPredictor:
+    def __init__(self):
+        self.calls = 0
+    
+    async def predict(self, text: str) -> dict:
+        self.calls += 1
+        return {"intent": "schedule_reminder", "confidence": 0.9}
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    clock = FakeClock()
+    cache = TTLCache("test", max_size=2, ttl=10, clock=clock)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_entities_recompute_relative_time():
+    predictor = CountingIntentPredictor()
+    extractor = EntityExtractorModel()
+    service = ChatService(
+        intent_predictor=predictor,
+        entity_extractor=extractor,
+        conversation_manager=ConversationManager(),
+        vector_store=None,
+    )
+    
+    stamps = iter(["2030-01-01T09:00:00", "2030-01-01T09:00:00", "2030-01-02T09:00:00"])
+    extractor._parse_relative_time = lambda relative_time: next(stamps)
+    
+    first = await service._classify_intent("Remind me tomorrow")
+    second = await service._classify_intent("remind me tomorrow")
+    third = await service._classify_intent("Remind me tomorrow")
+    
+    assert predictor.calls == 1
+    assert service.entity_cache.stats()["hits"] == 1
+    assert first.entities["scheduled_datetime"] == "2030-01-01T09:00:00"
+    assert third.entities["scheduled_datetime"] == "2030-01-02T09:00:00"
+    assert second.type == third.type
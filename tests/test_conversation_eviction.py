@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from app.models.schemas import Message, MessageRole
+from memory.conversation.manager import ConversationManager, SESSION_BYTES, MESSAGE_BYTES
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def _message(text):
+    return Message(role=MessageRole.USER, content=text)
+
+
+@pytest.mark.asyncio
+async def test_budget_spills_least_recently_updated_sessions(tmp_path):
+    per_session = SESSION_BYTES + MESSAGE_BYTES + len("hello")
+    manager = ConversationManager(memory_budget=3 * per_session + MESSAGE_BYTES + len("hello"), idle_ttl=0, spill_dir=tmp_path)
+    
+    for session_id in ["a", "b", "c", "a", "d"]:
+        manager.add_message(session_id, _message("hello"))
+    await manager.evict()
+    
+    assert list(manager.metadata) == ["c", "a", "d"]
+    assert list(manager.spilled) == ["b"]
+    assert manager.memory_bytes <= manager.memory_budget
+    assert manager.stats()["evictions"] == {"idle": 0, "budget": 1}
+    assert len(list(tmp_path.glob("*.json.gz"))) == 1
+    
+    # Spilled sessions stay in the recency listings.
+    assert manager.recent_session_ids(10) == ["d", "a", "c", "b"]
+    summary = manager.get_recent_summaries(10)[-1]
+    assert (summary.session_id, summary.message_count, summary.last_message.content) == ("b", 1, "hello")
+    assert [c.session_id for c in await manager.get_recent_conversations(10)] == ["d", "a", "c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_spill_and_reload_transparently(tmp_path):
+    clock = Clock()
+    manager = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=tmp_path, clock=clock)
+    
+    manager.add_message("old", _message("open the Budget file"))
+    manager.get_context("old").observe("open the Budget file")
+    created_at = (await manager.get_conversation("old")).created_at
+    clock.now = 61
+    manager.add_message("new", _message("hi"))
+    await manager.evict()
+    
+    assert "old" in manager.spilled
+    assert "old" not in manager.conversations
+    
+    # Reads come from disk without making the session resident again.
+    conversation = await manager.get_conversation("old")
+    assert [m.content for m in conversation.messages] == ["open the Budget file"]
+    assert conversation.created_at == created_at
+    assert "old" in manager.spilled
+    assert manager.stats()["reloads"] == 0
+    
+    await manager.restore("old")
+    manager.add_message("old", _message("move it"))
+    assert "old" not in manager.spilled
+    assert [m.content for m in manager.get_recent_messages("old")] == ["open the Budget file", "move it"]
+    assert manager.metadata["old"]["message_count"] == 2
+    assert manager.get_context("old").last_file == "Budget"
+    assert manager.stats()["reloads"] == 1
+    assert list(tmp_path.glob("*.json.gz")) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_spill_keeps_the_session(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    clock = Clock()
+    manager = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=blocker / "spill", clock=clock)
+    
+    manager.add_message("s", _message("keep me"))
+    clock.now = 61
+    await manager.evict()
+    
+    assert [m.content for m in manager.get_recent_messages("s")] == ["keep me"]
+    assert manager.spilled == {}
+    assert manager.stats()["spill_failures"] == 1
+    assert manager.stats()["evictions"]["idle"] == 0
+
+
+@pytest.mark.asyncio
+async def test_background_eviction_runs_when_over_budget(tmp_path):
+    manager = ConversationManager(memory_budget=1, idle_ttl=0, spill_dir=tmp_path, eviction_interval=60)
+    await manager.start()
+    
+    manager.add_message("a", _message("hello"))
+    manager.add_message("b", _message("hello"))
+    for _ in range(100):
+        if manager.spilled:
+            break
+        await asyncio.sleep(0.01)
+    await manager.close()
+    
+    assert list(manager.spilled) == ["a"]
+    assert list(manager.metadata) == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_sessions_are_not_created(tmp_path):
+    manager = ConversationManager(spill_dir=tmp_path)
+    
+    assert await manager.get_conversation("missing") is None
+    assert manager.get_recent_messages("missing") == []
+    assert manager.conversations == {}
+    assert manager.memory_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_unreadable_spill_files_drop_the_session_not_the_request(tmp_path):
+    clock = Clock()
+    manager = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=tmp_path, clock=clock)
+    for session_id in ["missing", "corrupt"]:
+        manager.add_message(session_id, _message("hello"))
+    clock.now = 61
+    await manager.evict()
+    
+    manager._spill_path("missing").unlink()
+    manager._spill_path("corrupt").write_bytes(b"not gzip")
+    
+    assert await manager.get_conversation("missing") is None
+    await manager.restore("corrupt")
+    manager.add_message("corrupt", _message("start over"))
+    
+    assert manager.spilled == {}
+    assert [m.content for m in manager.get_recent_messages("corrupt")] == ["start over"]
+    assert manager.stats()["read_failures"] == 2
+    assert list(tmp_path.glob("*.json.gz")) == []
+
+
+@pytest.mark.asyncio
+async def test_a_session_that_cannot_be_written_does_not_block_eviction(tmp_path):
+    clock = Clock()
+    manager = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=tmp_path, clock=clock)
+    manager.add_message("bad", _message("hello"))
+    manager.add_message("good", _message("hello"))
+    manager.get_context("bad").last_file = object()
+    clock.now = 61
+    await manager.evict()
+    
+    assert list(manager.spilled) == ["good"]
+    assert list(manager.metadata) == ["bad"]
+    assert manager.stats()["spill_failures"] == 1
+    assert manager.stats()["unspillable_sessions"] == 1
+    
+    # A new message makes it a candidate again.
+    manager.add_message("bad", _message("again"))
+    assert manager.unspillable == set()
+
+
+@pytest.mark.asyncio
+async def test_spilled_sessions_are_capped_and_survive_a_restart(tmp_path):
+    clock = Clock()
+    manager = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=tmp_path, max_spilled=2, clock=clock)
+    for session_id in ["a", "b", "c"]:
+        manager.add_message(session_id, _message(f"hello from {session_id}"))
+    clock.now = 61
+    await manager.evict()
+    
+    assert list(manager.spilled) == ["b", "c"]
+    assert manager.stats()["spills_deleted"] == 1
+    assert len(list(tmp_path.glob("*.json.gz"))) == 2
+    
+    (tmp_path / "leftover.json.gz.tmp").write_bytes(b"")
+    (tmp_path / "garbage.json.gz").write_bytes(b"not gzip")
+    restarted = ConversationManager(memory_budget=0, idle_ttl=60, spill_dir=tmp_path, max_spilled=1)
+    await restarted.start()
+    await restarted.close()
+    
+    assert list(restarted.spilled) == ["c"]
+    assert restarted.recent_session_ids(10) == ["c"]
+    assert restarted.get_recent_summaries(1)[0].last_message.content == "hello from c"
+    assert [m.content for m in (await restarted.get_conversation("c")).messages] == ["hello from c"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [restarted._spill_path("c").name]
+
+
+def test_removed_sessions_release_their_memory(tmp_path):
+    manager = ConversationManager(spill_dir=tmp_path)
+    for _ in range(3):
+        manager.add_message("s", _message("x" * 10))
+    assert manager.memory_bytes == SESSION_BYTES + 3 * (MESSAGE_BYTES + 10)
+    
+    manager.remove_session("s")
+    assert manager.memory_bytes == 0
@@ -0,0 +1,95 @@
+import json
+import zlib
+import numpy as np
+import pytest
+from app.models.schemas import IntentType
+from ml.inference import intent_predictor as intent_predictor_module
+from ml.inference.embedding_backend import EmbeddingIntentModel
+from ml.inference.intent_predictor import IntentPredictor
+from ml.training.data_generator import load_corrections, training_examples
+from memory.vector_store.store import VectorStore
+
+
+def bag_of_words(texts):
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[row, zlib.crc32(word.encode()) % 256] += 1
+    return vectors
+
+
+class CountingEmbeddingModel:
+    def __init__(self):
+        self.encoded = []
+    
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return bag_of_words(texts)
+
+
+@pytest.fixture
+def centroids_path(tmp_path):
+    texts, labels = training_examples(tmp_path / "missing.jsonl")
+    path = tmp_path / "intent_centroids.npz"
+    EmbeddingIntentModel.fit(texts, labels, bag_of_words, embedding_model="test-embedder").save(path)
+    return path
+
+
+def test_centroids_round_trip_and_classify(centroids_path):
+    model = EmbeddingIntentModel.load(centroids_path, bag_of_words)
+    
+    assert model.embedding_model == "test-embedder"
+    probabilities = model.predict(["open file report.txt", "remind me tomorrow"])
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, rtol=1e-5)
+    assert [model.intents[i] for i in probabilities.argmax(axis=1)] == [
+        "file_operation", "schedule_reminder",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_predictor_uses_embedding_backend(centroids_path, monkeypatch):
+    settings = intent_predictor_module.settings
+    monkeypatch.setattr(settings, "INTENT_BACKEND", "embedding")
+    monkeypatch.setattr(settings, "INTENT_CENTROIDS_PATH", str(centroids_path))
+    monkeypatch.setattr(settings, "INTENT_BATCH_WINDOW_MS", 0)
+    
+    predictor = IntentPredictor(embedder=bag_of_words)
+    assert isinstance(predictor.model, EmbeddingIntentModel)
+    
+    result = await predictor.predict("run the backup script")
+    assert result["intent"] == IntentType.RUN_SCRIPT
+    
+    assert IntentPredictor().model is None
+
+
+def test_corrections_extend_training_examples(tmp_path):
+    path = tmp_path / "training_corrections.jsonl"
+    with open(path, "w") as f:
+        f.write(json.dumps({"text": "tidy my inbox", "intent": "file_operation"}) + "\n")
+        f.write(json.dumps({"text": "ignored", "intent": "not_an_intent"}) + "\n")
+    
+    assert load_corrections(path) == [("tidy my inbox", "file_operation")]
+    texts, labels = training_examples(path)
+    assert (texts[-1], labels[-1]) == ("tidy my inbox", "file_operation")
+
+
+def test_vector_store_caches_message_embeddings_and_stores_documents():
+    store = VectorStore()
+    store.embedding_model = CountingEmbeddingModel()
+    written = {}
+    store.collection = type("Collection", (), {"add": lambda self, **kwargs: written.update(kwargs)})()
+    
+    intent_vectors = store.encode(["open file a.txt", "hello", "hello"])
+    store._write_batch(
+        ["User: open file a.txt\nAssistant: Opened"],
+        [{"user_message": "open file a.txt"}],
+        ["session_1"],
+    )
+    
+    assert store.embedding_model.encoded == [
+        "open file a.txt", "hello", "User: open file a.txt\nAssistant: Opened",
+    ]
+    np.testing.assert_array_equal(intent_vectors[1], intent_vectors[2])
+    np.testing.assert_array_equal(
+        written["embeddings"], bag_of_words(["User: open file a.txt\nAssistant: Opened"]).tolist()
+    )
@@ -1,5 +1,6 @@
 import pytest
 from ml.inference.entity_extractor import EntityExtractorModel
+from tests.legacy_reference import LegacyEntityExtractor, comparable_entities, synthetic_messages
 
 
 @pytest.fixture
@@ -33,3 +34,23 @@ async def test_operation_extraction(extractor):
     assert "operation" in entities
     assert entities["operation"] == "delete"
 
+
+
+def test_matches_legacy_extractor(extractor):
+    legacy = LegacyEntityExtractor()
+    messages = synthetic_messages(3000) + [
+        "",
+        "HELLO THERE",
+        "Open File 'Report.TXT' and RUN backup.sh",
+        "move C:\\Users\\me\\notes.md to /tmp/archive",
+        "remind me at 9am on december 25",
+        "schedule a call next week at 14:30",
+    ]
+    for message in messages:
+        assert comparable_entities(extractor._extract(message)) == comparable_entities(legacy._extract(message)), message
+
+
+def test_several_relative_times_use_the_first(extractor):
+    entities = extractor._extract("remind me tomorrow or next week")
+    assert entities["relative_time"] == ["tomorrow", "next week"]
+    assert "scheduled_datetime" in entities
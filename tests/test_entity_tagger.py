@@ -0,0 +1,126 @@
+import itertools
+
+import numpy as np
+import pytest
+from ml.inference.entity_extractor import EntityExtractorModel
+from ml.inference.entity_tagger import (
+    TAGS,
+    EntityTagger,
+    allowed_transitions,
+    tag_spans,
+    token_key,
+    tokenize,
+    transition_scores,
+    viterbi_decode,
+)
+from ml.inference.executor import InferenceExecutor
+
+
+def brute_force(emissions, transitions, start):
+    steps, size = emissions.shape
+    best = max(
+        itertools.product(range(size), repeat=steps),
+        key=lambda path: start[path[0]] + emissions[0, path[0]] + sum(
+            transitions[path[t - 1], path[t]] + emissions[t, path[t]] for t in range(1, steps)
+        ),
+    )
+    return list(best)
+
+
+def test_batched_viterbi_matches_exhaustive_search():
+    rng = np.random.default_rng(0)
+    emissions = rng.normal(size=(6, 5, 3))
+    transitions = rng.normal(size=(3, 3))
+    start = rng.normal(size=3)
+    lengths = np.array([5, 1, 3, 4, 2, 5])
+    
+    paths = viterbi_decode(emissions, transitions, start, lengths)
+    
+    for row, length in enumerate(lengths):
+        expected = brute_force(emissions[row, :length], transitions, start)
+        assert paths[row, :length].tolist() == expected
+
+
+def test_transition_scores_forbid_invalid_bio():
+    transitions, start = transition_scores([[0, 1, 2, 0]])
+    allowed, allowed_start = allowed_transitions(TAGS)
+    
+    assert not allowed[TAGS.index("O"), TAGS.index("I-time")]
+    assert not allowed[TAGS.index("B-date"), TAGS.index("I-time")]
+    assert allowed[TAGS.index("B-time"), TAGS.index("I-time")]
+    assert (transitions[~allowed] < -1000).all()
+    assert (start[~allowed_start] < -1000).all()
+    
+    rng = np.random.default_rng(1)
+    paths = viterbi_decode(rng.normal(size=(16, 8, len(TAGS))), transitions, start, np.full(16, 8))
+    for path in paths:
+        assert allowed_start[path[0]]
+        assert all(allowed[a, b] for a, b in zip(path[:-1], path[1:]))
+
+
+def test_tokens_and_spans():
+    tokens = [token for token, _, _ in tokenize("Move report.txt to C:\\Users\\me at 3:30 pm.")]
+    assert tokens == ["Move", "report.txt", "to", "C:\\Users\\me", "at", "3:30", "pm", "."]
+    assert [token_key(token) for token in tokens[1:6]] == ["*.txt", "to", "<path>", "at", "0:00"]
+    
+    tags = ["O", "B-file_path", "O", "B-time", "I-time", "B-date"]
+    assert tag_spans(tags) == [("file_path", 1, 2), ("time", 3, 5), ("date", 5, 6)]
+
+
+class StubTagger:
+    def tag_batch(self, texts):
+        return [{"file_path": ["report.txt"], "time": ["9am"]} for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_model_spans_fill_what_patterns_missed():
+    extractor = EntityExtractorModel()
+    extractor.tagger = StubTagger()
+    extractor.executor = InferenceExecutor(max_workers=1)
+    
+    unquoted, quoted = await extractor.extract_batch(["open report.txt at 9am", "open 'notes.md' at 10:30"])
+    
+    assert unquoted["file_path"] == "report.txt"
+    assert unquoted["time"] == "09:00:00"
+    assert quoted["file_path"] == "notes.md"
+    assert quoted["time"] == "10:30"
+
+
+class WideTimeTagger:
+    def tag_batch(self, texts):
+        return [{"time": ["date 5pm"]}, {"time": ["the date"]}]
+
+
+@pytest.mark.asyncio
+async def test_tagged_times_are_normalized_before_scheduling():
+    extractor = EntityExtractorModel()
+    extractor.tagger = WideTimeTagger()
+    extractor.executor = InferenceExecutor(max_workers=1)
+    
+    widened, no_time = await extractor.extract_batch([
+        "remind me on 2024-05-01 date 5pm",
+        "remind me on 2024-05-01 about the date",
+    ])
+    
+    assert widened["time"] == "17:00:00"
+    assert widened["scheduled_datetime"] == "2024-05-01 17:00:00"
+    assert "time" not in no_time
+    assert no_time.get("scheduled_datetime") is None
+
+
+def test_tagger_decodes_with_its_keras_model():
+    class Emissions:
+        # Scores B-file_path for "*.txt" tokens and O elsewhere.
+        def __call__(self, ids):
+            logits = np.zeros(ids.shape + (len(TAGS),), dtype=np.float32)
+            logits[..., 0] = 1.0
+            logits[ids == 2] = 0.0
+            logits[..., TAGS.index("B-file_path")] = np.where(ids == 2, 5.0, 0.0)
+            return logits
+    
+    transitions, start = transition_scores([])
+    tagger = EntityTagger(Emissions(), ["*.txt", "open"], TAGS, transitions, start)
+    
+    assert tagger.tag_batch(["open a.txt and b.txt", "", "open"]) == [
+        {"file_path": ["a.txt", "b.txt"]}, {}, {},
+    ]
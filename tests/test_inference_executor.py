@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import time
+import pytest
+from ml.inference.executor import InferenceExecutor
+
+
+@pytest.mark.asyncio
+async def test_runs_blocking_call_off_the_event_loop():
+    executor = InferenceExecutor(max_workers=2)
+    loop_thread = threading.get_ident()
+    
+    worker_thread = await executor.run(threading.get_ident)
+    
+    assert worker_thread != loop_thread
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_reported():
+    executor = InferenceExecutor(max_workers=2)
+    running = []
+    peak = []
+    
+    def work():
+        running.append(1)
+        peak.append(len(running))
+        time.sleep(0.05)
+        running.pop()
+    
+    await asyncio.gather(*(executor.run(work) for _ in range(6)))
+    stats = executor.stats()
+    
+    assert max(peak) <= 2
+    assert stats["completed"] == 6
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_ms"] > 0
+    executor.shutdown()
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from memory.vector_store.ingest_queue import InteractionIngestQueue
+from memory.vector_store.store import VectorStore
+
+
+class RecordingVectorStore:
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+    
+    async def add_interactions(self, interactions):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.batches.append(list(interactions))
+
+
+def _interaction(i: int) -> dict:
+    return {
+        "session_id": "s",
+        "user_message": f"message {i}",
+        "assistant_response": "ok",
+        "intent": "chat",
+    }
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    store = RecordingVectorStore()
+    queue = InteractionIngestQueue(store, max_size=100, batch_size=4, flush_interval=10)
+    await queue.start()
+    
+    for i in range(8):
+        await queue.submit(_interaction(i))
+    await asyncio.sleep(0.05)
+    
+    assert [len(batch) for batch in store.batches] == [4, 4]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval():
+    store = RecordingVectorStore()
+    queue = InteractionIngestQueue(store, max_size=100, batch_size=50, flush_interval=0.05)
+    await queue.start()
+    
+    await queue.submit(_interaction(0))
+    await asyncio.sleep(0.2)
+    
+    assert [len(batch) for batch in store.batches] == [1]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_interactions():
+    store = RecordingVectorStore()
+    queue = InteractionIngestQueue(store, max_size=100, batch_size=50, flush_interval=10)
+    await queue.start()
+    
+    for i in range(5):
+        await queue.submit(_interaction(i))
+    await queue.close()
+    
+    assert sum(len(batch) for batch in store.batches) == 5
+    assert not queue.running
+
+
+@pytest.mark.asyncio
+async def test_submit_waits_when_queue_is_full():
+    store = RecordingVectorStore(delay=0.05)
+    queue = InteractionIngestQueue(store, max_size=2, batch_size=1, flush_interval=0)
+    await queue.start()
+    
+    for i in range(6):
+        await queue.submit(_interaction(i))
+    await queue.close()
+    
+    assert queue.backpressure_waits > 0
+    assert sum(len(batch) for batch in store.batches) == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_not_counted_as_written():
+    queue = InteractionIngestQueue(VectorStore(), max_size=100, batch_size=4, flush_interval=10)
+    await queue.start()
+    
+    for i in range(3):
+        await queue.submit(_interaction(i))
+    await queue.close()
+    
+    assert queue.written == 0
+    assert queue.batches == 0
+    assert queue.failed == 3
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from ml.inference.executor import InferenceExecutor
+from ml.inference.intent_predictor import IntentMicroBatcher
+
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+    
+    def predict_batch(self, texts):
+        self.calls.append(list(texts))
+        return [{"intent": text, "confidence": 1.0} for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_forward_pass():
+    model = RecordingModel()
+    batcher = IntentMicroBatcher(
+        model.predict_batch, InferenceExecutor(max_workers=1),
+        max_batch_size=32, window_ms=20,
+    )
+    
+    texts = [f"message {i}" for i in range(10)]
+    results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+    
+    assert [result["intent"] for result in results] == texts
+    assert len(model.calls) == 1
+    assert batcher.stats()["batch_size_histogram"] == {10: 1}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_before_window():
+    model = RecordingModel()
+    batcher = IntentMicroBatcher(
+        model.predict_batch, InferenceExecutor(max_workers=1),
+        max_batch_size=4, window_ms=10_000,
+    )
+    
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(str(i)) for i in range(8))), timeout=2
+    )
+    
+    assert len(results) == 8
+    assert [len(call) for call in model.calls] == [4, 4]
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller():
+    def failing(texts):
+        raise RuntimeError("model failed")
+    
+    batcher = IntentMicroBatcher(failing, InferenceExecutor(max_workers=1), max_batch_size=8, window_ms=5)
+    
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+    )
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
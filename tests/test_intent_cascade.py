@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from app.models.schemas import IntentType
+from ml.inference.intent_predictor import IntentPredictor
+from ml.inference.text_encoder import TextEncoder
+
+
+class SearchModel:
+    """Predicts SEARCH for everything and records how many rows it saw."""
+    
+    def __init__(self, labels):
+        self.rows = 0
+        self.index = labels.index(IntentType.SEARCH)
+        self.width = len(labels)
+    
+    def predict(self, inputs, verbose=0):
+        self.rows += len(inputs)
+        probabilities = np.zeros((len(inputs), self.width), dtype=np.float32)
+        probabilities[:, self.index] = 0.99
+        return probabilities
+
+
+@pytest.fixture
+def predictor():
+    predictor = IntentPredictor()
+    predictor.model = SearchModel(predictor.intent_labels)
+    predictor.tokenizer = TextEncoder()
+    predictor.batcher = None
+    predictor.cascade_threshold = 0.8
+    return predictor
+
+
+@pytest.mark.asyncio
+async def test_confident_rules_skip_the_model(predictor):
+    # "hello" scores 0.8 on the greeting rule; "blah blah" matches no rule (0.6).
+    confident = await predictor.predict("hello")
+    ambiguous = await predictor.predict("blah blah")
+    
+    assert confident["intent"] == IntentType.CHAT
+    assert ambiguous["intent"] == IntentType.SEARCH
+    assert predictor.model.rows == 1
+    
+    stats = predictor.cascade_stats()
+    assert stats["answered"] == {"fallback": 1, "model": 1}
+    assert stats["fallback_share"] == 0.5
+    assert set(stats["seconds"]) == {"fallback", "model"}
+
+
+@pytest.mark.asyncio
+async def test_batch_sends_only_ambiguous_messages_to_model(predictor):
+    results = await predictor.predict_batch(["hello", "blah blah", "hi there", "zzz"])
+    
+    assert [result["intent"] for result in results] == [
+        IntentType.CHAT, IntentType.SEARCH, IntentType.CHAT, IntentType.SEARCH,
+    ]
+    assert predictor.model.rows == 2
+    assert predictor.cascade_stats()["answered"] == {"fallback": 2, "model": 2}
+
+
+@pytest.mark.asyncio
+async def test_cascade_disabled_always_runs_model(predictor):
+    predictor.cascade_threshold = None
+    
+    result = await predictor.predict("hello")
+    
+    assert result["intent"] == IntentType.SEARCH
+    assert predictor.model.rows == 1
+    assert predictor.cascade_stats()["answered"] == {}
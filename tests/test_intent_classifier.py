@@ -1,5 +1,7 @@
 import pytest
 import asyncio
+import numpy as np
+from pathlib import Path
 from ml.inference.intent_predictor import IntentPredictor
 from app.models.schemas import IntentType
 
@@ -36,3 +38,31 @@ async def test_chat_intent(predictor):
     assert result["intent"] == IntentType.CHAT
     assert result["confidence"] > 0.5
 
+
+
+@pytest.mark.parametrize("mask_padding, expected", [(True, [8, 16, 32]), (False, None)])
+def test_length_buckets_require_padding_invariant_model(predictor, mask_padding, expected):
+    from ml.intent.model import IntentClassifier
+    
+    model = IntentClassifier(vocab_size=64, embedding_dim=16, num_intents=8, mask_padding=mask_padding)
+    model(np.zeros((1, 50), dtype=np.int32))
+    predictor.model = model
+    predictor.tokenizer = predictor._load_tokenizer(Path("missing_vocab.json"))
+    
+    assert predictor._check_length_buckets([32, 8, 16, 50]) == expected
+
+
+class FixedLengthModel:
+    def predict(self, inputs, verbose=0):
+        if inputs.shape[1] != 50:
+            raise ValueError(f"expected sequence length 50, got {inputs.shape[1]}")
+        return np.zeros((len(inputs), 8))
+
+
+def test_failed_bucket_probe_keeps_the_model(predictor):
+    model = FixedLengthModel()
+    predictor.model = model
+    predictor.tokenizer = predictor._load_tokenizer(Path("missing_vocab.json"))
+    
+    assert predictor._check_length_buckets([8, 16, 32]) is None
+    assert predictor.model is model
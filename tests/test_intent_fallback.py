@@ -0,0 +1,68 @@
+import random
+import pytest
+from ml.inference.fallback_rules import (
+    ACTION_VERBS,
+    FILE_RELATED,
+    GREETING_WORDS,
+    SCHEDULE_WORDS,
+    SEARCH_PHRASES,
+    CompiledFallbackRules,
+)
+from ml.training.data_generator import IntentDataGenerator
+from tests.legacy_reference import legacy_fallback_predict
+
+
+EXTRA_WORDS = [
+    "python", "backup.py", "deploy.sh", "at 5", "at 12pm", "o'clock", "what", "weather",
+    "where is", "look for", "cpu", "usage", "info", "eliminate", "blank", "alphabetically",
+    "program", "command", "later", "today", "notes.txt", "report", "the", "my", "please",
+    "history", "Hi", "SUPPORT", "youtube", "atlas", "datapath", "filed",
+]
+SEPARATORS = [" ", " ", " ", "  ", "\t", "\n", ", ", ". ", "-", "'", ""]
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return CompiledFallbackRules()
+
+
+def _random_messages(count: int, seed: int = 7):
+    vocabulary = sorted(
+        {verb for verbs in ACTION_VERBS.values() for verb in verbs}
+        | set(SEARCH_PHRASES) | set(FILE_RELATED) | set(GREETING_WORDS)
+        | set(SCHEDULE_WORDS) | set(EXTRA_WORDS)
+    )
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(1, 8))
+        message = words[0]
+        for word in words[1:]:
+            message += rng.choice(SEPARATORS) + word
+        if rng.random() < 0.3:
+            message = message.title()
+        if rng.random() < 0.2:
+            message = rng.choice(SEPARATORS) + message
+        messages.append(message)
+    return messages
+
+
+def test_matches_legacy_on_training_samples(rules):
+    samples = IntentDataGenerator().training_samples
+    for messages in samples.values():
+        for message in messages:
+            assert rules.predict(message) == legacy_fallback_predict(message), message
+
+
+@pytest.mark.parametrize("message", [
+    "", " ", "hi", "sup", "yo!", "history of the project", "later", "what's the time",
+    "find the folder", "make a folder\ncalled x", "python\nrun.py", "atlas at 5pm",
+    "Remove  duplicates from data.csv", "where is\tmy file",
+])
+def test_matches_legacy_on_edge_cases(rules, message):
+    assert rules.predict(message) == legacy_fallback_predict(message)
+
+
+def test_matches_legacy_on_random_messages(rules):
+    for message in _random_messages(3000):
+        assert rules.predict(message) == legacy_fallback_predict(message), repr(message)
@@ -0,0 +1,60 @@
+import json
+import numpy as np
+import pytest
+from app.models.schemas import IntentType
+from ml.inference import intent_predictor as intent_predictor_module
+from ml.inference.intent_predictor import IntentPredictor
+from ml.inference.linear_backend import LinearIntentModel
+from ml.training.data_generator import training_examples
+from ml.training.train_linear_intents import train_linear_intents
+
+
+@pytest.fixture(scope="module")
+def model():
+    texts, labels = training_examples()
+    return LinearIntentModel.fit(texts, labels)
+
+
+def test_serving_features_match_hashing_vectorizer(model):
+    texts = ["Open file report.txt", "remind me tomorrow at 9am!", "unseen wörds here", ""]
+    
+    features = model._features(model.vectorizers, texts)[:, model.columns]
+    logits = features @ model.weights + model.intercept
+    expected = np.exp(logits - logits.max(axis=1, keepdims=True))
+    expected /= expected.sum(axis=1, keepdims=True)
+    
+    np.testing.assert_allclose(model.predict(texts), expected, atol=1e-5)
+
+
+def test_artifact_round_trip(model, tmp_path):
+    path = tmp_path / "intent_linear.npz"
+    model.save(path)
+    loaded = LinearIntentModel.load(path)
+    
+    texts = ["open file document.txt", "set alarm for 9am"]
+    np.testing.assert_allclose(loaded.predict(texts), model.predict(texts), rtol=1e-6)
+    assert [loaded.intents[i] for i in loaded.predict(texts).argmax(axis=1)] == ["file_operation", "schedule_reminder"]
+
+
+@pytest.mark.asyncio
+async def test_predictor_serves_linear_backend(model, tmp_path, monkeypatch):
+    path = tmp_path / "intent_linear.npz"
+    model.save(path)
+    settings = intent_predictor_module.settings
+    monkeypatch.setattr(settings, "INTENT_BACKEND", "linear")
+    monkeypatch.setattr(settings, "INTENT_LINEAR_PATH", str(path))
+    monkeypatch.setattr(settings, "INTENT_BATCH_WINDOW_MS", 0)
+    
+    predictor = IntentPredictor()
+    assert isinstance(predictor.model, LinearIntentModel)
+    
+    results = await predictor.predict_batch(["run script.py", "hello"])
+    assert [result["intent"] for result in results] == [IntentType.RUN_SCRIPT, IntentType.CHAT]
+
+
+def test_training_survives_a_single_correction(tmp_path):
+    corrections = tmp_path / "corrections.jsonl"
+    corrections.write_text(json.dumps({"text": "tidy up budget.xlsx", "intent": "excel_operation"}) + "\n")
+    
+    model = train_linear_intents(corrections, tmp_path / "intent_linear.npz")
+    assert "excel_operation" in model.intents
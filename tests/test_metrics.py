@@ -0,0 +1,43 @@
+import pytest
+from app.core.metrics import MetricsRegistry, StageTimer
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+    
+    histogram.observe(0.05, stage="intent")
+    histogram.observe(0.5, stage="intent")
+    histogram.observe(5.0, stage="intent")
+    
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="intent",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="intent",le="1"} 2' in text
+    assert 'latency_seconds_bucket{stage="intent",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="intent"} 3' in text
+
+
+def test_counter_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ["intent"])
+    
+    counter.inc(intent='say "hi"')
+    counter.inc(2, intent='say "hi"')
+    
+    assert 'requests_total{intent="say \\"hi\\""} 3' in registry.render()
+
+
+def test_stage_timer_records_each_stage():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stages", ["stage", "intent"])
+    timer = StageTimer(histogram)
+    
+    with timer.stage("intent_prediction"):
+        pass
+    with timer.stage("entity_extraction"):
+        pass
+    timer.observe(intent="chat")
+    
+    assert histogram.count(stage="intent_prediction", intent="chat") == 1
+    assert histogram.count(stage="entity_extraction", intent="chat") == 1
@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from ml.inference.text_encoder import TextEncoder
+
+
+TEXTS = [
+    "Hello, how are you?", "open file 'notes.txt'", "remind me tomorrow at 9am!",
+    "run backup.py now", "", "what's up", "delete the old document, please",
+]
+INTENTS = [
+    "chat", "file_operation", "schedule_reminder", "run_script",
+    "search", "system_info", "unknown",
+]
+
+
+def test_text_encoder_matches_keras_tokenizer():
+    pytest.importorskip("tensorflow")
+    from tensorflow.keras.preprocessing.text import Tokenizer
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    
+    corpus = TEXTS + ["open file", "open folder", "file file hello"]
+    tokenizer = Tokenizer(oov_token="<OOV>")
+    tokenizer.fit_on_texts(corpus)
+    encoder = TextEncoder(oov_token="<OOV>")
+    encoder.fit_on_texts(corpus)
+    
+    queries = TEXTS + ["unseen words here", "a " * 60]
+    assert encoder.word_index == tokenizer.word_index
+    assert encoder.texts_to_sequences(queries) == tokenizer.texts_to_sequences(queries)
+    np.testing.assert_array_equal(
+        encoder.encode(queries, max_length=50, padding="post", truncating="pre"),
+        pad_sequences(tokenizer.texts_to_sequences(queries), maxlen=50, padding="post"),
+    )
+    np.testing.assert_array_equal(
+        encoder.encode(queries, max_length=50),
+        pad_sequences(
+            tokenizer.texts_to_sequences(queries), maxlen=50, padding="post", truncating="post"
+        ),
+    )
+
+
+@pytest.fixture(scope="module")
+def exported_model(tmp_path_factory):
+    pytest.importorskip("tf2onnx")
+    pytest.importorskip("onnxruntime")
+    from ml.intent.model import IntentClassifier
+    from ml.training.export_onnx import export_onnx
+    
+    model = IntentClassifier(vocab_size=64, embedding_dim=16, num_intents=len(INTENTS))
+    model(np.zeros((1, 50), dtype=np.int32))
+    
+    models_dir = tmp_path_factory.mktemp("models")
+    onnx_path = export_onnx(model, models_dir / "intent_classifier.onnx")
+    with open(models_dir / "intent_map.json", "w") as f:
+        json.dump({name: index for index, name in enumerate(INTENTS)}, f)
+    
+    return model, onnx_path
+
+
+def test_onnx_predictions_match_keras(exported_model):
+    from ml.inference.onnx_backend import OnnxIntentModel
+    
+    model, onnx_path = exported_model
+    encoder = TextEncoder()
+    encoder.fit_on_texts(TEXTS)
+    inputs = encoder.encode(TEXTS, max_length=50)
+    
+    expected = model.predict(inputs, verbose=0)
+    actual = OnnxIntentModel(onnx_path).predict(inputs)
+    
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+    assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+
+def test_onnx_backend_serves_without_tensorflow(exported_model):
+    _, onnx_path = exported_model
+    code = (
+        "import sys\n"
+        "from ml.inference.intent_predictor import IntentPredictor\n"
+        "predictor = IntentPredictor()\n"
+        "assert type(predictor.model).__name__ == 'OnnxIntentModel'\n"
+        "predictor._model_predict_batch(['hello', 'open file notes.txt'])\n"
+        "print('tensorflow' in sys.modules)\n"
+    )
+    env = {
+        **os.environ,
+        "SECRET_KEY": "test",
+        "INTENT_BACKEND": "onnx",
+        "INTENT_ONNX_PATH": str(onnx_path),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_int8_variant_tracks_float_model(exported_model):
+    from ml.inference.onnx_backend import OnnxIntentModel
+    from ml.training.quantize import quantize_onnx
+    
+    _, onnx_path = exported_model
+    int8_path = quantize_onnx(onnx_path)
+    assert int8_path.name == "intent_classifier.int8.onnx"
+    assert int8_path.stat().st_size < onnx_path.stat().st_size
+    
+    encoder = TextEncoder()
+    encoder.fit_on_texts(TEXTS)
+    inputs = encoder.encode(TEXTS, max_length=50)
+    
+    expected = OnnxIntentModel(onnx_path).predict(inputs)
+    actual = OnnxIntentModel(int8_path).predict(inputs)
+    
+    np.testing.assert_allclose(actual, expected, atol=0.05)
+    
+    code = (
+        "from ml.inference.intent_predictor import IntentPredictor\n"
+        "print(IntentPredictor().model.path.name)\n"
+    )
+    env = {
+        **os.environ,
+        "SECRET_KEY": "test",
+        "INTENT_MODEL_VARIANT": "int8",
+        "INTENT_INT8_ONNX_PATH": str(int8_path),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == int8_path.name
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+from automation.handlers.adaptive_processor import AdaptiveProcessor
+from memory.learning.pattern_sketch import PatternSketch
+
+
+def _stream(sketch, exact, events=20000, keys=5000, seed=3):
+    rng = random.Random(seed)
+    for _ in range(events):
+        # Zipf-like: a few keys dominate, most appear once or twice.
+        key = f"chat:message {min(int(rng.paretovariate(1.1)), keys)}"
+        success = rng.random() < 0.7
+        sketch.record(key, success)
+        count, successes = exact.get(key, (0, 0))
+        exact[key] = (count + 1, successes + success)
+
+
+def test_memory_is_fixed_and_estimates_are_upper_bounds():
+    sketch = PatternSketch(memory_bytes=64 * 1024)
+    counts_before = sketch.counts.nbytes
+    exact = {}
+    _stream(sketch, exact)
+    
+    assert sketch.counts.nbytes == counts_before
+    assert len(sketch.top) <= sketch.top_k
+    assert sketch.nbytes <= 64 * 1024
+    for key, (count, _) in exact.items():
+        assert sketch.estimate(key)[0] >= count
+
+
+def test_heavy_hitters_are_tracked_exactly():
+    sketch = PatternSketch(memory_bytes=64 * 1024)
+    exact = {}
+    _stream(sketch, exact)
+    
+    heaviest = sorted(exact, key=lambda key: exact[key][0], reverse=True)[:10]
+    hitters = {key: (count, rate) for key, count, rate in sketch.heavy_hitters()}
+    for key in heaviest:
+        count, successes = exact[key]
+        assert key in hitters
+        assert hitters[key][0] == count
+        assert abs(hitters[key][1] - successes / count) < 0.01
+
+
+def test_snapshot_round_trip(tmp_path):
+    sketch = PatternSketch(memory_bytes=32 * 1024)
+    _stream(sketch, {}, events=2000)
+    path = tmp_path / "patterns.npz"
+    sketch.save(path)
+    
+    restored = PatternSketch.load(path, memory_bytes=32 * 1024)
+    assert restored.total == sketch.total
+    assert restored.top == sketch.top
+    np.testing.assert_array_equal(restored.counts, sketch.counts)
+    assert restored.estimate("chat:message 1") == sketch.estimate("chat:message 1")
+    
+    resized = PatternSketch.load(path, memory_bytes=16 * 1024)
+    assert resized.total == 0
+
+
+def test_adaptive_processor_restores_learned_patterns(tmp_path):
+    path = tmp_path / "patterns.npz"
+    processor = AdaptiveProcessor(memory_bytes=16 * 1024)
+    for success in (True, True, False, True):
+        processor.learn_from_interaction("open the report", "file_operation", success)
+    processor.save_patterns(path)
+    
+    restarted = AdaptiveProcessor(memory_bytes=16 * 1024)
+    restarted.load_patterns(path)
+    assert restarted.common_patterns.estimate("file_operation:open the report") == (4, 0.75)
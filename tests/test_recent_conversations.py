@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import conversations
+from app.models.schemas import Message, MessageRole
+from memory.conversation.manager import ConversationManager
+
+
+def _populate():
+    manager = ConversationManager()
+    for session_id in ["a", "b", "c", "a", "d", "b"]:
+        manager.add_message(session_id, Message(role=MessageRole.USER, content=f"hi from {session_id}"))
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_recent_conversations_follow_latest_update():
+    manager = _populate()
+    
+    assert manager.recent_session_ids(3) == ["b", "d", "a"]
+    assert [c.session_id for c in await manager.get_recent_conversations(10)] == ["b", "d", "a", "c"]
+    assert await manager.get_recent_conversations(0) == []
+    
+    manager.remove_session("d")
+    assert manager.recent_session_ids(2) == ["b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_summaries_match_conversations():
+    manager = _populate()
+    
+    for summary, conversation in zip(manager.get_recent_summaries(4), await manager.get_recent_conversations(4)):
+        assert summary.session_id == conversation.session_id
+        assert summary.message_count == len(conversation.messages)
+        assert summary.last_message == conversation.messages[-1]
+        assert summary.updated_at == conversation.updated_at
+
+
+def test_summary_mode_endpoint():
+    app = FastAPI()
+    app.include_router(conversations.router, prefix="/api/v1")
+    app.state.conversation_manager = _populate()
+    client = TestClient(app)
+    
+    full = client.get("/api/v1/conversations", params={"limit": 2}).json()
+    summaries = client.get("/api/v1/conversations", params={"limit": 2, "summary": True}).json()
+    
+    assert [c["session_id"] for c in full] == ["b", "d"]
+    assert [s["session_id"] for s in summaries] == ["b", "d"]
+    assert "messages" not in summaries[0]
+    assert summaries[0]["message_count"] == 2
+    assert summaries[0]["last_message"]["content"] == "hi from b"
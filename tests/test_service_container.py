@@ -0,0 +1,42 @@
+import pytest
+from app.services.container import ServiceContainer
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+
+
+class StubIntentPredictor:
+    async def predict(self, text: str) -> dict:
+        return {"intent": "chat", "confidence": 0.9}
+
+
+class StubVectorStore:
+    async def add_interaction(self, **kwargs):
+        return None
+    
+    async def add_interactions(self, interactions):
+        return None
+
+
+@pytest.fixture
+def container():
+    return ServiceContainer(
+        intent_predictor=StubIntentPredictor(),
+        entity_extractor=EntityExtractorModel(),
+        conversation_manager=ConversationManager(),
+        vector_store=StubVectorStore(),
+    )
+
+
+def test_services_are_shared(container):
+    assert container.chat_service.command_handler is container.command_handler
+    assert container.command_handler.reminder_task is container.reminder_task
+    assert container.reminder_task.device_detector is container.device_detector
+    assert container.task_executor.task_handlers["reminder"] is container.reminder_task
+
+
+@pytest.mark.asyncio
+async def test_chat_service_reused_across_messages(container):
+    first = await container.chat_service.process_message("hello", "session-1")
+    second = await container.chat_service.process_message("thanks", "session-1")
+    assert first.session_id == second.session_id == "session-1"
+    assert len(container.conversation_manager.get_recent_messages("session-1")) == 4
@@ -0,0 +1,98 @@
+import pytest
+from app.models.schemas import Message, MessageRole
+from app.services.chat_service import ChatService
+from automation.handlers.adaptive_processor import AdaptiveProcessor
+from ml.inference.entity_extractor import EntityExtractorModel
+from memory.conversation.manager import ConversationManager
+from memory.conversation.session_context import SessionContext
+
+
+def _user(text):
+    return Message(role=MessageRole.USER, content=text)
+
+
+def _assistant(text):
+    return Message(role=MessageRole.ASSISTANT, content=text)
+
+
+def test_observe_tracks_the_latest_file():
+    context = SessionContext()
+    context.observe("open the Budget file on my desktop")
+    context.observe("clean 'Q3 sales.xlsx'")
+    
+    assert context.last_file == "Budget"
+    assert context.last_file_turn == 1
+    assert context.to_dict() == {"turn": 2, "last_file": "Budget", "last_file_turn": 1}
+
+
+def test_from_dict_ignores_fields_no_longer_kept():
+    context = SessionContext.from_dict({"turn": 3, "last_file": "Budget", "last_file_turn": 3, "excel_path": "a.xlsx"})
+    
+    assert context.recent_file == "Budget"
+    assert not hasattr(context, "excel_path")
+
+
+def test_filename_is_only_inferred_from_recent_turns():
+    context = SessionContext()
+    context.observe("the Budget file")
+    assert context.recent_file == "Budget"
+    context.observe("thanks")
+    assert context.recent_file == "Budget"
+    context.observe("and another thing")
+    assert context.recent_file is None
+
+
+def test_session_context_matches_history_scan():
+    processor = AdaptiveProcessor()
+    history = [
+        _user("move the Report document"),
+        _assistant("Done"),
+        _user("now copy it to downloads"),
+    ]
+    context = SessionContext()
+    for message in history[::2]:
+        context.observe(message.content)
+    
+    from_context = processor.enhance_understanding("now copy it to downloads", {}, history, context)
+    from_history = processor.enhance_understanding("now copy it to downloads", {}, history)
+    
+    assert from_context == from_history
+    assert from_context["inferred_filename"] == "Report"
+    assert from_context["location_hint"] == "Downloads"
+
+
+class Predictor:
+    async def predict(self, text):
+        return {"intent": "excel_operation", "confidence": 0.9}
+
+
+class VectorStore:
+    async def add_interaction(self, **kwargs):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_chat_service_updates_context_and_session_removal_drops_it():
+    manager = ConversationManager()
+    service = ChatService(
+        intent_predictor=Predictor(),
+        entity_extractor=EntityExtractorModel(),
+        conversation_manager=manager,
+        vector_store=VectorStore(),
+    )
+    
+    await service.process_message("remove duplicates from the Sales file 'sales.xlsx'", "session")
+    response = await service.process_message("now sort it", "session")
+    
+    assert manager.get_context("session").turn == 2
+    assert manager.get_context("session").last_file == "Sales"
+    # Excel operations change files, so an earlier workbook is never an implicit target.
+    assert "inferred_excel_path" not in response.intent.entities
+    assert "Please specify the Excel file path" in response.response
+    
+    manager.remove_session("session")
+    assert "session" not in manager.contexts
+    
+    manager.get_context("unknown").observe("open the Budget file")
+    assert manager.contexts == {}
+    assert manager.get_recent_messages("session") == []
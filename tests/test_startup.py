@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ["tensorflow", "chromadb", "sentence_transformers", "pandas"]
+
+
+def test_importing_app_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = {"SECRET_KEY": "test", **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
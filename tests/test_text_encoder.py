@@ -0,0 +1,52 @@
+import numpy as np
+from ml.inference.text_encoder import TextEncoder
+from ml.training.data_generator import IntentDataGenerator
+
+
+def test_vocabulary_round_trips_through_artifact(tmp_path):
+    encoder = TextEncoder(max_length=8)
+    encoder.fit_on_texts(["open the file", "open the folder now", "hello"])
+    
+    path = tmp_path / "intent_vocab.json"
+    encoder.save(path)
+    loaded = TextEncoder.load(path)
+    
+    texts = ["Open the FILE!", "unknown words", ""]
+    assert loaded.word_index == encoder.word_index
+    assert loaded.max_length == 8
+    np.testing.assert_array_equal(loaded.encode(texts), encoder.encode(texts))
+
+
+def test_encode_pads_and_truncates_into_int32_batch():
+    encoder = TextEncoder(max_length=3)
+    encoder.fit_on_texts(["a b c d e"])
+    
+    encoded = encoder.encode(["a b c d e", "b", ""])
+    assert encoded.dtype == np.int32
+    np.testing.assert_array_equal(encoded, [[2, 3, 4], [3, 0, 0], [0, 0, 0]])
+    np.testing.assert_array_equal(
+        encoder.encode(["a b c d e", "b"], padding="pre", truncating="pre"),
+        [[4, 5, 6], [0, 0, 3]],
+    )
+
+
+def test_data_generator_uses_the_encoder_it_exposes():
+    generator = IntentDataGenerator()
+    (X_train, _), (X_val, _), vocab_size, _ = generator.generate()
+    
+    assert vocab_size == generator.tokenizer.vocab_size
+    assert X_train.dtype == np.int32
+    assert X_train.shape[1] == X_val.shape[1] == generator.max_length
+
+
+def test_encode_pads_batch_to_smallest_fitting_bucket():
+    encoder = TextEncoder(max_length=10)
+    encoder.fit_on_texts(["a b c d e f g h i j k l"])
+    
+    assert encoder.encode(["a b", "c"], buckets=[4, 8]).shape == (2, 4)
+    assert encoder.encode(["a b c d e", "c"], buckets=[4, 8]).shape == (2, 8)
+    assert encoder.encode(["a b c d e f g h i j k l"], buckets=[4, 8]).shape == (1, 10)
+    np.testing.assert_array_equal(
+        encoder.encode(["a b", "c"], padding="pre", buckets=[4]),
+        [[0, 0, 2, 3], [0, 0, 0, 4]],
+    )
@@ -0,0 +1,114 @@
+import pytest
+from app.services.warmup import Readiness, warm_up
+
+
+class StubIntentPredictor:
+    def __init__(self):
+        self.calls = 0
+    
+    async def predict(self, text: str) -> dict:
+        self.calls += 1
+        return {"intent": "chat", "confidence": 0.9}
+    
+    async def predict_batch(self, texts):
+        self.calls += 1
+        return [{"intent": "chat", "confidence": 0.9} for _ in texts]
+
+
+class StubEntityExtractor:
+    async def extract_batch(self, texts):
+        return [{} for _ in texts]
+
+
+class FailingVectorStore:
+    async def embed(self, texts):
+        raise RuntimeError("embedding model not loaded")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_stays_unready_when_a_component_fails():
+    readiness = Readiness()
+    predictor = StubIntentPredictor()
+    
+    await warm_up(
+        readiness,
+        intent_predictor=predictor,
+        entity_extractor=StubEntityExtractor(),
+        vector_store=FailingVectorStore(),
+        messages=["hello", "open file notes.txt"],
+        iterations=2,
+        retry_backoff=0,
+    )
+    
+    assert not readiness.ready
+    assert readiness.to_dict()["failed_components"] == ["vector_store"]
+    assert predictor.calls == 6
+    assert set(readiness.components) == {"intent_predictor", "entity_extractor", "vector_store"}
+    assert "vector_store" in readiness.errors
+    assert readiness.to_dict()["warmup_seconds"] is not None
+
+
+class StubVectorStore:
+    async def embed(self, texts):
+        return [[0.0] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_marks_ready_when_every_component_warms():
+    readiness = Readiness()
+    
+    await warm_up(
+        readiness,
+        intent_predictor=StubIntentPredictor(),
+        entity_extractor=StubEntityExtractor(),
+        vector_store=StubVectorStore(),
+        messages=["hello"],
+        iterations=1,
+    )
+    
+    assert readiness.ready
+    assert readiness.errors == {}
+
+
+class FlakyVectorStore:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.embedding_model = None
+        self.initialized = 0
+    
+    async def initialize(self):
+        self.initialized += 1
+        if self.initialized > self.failures:
+            self.embedding_model = object()
+    
+    async def embed(self, texts):
+        if self.embedding_model is None:
+            raise RuntimeError("embedding model not loaded")
+        return [[0.0] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_a_failed_component_until_ready():
+    readiness = Readiness()
+    vector_store = FlakyVectorStore(failures=2)
+    
+    await warm_up(
+        readiness,
+        intent_predictor=StubIntentPredictor(),
+        entity_extractor=StubEntityExtractor(),
+        vector_store=vector_store,
+        messages=["hello"],
+        iterations=1,
+        retry_backoff=0.01,
+    )
+    
+    assert readiness.ready
+    assert readiness.errors == {}
+    assert readiness.retries == 2
+    assert vector_store.initialized == 3
+
+
+def test_readiness_starts_not_ready():
+    readiness = Readiness()
+    assert readiness.to_dict()["ready"] is False
+    assert readiness.to_dict()["warmup_seconds"] is None
@@ -10,12 +10,12 @@ from ml.training.data_generator import IntentDataGenerator
 
 def create_training_data():
     data_gen = IntentDataGenerator()
-    return data_gen.generate()
+    return data_gen.generate(), data_gen.tokenizer
 
 
 def train_model():
     print("Generating training data...")
-    train_data, val_data, vocab_size, intent_map = create_training_data()
+    (train_data, val_data, vocab_size, intent_map), tokenizer = create_training_data()
     
     X_train, y_train = train_data
     X_val, y_val = val_data
@@ -29,6 +29,7 @@ def train_model():
         embedding_dim=128,
         num_intents=len(intent_map),
         max_length=50,
+        mask_padding=True,
     )
     
     model.compile(
@@ -68,6 +69,8 @@ def train_model():
     with open(models_dir / "intent_map.json", "w") as f:
         json.dump(intent_map, f, indent=2)
     
+    tokenizer.save(models_dir / "intent_vocab.json")
+    
     print(f"Model saved to {models_dir}")
     print(f"Final validation accuracy: {history.history['val_accuracy'][-1]:.4f}")
     